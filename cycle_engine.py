@@ -4,6 +4,8 @@ import uuid
 import datetime
 import numpy as np
 
+from scripts.run_archon import round_like_python
+
 # --- CONFIGURATION ---
 SCHEMA_DIR = "./schema"
 SIGNALS_PATH = os.path.join(SCHEMA_DIR, "15_cycle_signals.csv")
@@ -24,69 +26,95 @@ def bayesian_update(prior_mean, prior_var, observed_val, lik_var=10.0):
     post_var = 1 / ((1/prior_var) + (1/lik_var))
     return post_mean, post_var
 
+# --- AGENT PROTOCOL ---
+# agent.predict(row) -> dict for one game (required).
+# agent.predict_batch(frame) -> DataFrame (or dict of columns) with one row per game of `frame`,
+# in the same order (optional; used when present so the whole cycle is scored in one call).
+# Keys / columns: predicted_margin, and optionally confidence, ora_used, raw_margin, signal_density.
+PREDICTION_DEFAULTS = {"predicted_margin": 0.0, "confidence": 0.5, "ora_used": False, "signal_density": 0}
+
+
+def predict_frame(agent, blind_df):
+    """Predictions for every row of blind_df as a DataFrame: predict_batch when the agent has it, else predict per row."""
+    if hasattr(agent, "predict_batch"):
+        preds = pd.DataFrame(agent.predict_batch(blind_df))
+        if len(preds) != len(blind_df):
+            raise ValueError(f"predict_batch returned {len(preds)} rows for {len(blind_df)} games")
+        preds.index = blind_df.index
+        # defaults only for columns the agent left out, as for the keys of a per-row prediction
+        for col, default in PREDICTION_DEFAULTS.items():
+            if col not in preds:
+                preds[col] = default
+        # no raw margin means ORA left the prediction as is
+        if "raw_margin" not in preds:
+            preds["raw_margin"] = preds["predicted_margin"]
+        return preds
+    rows = []
+    for _, row in blind_df.iterrows():
+        artifact = {**PREDICTION_DEFAULTS, **agent.predict(row)}
+        artifact.setdefault("raw_margin", artifact["predicted_margin"])
+        rows.append(artifact)
+    return pd.DataFrame(rows, index=blind_df.index)
+
+
 # --- THE CYCLE RUNNER ---
 def run_historical_cycle_upgraded(games_df, agent, cycle_id=None):
     if cycle_id is None:
         cycle_id = str(uuid.uuid4())[:8]
     
     print(f"⚡ Starting Historical Cycle {cycle_id}...")
-    
-    signal_rows = []
-    prop_updates = []
-    
-    for idx, row in games_df.iterrows():
-        # 1. BLIND PREDICTION (Mask Actuals)
-        blind_row = row.copy()
-        blind_row['Actual_Margin'] = None # Hide the truth!
-        
-        # 2. Agent Predicts
-        prediction_artifact = agent.predict(blind_row)
-        
-        pred_margin = prediction_artifact.get('predicted_margin', 0)
-        conf = prediction_artifact.get('confidence', 0.5)
-        ora_used = prediction_artifact.get('ora_used', False)
-        
-        # 3. REVEAL & EVALUATE
-        actual_margin = row.get('Actual_Margin', 0)
-        actual_winner_home = actual_margin > 0
-        pred_winner_home = pred_margin > 0
-        
-        # 4. GENERATE META-SIGNALS
-        vol_gap = abs(pred_margin - actual_margin)
-        
-        # ORA Regret: Did ORA intervene and make it worse?
-        ora_regret = 0
-        if ora_used:
-            raw_pred = prediction_artifact.get('raw_margin', pred_margin)
-            if (raw_pred > 0) == actual_winner_home and (pred_margin > 0) != actual_winner_home:
-                ora_regret = 1
-        
-        # ORA Miss: Should ORA have intervened?
-        ora_miss = 0
-        if not ora_used and vol_gap > 10.0:
-            ora_miss = 1
-            
-        # Trust Delta: High confidence but wrong result?
-        is_correct = (pred_winner_home == actual_winner_home)
-        trust_delta = abs(conf - (1.0 if is_correct else 0.0))
-        
-        signal_rows.append({
-            "game_id": row.get('game_id', idx),
-            "cycle_id": cycle_id,
-            "timestamp": datetime.datetime.now().isoformat(),
-            "agent_variant": getattr(agent, "version", "v1.0"),
-            "volatility_gap": round(vol_gap, 2),
-            "ORA_regret": ora_regret,
-            "ORA_miss": ora_miss,
-            "trust_delta": round(trust_delta, 3),
-            "signal_density": prediction_artifact.get('signal_density', 0),
-            "notes": "High volatility" if vol_gap > 12 else "Normal"
-        })
+    if games_df.empty:
+        return cycle_id
+
+    # 1. BLIND PREDICTION (Mask Actuals once for the whole cycle)
+    blind_df = games_df.copy()
+    blind_df['Actual_Margin'] = np.nan # Hide the truth!
+
+    # 2. Agent Predicts
+    preds = predict_frame(agent, blind_df)
+    pred_margin = preds["predicted_margin"].to_numpy(dtype=float)
+    raw_margin = preds["raw_margin"].to_numpy(dtype=float)
+    conf = preds["confidence"].to_numpy(dtype=float)
+    ora_used = preds["ora_used"].to_numpy(dtype=bool)
+
+    # 3. REVEAL & EVALUATE
+    if 'Actual_Margin' in games_df:
+        actual_margin = pd.to_numeric(games_df['Actual_Margin'], errors='coerce').to_numpy(dtype=float)
+    else:
+        actual_margin = np.zeros(len(games_df))
+    actual_winner_home = actual_margin > 0
+    pred_winner_home = pred_margin > 0
+
+    # 4. GENERATE META-SIGNALS
+    vol_gap = np.abs(pred_margin - actual_margin)
+
+    # ORA Regret: Did ORA intervene and make it worse?
+    ora_regret = ora_used & ((raw_margin > 0) == actual_winner_home) & (pred_winner_home != actual_winner_home)
+
+    # ORA Miss: Should ORA have intervened?
+    ora_miss = ~ora_used & (vol_gap > 10.0)
+
+    # Trust Delta: High confidence but wrong result?
+    is_correct = pred_winner_home == actual_winner_home
+    trust_delta = np.abs(conf - is_correct)
+
+    game_ids = games_df['game_id'].to_numpy() if 'game_id' in games_df else games_df.index.to_numpy()
+    signals = pd.DataFrame({
+        "game_id": game_ids,
+        "cycle_id": cycle_id,
+        "timestamp": datetime.datetime.now().isoformat(),
+        "agent_variant": getattr(agent, "version", "v1.0"),
+        "volatility_gap": round_like_python(vol_gap, 2),
+        "ORA_regret": ora_regret.astype(int),
+        "ORA_miss": ora_miss.astype(int),
+        "trust_delta": round_like_python(trust_delta, 3),
+        "signal_density": preds["signal_density"].to_numpy(),
+        "notes": np.where(vol_gap > 12, "High volatility", "Normal"),
+    })
 
     # 5. COMMIT TO MEMORY
-    if signal_rows:
-        pd.DataFrame(signal_rows).to_csv(SIGNALS_PATH, mode='a', header=False, index=False)
-        print(f"✅ Committed {len(signal_rows)} signals to Long-Term Memory.")
+    signals.to_csv(SIGNALS_PATH, mode='a', header=False, index=False)
+    print(f"✅ Committed {len(signals)} signals to Long-Term Memory.")
         
     return cycle_id
 
@@ -103,6 +131,10 @@ if __name__ == "__main__":
                 "ora_used": False,
                 "raw_margin": 5.0
             }
+        def predict_batch(self, frame):
+            # Same answer for every game, in one call
+            return pd.DataFrame({"predicted_margin": 5.0, "confidence": 0.8, "ora_used": False,
+                                 "raw_margin": 5.0}, index=frame.index)
 
     # 2. Create a Fake Game Dataframe
     data = {
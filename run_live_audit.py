@@ -14,6 +14,14 @@ class ArchonStandardAgent:
             "ora_used": False,
             "signal_density": 5
         }
+    def predict_batch(self, frame):
+        net_rtg_diff = frame['NetRtg_Diff'] if 'NetRtg_Diff' in frame else pd.Series(0.0, index=frame.index)
+        return pd.DataFrame({
+            "predicted_margin": net_rtg_diff * 0.5,
+            "confidence": 0.8,
+            "ora_used": False,
+            "signal_density": 5
+        }, index=frame.index)
 
 def fetch_yesterdays_games():
     print("⛽ Connecting to NBA API...")
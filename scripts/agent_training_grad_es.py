@@ -21,16 +21,35 @@
 
 from __future__ import annotations
 import argparse
+import itertools
+import json
 import logging
 import os
 import sys
-from copy import deepcopy
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
 
 import pandas as pd
 import numpy as np
 
+# Optional import for the compressed columnar (Parquet) ledger
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except Exception:
+    PYARROW_AVAILABLE = False
+
+# Optional import for the compiled online SGD kernel
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except Exception:
+    NUMBA_AVAILABLE = False
+
 LOG = logging.getLogger("archon_agent_grad_es")
 LOG.setLevel(logging.INFO)
 ch = logging.StreamHandler(sys.stdout)
@@ -71,30 +90,197 @@ def load_stadium(path: str) -> pd.DataFrame:
         return pd.DataFrame(columns=["Team", "Entropy_Alpha"])
 
 
-def ensure_team_in_df(df: pd.DataFrame, team: str, col: str, default: float = 0.0) -> pd.DataFrame:
-    """Ensure there is a row for team in df with column col. Return possibly modified df (copy)."""
-    if team not in df["Team"].values:
-        df = pd.concat([df, pd.DataFrame([{"Team": team, col: default}])], ignore_index=True)
+def load_actuals(path: str, kind: str = "Training") -> pd.DataFrame:
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{kind} actuals file not found: {path}")
+    df = pd.read_csv(path)
+    if "Matchup" not in df.columns or "Actual_Spread" not in df.columns:
+        raise ValueError(f"{kind} actuals CSV must contain 'Matchup' and 'Actual_Spread' columns")
     return df
 
 
-def get_team_value(df: pd.DataFrame, team: str, col: str, default: float = 0.0) -> float:
-    vals = df.loc[df["Team"] == team, col].values
-    if len(vals) == 0 or pd.isna(vals[0]):
-        return float(default)
-    return float(vals[0])
+def _clip(value: float, bounds: Tuple[float, float]) -> float:
+    return min(max(value, bounds[0]), bounds[1])
 
 
-def set_team_value(df: pd.DataFrame, team: str, col: str, value: float) -> None:
-    idx = df.index[df["Team"] == team].tolist()
-    if len(idx) == 0:
-        # append
-        df.loc[len(df)] = { "Team": team, col: value }
-    else:
-        df.at[idx[0], col] = value
+# ---------- Array-backed parameter store ----------
+class TeamParamStore:
+    """
+    Compact per-team parameter store: a team -> slot index plus contiguous float64 arrays
+    for EVA_Scalar (coach) and Entropy_Alpha (entropy). Arrays grow geometrically as new teams
+    appear, so lookups and updates are O(1); the coach/stadium frames are only materialized
+    when requested (e.g. in save_intel).
+    """
+
+    def __init__(self, capacity: int = 32):
+        capacity = max(int(capacity), 1)
+        self.slots: Dict[str, int] = {}
+        self.teams: List[str] = []
+        self.coach = np.zeros(capacity, dtype=np.float64)
+        self.entropy = np.zeros(capacity, dtype=np.float64)
+        self.has_coach = np.zeros(capacity, dtype=bool)
+        self.has_entropy = np.zeros(capacity, dtype=bool)
+        # slot order of the rows in each materialized frame (source rows first, new teams appended)
+        self.coach_rows: List[int] = []
+        self.entropy_rows: List[int] = []
+        self._coach_base = pd.DataFrame(columns=["Team", "EVA_Scalar"])
+        self._stadium_base = pd.DataFrame(columns=["Team", "Entropy_Alpha"])
+        # optimizer state (momentum / Adam moments, step counts): per-team arrays grow with the
+        # parameters, global-weight state is a fixed (coach_weight, entropy_multiplier) pair
+        self.opt_state: Dict[str, np.ndarray] = {}
+        self.global_state: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_frames(cls, coach_df: pd.DataFrame, stadium_df: pd.DataFrame) -> "TeamParamStore":
+        store = cls(capacity=max(32, len(coach_df) + len(stadium_df)))
+        store._coach_base = coach_df.reset_index(drop=True)
+        store._stadium_base = stadium_df.reset_index(drop=True)
+        store._load_layer(store._coach_base, "EVA_Scalar", coach=True)
+        store._load_layer(store._stadium_base, "Entropy_Alpha", coach=False)
+        return store
+
+    def _load_layer(self, df: pd.DataFrame, col: str, coach: bool) -> None:
+        values = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64)
+        for team, value in zip(df["Team"].tolist(), values.tolist()):
+            slot = self.slot(team)
+            present = self.has_coach if coach else self.has_entropy
+            if present[slot]:
+                continue  # duplicated team: first row wins
+            present[slot] = True
+            (self.coach_rows if coach else self.entropy_rows).append(slot)
+            # NaN parameters read as the 0.0 default
+            (self.coach if coach else self.entropy)[slot] = 0.0 if np.isnan(value) else value
+
+    def __len__(self) -> int:
+        return len(self.teams)
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self.coach)
+
+        def grown(old: np.ndarray) -> np.ndarray:
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            return new
+
+        for name in ("coach", "entropy", "has_coach", "has_entropy"):
+            setattr(self, name, grown(getattr(self, name)))
+        self.opt_state = {name: grown(arr) for name, arr in self.opt_state.items()}
+
+    def state(self, name: str, dtype=np.float64) -> np.ndarray:
+        """Per-team optimizer state array `name`, sized like the parameter arrays (zeroed on first use)."""
+        arr = self.opt_state.get(name)
+        if arr is None:
+            arr = self.opt_state[name] = np.zeros(len(self.coach), dtype=dtype)
+        return arr
+
+    def global_state_array(self, name: str, dtype=np.float64) -> np.ndarray:
+        """Optimizer state for the (coach_weight, entropy_multiplier) pair."""
+        arr = self.global_state.get(name)
+        if arr is None:
+            arr = self.global_state[name] = np.zeros(2, dtype=dtype)
+        return arr
+
+    def slot(self, team: str) -> int:
+        """Return the slot for team, allocating a zero-initialised one if it is new."""
+        idx = self.slots.get(team)
+        if idx is None:
+            idx = len(self.teams)
+            if idx == len(self.coach):
+                self._grow()
+            self.slots[team] = idx
+            self.teams.append(team)
+        return idx
+
+    def ensure(self, team: str, coach: bool = False, entropy: bool = False) -> int:
+        """Slot for team, registering it in the coach and/or stadium layer (default 0.0) if absent."""
+        idx = self.slot(team)
+        if coach and not self.has_coach[idx]:
+            self.has_coach[idx] = True
+            self.coach_rows.append(idx)
+        if entropy and not self.has_entropy[idx]:
+            self.has_entropy[idx] = True
+            self.entropy_rows.append(idx)
+        return idx
+
+    def copy(self) -> "TeamParamStore":
+        other = TeamParamStore.__new__(TeamParamStore)
+        other.slots = dict(self.slots)
+        other.teams = list(self.teams)
+        other.coach = self.coach.copy()
+        other.entropy = self.entropy.copy()
+        other.has_coach = self.has_coach.copy()
+        other.has_entropy = self.has_entropy.copy()
+        other.coach_rows = list(self.coach_rows)
+        other.entropy_rows = list(self.entropy_rows)
+        other.opt_state = {name: arr.copy() for name, arr in self.opt_state.items()}
+        other.global_state = {name: arr.copy() for name, arr in self.global_state.items()}
+        other._coach_base = self._coach_base
+        other._stadium_base = self._stadium_base
+        return other
+
+    def to_arrays(self, prefix: str = "") -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """Parameter / optimizer arrays (trimmed to the registered teams) plus JSON metadata, for checkpoints."""
+        n = len(self.teams)
+        arrays = {f"{prefix}{name}": getattr(self, name)[:n] for name in ("coach", "entropy", "has_coach", "has_entropy")}
+        arrays[f"{prefix}coach_rows"] = np.asarray(self.coach_rows, dtype=np.int64)
+        arrays[f"{prefix}entropy_rows"] = np.asarray(self.entropy_rows, dtype=np.int64)
+        arrays.update({f"{prefix}opt.{name}": arr[:n] for name, arr in self.opt_state.items()})
+        arrays.update({f"{prefix}global.{name}": arr for name, arr in self.global_state.items()})
+        meta = {"teams": list(self.teams), "opt_state": sorted(self.opt_state), "global_state": sorted(self.global_state)}
+        return arrays, meta
+
+    @classmethod
+    def from_arrays(cls, arrays, meta: Dict[str, Any], template: "TeamParamStore", prefix: str = "") -> "TeamParamStore":
+        """
+        Inverse of to_arrays. The coach/stadium source frames come from `template` (the store built from
+        the CSVs passed on the command line), which must be the inputs the arrays were written for.
+        """
+        n = len(meta["teams"])
+        store = cls(capacity=max(32, n))
+        store._coach_base = template._coach_base
+        store._stadium_base = template._stadium_base
+        store.teams = list(meta["teams"])
+        store.slots = {team: i for i, team in enumerate(store.teams)}
+        for name in ("coach", "entropy", "has_coach", "has_entropy"):
+            getattr(store, name)[:n] = arrays[f"{prefix}{name}"]
+        store.coach_rows = arrays[f"{prefix}coach_rows"].tolist()
+        store.entropy_rows = arrays[f"{prefix}entropy_rows"].tolist()
+        for name in meta["opt_state"]:
+            saved = arrays[f"{prefix}opt.{name}"]
+            store.opt_state[name] = np.zeros(len(store.coach), dtype=saved.dtype)
+            store.opt_state[name][:n] = saved
+        for name in meta["global_state"]:
+            store.global_state[name] = np.array(arrays[f"{prefix}global.{name}"])
+        for base, rows in ((store._coach_base, store.coach_rows), (store._stadium_base, store.entropy_rows)):
+            teams = base["Team"].drop_duplicates().tolist()
+            if [store.teams[i] for i in rows[:len(teams)]] != teams:
+                raise ValueError("Checkpoint does not match the coach/stadium CSVs it is being restored onto")
+        return store
+
+    def _materialize(self, base: pd.DataFrame, col: str, rows: List[int], values: np.ndarray) -> pd.DataFrame:
+        first = (~base["Team"].duplicated()).to_numpy()
+        n_base = int(first.sum())
+        out = base.copy()
+        column = pd.to_numeric(out[col], errors="coerce").to_numpy(dtype=np.float64, copy=True)
+        column[first] = values[rows[:n_base]]
+        out[col] = column
+        if len(rows) > n_base:
+            new_rows = rows[n_base:]
+            extra = pd.DataFrame({"Team": [self.teams[i] for i in new_rows], col: values[new_rows]})
+            out = pd.concat([out, extra], ignore_index=True) if len(out) else extra
+        return out
+
+    def coach_frame(self) -> pd.DataFrame:
+        return self._materialize(self._coach_base, "EVA_Scalar", self.coach_rows, self.coach)
+
+    def stadium_frame(self) -> pd.DataFrame:
+        return self._materialize(self._stadium_base, "Entropy_Alpha", self.entropy_rows, self.entropy)
 
 
 # ---------- Agent with gradient updates ----------
+OPTIMIZERS = ("sgd", "momentum", "adam")
+
+
 class GradArchonAgent:
     def __init__(self,
                  coach_df: pd.DataFrame,
@@ -104,10 +290,13 @@ class GradArchonAgent:
                  home_court_adv: float = 2.5,
                  clip_coach: Tuple[float, float] = (-5.0, 5.0),
                  clip_entropy: Tuple[float, float] = (-5.0, 5.0),
-                 clip_global: Tuple[float, float] = (-10.0, 10.0)):
-        # Keep mutable dataframes
-        self.coach_df = coach_df.copy().reset_index(drop=True)
-        self.stadium_df = stadium_df.copy().reset_index(drop=True)
+                 clip_global: Tuple[float, float] = (-10.0, 10.0),
+                 optimizer: str = "sgd",
+                 momentum: float = 0.9,
+                 beta2: float = 0.999,
+                 eps: float = 1e-8):
+        # Per-team parameters live in contiguous arrays; frames are materialized on demand
+        self.params = TeamParamStore.from_frames(coach_df, stadium_df)
         self.coach_weight = float(coach_weight)
         self.entropy_multiplier = float(entropy_multiplier)
         self.home_court_adv = float(home_court_adv)
@@ -117,16 +306,43 @@ class GradArchonAgent:
         self.clip_entropy = clip_entropy
         self.clip_global = clip_global
 
+        # optimizer for the array (batch / mini-batch) updates: momentum doubles as Adam's beta1
+        if optimizer not in OPTIMIZERS:
+            raise ValueError(f"Unknown optimizer {optimizer!r}; expected one of {OPTIMIZERS}")
+        self.optimizer = optimizer
+        self.momentum = float(momentum)
+        self.beta2 = float(beta2)
+        self.eps = float(eps)
+
+    @property
+    def coach_df(self) -> pd.DataFrame:
+        return self.params.coach_frame()
+
+    @coach_df.setter
+    def coach_df(self, df: pd.DataFrame) -> None:
+        self.params = TeamParamStore.from_frames(df, self.params.stadium_frame())
+
+    @property
+    def stadium_df(self) -> pd.DataFrame:
+        return self.params.stadium_frame()
+
+    @stadium_df.setter
+    def stadium_df(self, df: pd.DataFrame) -> None:
+        self.params = TeamParamStore.from_frames(self.params.coach_frame(), df)
+
+    def game_slots(self, team_a: str, team_b: str) -> Tuple[int, int]:
+        """Slots for (team_a, team_b), ensuring both have a coach entry and team_a a stadium entry."""
+        ia = self.params.ensure(team_a, coach=True, entropy=True)
+        ib = self.params.ensure(team_b, coach=True)
+        return ia, ib
+
     def predict_single(self, team_a: str, team_b: str, base_spread: float) -> Tuple[float, float, float]:
         """Return (pred, coaching_adj, entropy_adj)"""
         # ensure teams exist (so we can update later)
-        self.coach_df = ensure_team_in_df(self.coach_df, team_a, "EVA_Scalar", default=0.0)
-        self.coach_df = ensure_team_in_df(self.coach_df, team_b, "EVA_Scalar", default=0.0)
-        self.stadium_df = ensure_team_in_df(self.stadium_df, team_a, "Entropy_Alpha", default=0.0)
-
-        c_a = get_team_value(self.coach_df, team_a, "EVA_Scalar", 0.0)
-        c_b = get_team_value(self.coach_df, team_b, "EVA_Scalar", 0.0)
-        ent_a = get_team_value(self.stadium_df, team_a, "Entropy_Alpha", 0.0)
+        ia, ib = self.game_slots(team_a, team_b)
+        c_a = float(self.params.coach[ia])
+        c_b = float(self.params.coach[ib])
+        ent_a = float(self.params.entropy[ia])
 
         coaching_adj = (c_a - c_b) * self.coach_weight
         entropy_adj = ent_a * self.entropy_multiplier
@@ -168,13 +384,12 @@ class GradArchonAgent:
         Model: pred = base + coach_weight*(c_a - c_b) + entropy_multiplier*ent_a
         """
         # ensure existence
-        self.coach_df = ensure_team_in_df(self.coach_df, team_a, "EVA_Scalar", 0.0)
-        self.coach_df = ensure_team_in_df(self.coach_df, team_b, "EVA_Scalar", 0.0)
-        self.stadium_df = ensure_team_in_df(self.stadium_df, team_a, "Entropy_Alpha", 0.0)
-
-        c_a = get_team_value(self.coach_df, team_a, "EVA_Scalar", 0.0)
-        c_b = get_team_value(self.coach_df, team_b, "EVA_Scalar", 0.0)
-        ent_a = get_team_value(self.stadium_df, team_a, "Entropy_Alpha", 0.0)
+        ia, ib = self.game_slots(team_a, team_b)
+        coach = self.params.coach
+        entropy = self.params.entropy
+        c_a = float(coach[ia])
+        c_b = float(coach[ib])
+        ent_a = float(entropy[ia])
 
         dL_dpred = (pred - actual)  # derivative of 0.5*(pred-actual)^2 is (pred-actual)
         # Parameter gradients
@@ -196,20 +411,21 @@ class GradArchonAgent:
             new_ent_a = new_ent_a * (1.0 - lr_entropy * regularization)
 
         # Clip per-team params
-        new_c_a = float(np.clip(new_c_a, self.clip_coach[0], self.clip_coach[1]))
-        new_c_b = float(np.clip(new_c_b, self.clip_coach[0], self.clip_coach[1]))
-        new_ent_a = float(np.clip(new_ent_a, self.clip_entropy[0], self.clip_entropy[1]))
+        new_c_a = _clip(new_c_a, self.clip_coach)
+        new_c_b = _clip(new_c_b, self.clip_coach)
+        new_ent_a = _clip(new_ent_a, self.clip_entropy)
 
-        set_team_value(self.coach_df, team_a, "EVA_Scalar", new_c_a)
-        set_team_value(self.coach_df, team_b, "EVA_Scalar", new_c_b)
-        set_team_value(self.stadium_df, team_a, "Entropy_Alpha", new_ent_a)
+        # (team_a == team_b: c_b is written last and wins)
+        coach[ia] = new_c_a
+        coach[ib] = new_c_b
+        entropy[ia] = new_ent_a
 
         global_updates = {}
         if update_global:
             old_cw = self.coach_weight
             old_em = self.entropy_multiplier
-            self.coach_weight = float(np.clip(self.coach_weight - lr_global * grad_coach_weight, self.clip_global[0], self.clip_global[1]))
-            self.entropy_multiplier = float(np.clip(self.entropy_multiplier - lr_global * grad_entropy_mult, self.clip_global[0], self.clip_global[1]))
+            self.coach_weight = _clip(self.coach_weight - lr_global * grad_coach_weight, self.clip_global)
+            self.entropy_multiplier = _clip(self.entropy_multiplier - lr_global * grad_entropy_mult, self.clip_global)
             global_updates = {"old_coach_weight": old_cw, "new_coach_weight": self.coach_weight,
                               "old_entropy_multiplier": old_em, "new_entropy_multiplier": self.entropy_multiplier}
 
@@ -227,39 +443,725 @@ class GradArchonAgent:
             **global_updates
         }
 
+    def predict_arrays(self, ia: np.ndarray, ib: np.ndarray, base: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized predict_single over team-slot arrays: (pred, coaching_adj, entropy_adj)."""
+        coaching_adj = (self.params.coach[ia] - self.params.coach[ib]) * self.coach_weight
+        entropy_adj = self.params.entropy[ia] * self.entropy_multiplier
+        return base + coaching_adj + entropy_adj, coaching_adj, entropy_adj
+
+    def _step_direction(self, name: str, grad: np.ndarray, seen: np.ndarray) -> np.ndarray:
+        """
+        Turn an averaged gradient into an update direction (param -= lr * direction) with the
+        configured optimizer. Momentum / Adam state lives in the parameter store and is only
+        advanced for entries in `seen`; Adam keeps a step count per parameter so bias correction
+        stays right for rarely seen teams. name is "coach", "entropy" or "global".
+        """
+        if self.optimizer == "sgd":
+            return grad
+        params = self.params
+
+        def state(key: str, dtype=np.float64) -> np.ndarray:
+            if name == "global":
+                return params.global_state_array(key, dtype)
+            return params.state(key, dtype)[:len(grad)]
+
+        m = state(f"{name}_m")
+        if self.optimizer == "momentum":
+            m[seen] = self.momentum * m[seen] + grad[seen]
+            return m
+        v = state(f"{name}_v")
+        t = state(f"{name}_t", np.int64)
+        t[seen] += 1
+        m[seen] = self.momentum * m[seen] + (1.0 - self.momentum) * grad[seen]
+        v[seen] = self.beta2 * v[seen] + (1.0 - self.beta2) * grad[seen] ** 2
+        steps = np.maximum(t, 1)
+        m_hat = m / (1.0 - self.momentum ** steps)
+        v_hat = v / (1.0 - self.beta2 ** steps)
+        return m_hat / (np.sqrt(v_hat) + self.eps)
+
+    def apply_batch_gradients(self,
+                              ia: np.ndarray,
+                              ib: np.ndarray,
+                              base: np.ndarray,
+                              actual: np.ndarray,
+                              lr_coach: float = 0.01,
+                              lr_entropy: float = 0.01,
+                              lr_global: float = 0.001,
+                              update_global: bool = False,
+                              regularization: Optional[float] = None) -> np.ndarray:
+        """
+        One gradient step over a batch of games (team slots ia/ib, base spreads, actuals).
+
+        Residuals for all games are computed in one shot, per-team gradients are scatter-added
+        with bincount and averaged over the batch, turned into a step by the configured optimizer,
+        then L2 decay and clipping are applied to every team that appears in the batch.
+        Returns the (pre-update) predictions.
+        """
+        n = len(ia)
+        if n == 0:
+            return np.empty(0, dtype=np.float64)
+        params = self.params
+        size = len(params)
+        coach = params.coach[:size]
+        entropy = params.entropy[:size]
+
+        c_a = coach[ia]
+        c_b = coach[ib]
+        ent_a = entropy[ia]
+        pred, _, _ = self.predict_arrays(ia, ib, base)
+        dL_dpred = pred - actual
+
+        # interleave (team_a, team_b) per game so per-team sums accumulate in game order
+        coach_slots = np.stack([ia, ib], axis=1).ravel()
+        coach_grads = np.stack([dL_dpred * self.coach_weight, dL_dpred * (-self.coach_weight)], axis=1).ravel()
+        grad_coach = np.bincount(coach_slots, weights=coach_grads, minlength=size)
+        grad_entropy = np.bincount(ia, weights=dL_dpred * self.entropy_multiplier, minlength=size)
+        seen_coach = np.bincount(coach_slots, minlength=size) > 0
+        seen_entropy = np.bincount(ia, minlength=size) > 0
+
+        step_coach = self._step_direction("coach", grad_coach / n, seen_coach)
+        step_entropy = self._step_direction("entropy", grad_entropy / n, seen_entropy)
+        new_coach = coach - lr_coach * step_coach
+        new_entropy = entropy - lr_entropy * step_entropy
+        if regularization:
+            new_coach = new_coach * (1.0 - lr_coach * regularization)
+            new_entropy = new_entropy * (1.0 - lr_entropy * regularization)
+        new_coach = np.clip(new_coach, self.clip_coach[0], self.clip_coach[1])
+        new_entropy = np.clip(new_entropy, self.clip_entropy[0], self.clip_entropy[1])
+        coach[seen_coach] = new_coach[seen_coach]
+        entropy[seen_entropy] = new_entropy[seen_entropy]
+
+        if update_global:
+            grad_global = np.array([float(np.sum(dL_dpred * (c_a - c_b))) / n,
+                                    float(np.sum(dL_dpred * ent_a)) / n])
+            step_global = self._step_direction("global", grad_global, np.ones(2, dtype=bool))
+            self.coach_weight = _clip(self.coach_weight - lr_global * float(step_global[0]), self.clip_global)
+            self.entropy_multiplier = _clip(self.entropy_multiplier - lr_global * float(step_global[1]), self.clip_global)
+        return pred
+
     def save_intel(self, coach_path: str, stadium_path: str) -> None:
-        # Save dataframes (ensure columns are correct order)
-        if "Team" not in self.coach_df.columns or "EVA_Scalar" not in self.coach_df.columns:
-            # reorder/rename if needed
-            self.coach_df = self.coach_df.rename(columns={self.coach_df.columns[0]: "Team"})
-        if "Team" not in self.stadium_df.columns or "Entropy_Alpha" not in self.stadium_df.columns:
-            self.stadium_df = self.stadium_df.rename(columns={self.stadium_df.columns[0]: "Team"})
-        self.coach_df.to_csv(coach_path, index=False)
-        self.stadium_df.to_csv(stadium_path, index=False)
-        LOG.info("Saved coach intelligence -> %s (%d rows)", coach_path, len(self.coach_df))
-        LOG.info("Saved stadium intelligence -> %s (%d rows)", stadium_path, len(self.stadium_df))
+        # Materialize the parameter arrays back into the coach / stadium frames
+        coach_df = self.params.coach_frame()
+        stadium_df = self.params.stadium_frame()
+        coach_df.to_csv(coach_path, index=False)
+        stadium_df.to_csv(stadium_path, index=False)
+        LOG.info("Saved coach intelligence -> %s (%d rows)", coach_path, len(coach_df))
+        LOG.info("Saved stadium intelligence -> %s (%d rows)", stadium_path, len(stadium_df))
+
+
+# ---------- Online SGD kernel ----------
+ONLINE_KERNELS = ("auto", "numba", "python", "off")
+# per-game diagnostics written by the kernel, in ledger column order
+KERNEL_DIAG = ("Predicted", "Actual", "Error", "grad_c_a", "grad_c_b", "grad_ent_a",
+               "updated_c_a", "updated_c_b", "updated_ent_a", "coach_weight", "entropy_multiplier")
+
+
+def _online_sgd_epoch(ia, ib, base, actual, coach, entropy, weights,
+                      lr_coach, lr_entropy, lr_global, update_global, regularization,
+                      coach_lo, coach_hi, entropy_lo, entropy_hi, global_lo, global_hi, diag):
+    """
+    Sequential online SGD over games k = 0..n-1 with exactly the arithmetic of predict_single +
+    apply_gradients (same operation order, clipping as min(max(v, lo), hi)). Works on NumPy arrays
+    under numba.njit and on plain lists when interpreted. weights = [coach_weight, entropy_multiplier]
+    is updated in place; diag is a flat n * len(KERNEL_DIAG) buffer.
+    """
+    n_diag = 11
+    for k in range(len(ia)):
+        a = ia[k]
+        b = ib[k]
+        cw = weights[0]
+        em = weights[1]
+        c_a = coach[a]
+        c_b = coach[b]
+        ent_a = entropy[a]
+        pred = base[k] + (c_a - c_b) * cw + ent_a * em
+        dl = pred - actual[k]
+        grad_c_a = dl * cw
+        grad_c_b = dl * (-cw)
+        grad_ent_a = dl * em
+        new_c_a = c_a - lr_coach * grad_c_a
+        new_c_b = c_b - lr_coach * grad_c_b
+        new_ent_a = ent_a - lr_entropy * grad_ent_a
+        if regularization != 0.0:
+            new_c_a = new_c_a * (1.0 - lr_coach * regularization)
+            new_c_b = new_c_b * (1.0 - lr_coach * regularization)
+            new_ent_a = new_ent_a * (1.0 - lr_entropy * regularization)
+        new_c_a = coach_lo if coach_lo > new_c_a else new_c_a
+        new_c_a = coach_hi if coach_hi < new_c_a else new_c_a
+        new_c_b = coach_lo if coach_lo > new_c_b else new_c_b
+        new_c_b = coach_hi if coach_hi < new_c_b else new_c_b
+        new_ent_a = entropy_lo if entropy_lo > new_ent_a else new_ent_a
+        new_ent_a = entropy_hi if entropy_hi < new_ent_a else new_ent_a
+        coach[a] = new_c_a
+        coach[b] = new_c_b
+        entropy[a] = new_ent_a
+        if update_global:
+            cw = cw - lr_global * (dl * (c_a - c_b))
+            cw = global_lo if global_lo > cw else cw
+            cw = global_hi if global_hi < cw else cw
+            em = em - lr_global * (dl * ent_a)
+            em = global_lo if global_lo > em else em
+            em = global_hi if global_hi < em else em
+            weights[0] = cw
+            weights[1] = em
+        o = k * n_diag
+        diag[o] = pred
+        diag[o + 1] = actual[k]
+        diag[o + 2] = abs(dl)
+        diag[o + 3] = grad_c_a
+        diag[o + 4] = grad_c_b
+        diag[o + 5] = grad_ent_a
+        diag[o + 6] = new_c_a
+        diag[o + 7] = new_c_b
+        diag[o + 8] = new_ent_a
+        diag[o + 9] = cw
+        diag[o + 10] = em
+
+
+_online_sgd_epoch_jit = numba.njit(_online_sgd_epoch) if NUMBA_AVAILABLE else None
+
+
+def resolve_online_kernel(kernel: str) -> str:
+    """Map "auto" to "numba" when it is installed, else to the interpreted "python" kernel."""
+    if kernel not in ONLINE_KERNELS:
+        raise ValueError(f"Unknown online kernel {kernel!r}; expected one of {ONLINE_KERNELS}")
+    if kernel == "auto":
+        return "numba" if NUMBA_AVAILABLE else "python"
+    if kernel == "numba" and not NUMBA_AVAILABLE:
+        raise ValueError("online kernel 'numba' requested but numba is not installed")
+    return kernel
+
+
+def run_online_epoch(agent: GradArchonAgent,
+                     ia: np.ndarray,
+                     ib: np.ndarray,
+                     base: np.ndarray,
+                     actual: np.ndarray,
+                     lr_coach: float = 0.01,
+                     lr_entropy: float = 0.01,
+                     lr_global: float = 0.001,
+                     update_global: bool = False,
+                     regularization: Optional[float] = None,
+                     kernel: str = "auto") -> np.ndarray:
+    """
+    Apply online updates for the games (ia[k], ib[k], base[k], actual[k]) in order, bit-for-bit as
+    predict_single + apply_gradients would. Team slots must already exist in agent.params.
+    Returns an (n x len(KERNEL_DIAG)) diagnostics array.
+    """
+    kernel = resolve_online_kernel(kernel)
+    n = len(ia)
+    params = agent.params
+    weights = np.array([agent.coach_weight, agent.entropy_multiplier], dtype=np.float64)
+    bounds = (float(agent.clip_coach[0]), float(agent.clip_coach[1]), float(agent.clip_entropy[0]),
+              float(agent.clip_entropy[1]), float(agent.clip_global[0]), float(agent.clip_global[1]))
+    settings = (float(lr_coach), float(lr_entropy), float(lr_global), bool(update_global), float(regularization or 0.0))
+    diag = np.empty(n * len(KERNEL_DIAG), dtype=np.float64)
+    if kernel == "numba":
+        _online_sgd_epoch_jit(np.ascontiguousarray(ia, dtype=np.int64), np.ascontiguousarray(ib, dtype=np.int64),
+                              np.ascontiguousarray(base, dtype=np.float64), np.ascontiguousarray(actual, dtype=np.float64),
+                              params.coach, params.entropy, weights, *settings, *bounds, diag)
+    else:
+        # Python floats in lists are much faster to index than NumPy scalars, with identical arithmetic
+        coach, entropy, w, out = params.coach.tolist(), params.entropy.tolist(), weights.tolist(), diag.tolist()
+        _online_sgd_epoch(ia.tolist(), ib.tolist(), np.asarray(base, dtype=np.float64).tolist(),
+                          np.asarray(actual, dtype=np.float64).tolist(), coach, entropy, w, *settings, *bounds, out)
+        params.coach[:] = coach
+        params.entropy[:] = entropy
+        weights[:] = w
+        diag[:] = out
+    agent.coach_weight = float(weights[0])
+    agent.entropy_multiplier = float(weights[1])
+    return diag.reshape(n, len(KERNEL_DIAG))
+
+
+# ---------- Game index arrays ----------
+class GameArrays(NamedTuple):
+    """Master rows compiled to arrays; ia/ib are parameter-store slots (-1 where unmatched)."""
+    matchup: np.ndarray
+    matched: np.ndarray
+    ia: np.ndarray
+    ib: np.ndarray
+    base: np.ndarray
+    actual: np.ndarray
+
+
+def actuals_lookup(df_actuals: pd.DataFrame) -> pd.Series:
+    """Matchup -> Actual_Spread (last row wins for duplicated matchups, like the dict maps)."""
+    df = df_actuals.drop_duplicates(subset="Matchup", keep="last")
+    return pd.Series(df["Actual_Spread"].astype(float).to_numpy(), index=df["Matchup"].to_numpy())
+
+
+def index_games(agent: GradArchonAgent, df_master: pd.DataFrame, df_actuals: pd.DataFrame,
+                order: Optional[np.ndarray] = None) -> GameArrays:
+    """
+    Compile the master + actuals into team-slot and value arrays once. Teams of matched games
+    are registered in the agent's parameter store in master order, or in the row order `order`
+    (a permutation of the master rows) when given.
+    """
+    team_a = df_master["Team_A_Key"]
+    team_b = df_master["Team_B_Key"]
+    matchup = (team_a.astype(str) + " vs " + team_b.astype(str)).to_numpy()
+    lookup = actuals_lookup(df_actuals)
+    matched = pd.Index(lookup.index).get_indexer(matchup) >= 0
+    actual = lookup.reindex(matchup).to_numpy(dtype=np.float64)
+
+    ia = np.full(len(df_master), -1, dtype=np.int64)
+    ib = np.full(len(df_master), -1, dtype=np.int64)
+    rows = np.flatnonzero(matched) if order is None else order[matched[order]]
+    for i, a, b in zip(rows.tolist(), team_a.to_numpy()[rows].tolist(), team_b.to_numpy()[rows].tolist()):
+        ia[i], ib[i] = agent.game_slots(a, b)
+    base = df_master["Delta_W_Final"].astype(float).to_numpy()
+    return GameArrays(matchup, matched, ia, ib, base, actual)
+
+
+def epoch_order(n: int) -> np.ndarray:
+    """Per-epoch shuffle; identical to df.sample(frac=1.0, random_state=np.random.randint(0, 2**31))."""
+    return np.random.RandomState(np.random.randint(0, 2**31)).permutation(n)
+
+
+# ---------- Streaming ledger ----------
+LEDGER_BATCH_COLUMNS: Dict[str, Any] = {
+    "Matchup": object, "Predicted": np.float64, "Actual": np.float64, "Error": np.float64, "UpdateMode": object,
+}
+LEDGER_ONLINE_COLUMNS: Dict[str, Any] = dict(
+    LEDGER_BATCH_COLUMNS,
+    grad_c_a=np.float64, grad_c_b=np.float64, grad_ent_a=np.float64,
+    updated_c_a=np.float64, updated_c_b=np.float64, updated_ent_a=np.float64,
+    coach_weight=np.float64, entropy_multiplier=np.float64,
+)
+
+
+class LedgerWriter:
+    """
+    Streaming training ledger. Rows go into preallocated typed column buffers that are flushed
+    every `chunk_rows` rows and at each epoch boundary, so memory stays flat and everything up to the
+    last flush survives a crash. All rows of an epoch share one timestamp (set by start_epoch).
+
+    A `path` ending in .parquet is a directory of zstd-compressed Parquet parts, one per flush
+    (read it back with pd.read_parquet(path)); it needs pyarrow and falls back to <stem>.csv.gz
+    without it. Any other path is CSV, compressed when the extension says so (e.g. .csv.gz).
+    path=None keeps the whole ledger in memory; path=False discards the rows (for callers that only need
+    the run summary) and close() returns an empty frame. With `resume_epoch`, existing rows up to that
+    epoch are kept and later ones (written after the last checkpoint) are dropped: Parquet parts by
+    epoch, CSV by truncating the file to `resume_bytes` (its size at that checkpoint, see tell()).
+    Every CSV flush appends a self-contained chunk (a separate member for .gz / .bz2 / .xz), so the
+    cut always falls on a chunk boundary and compressed ledgers truncate alike.
+    """
+
+    def __init__(self, path: Union[str, None, bool], columns: Dict[str, Any], chunk_rows: int = 65536,
+                 resume_epoch: Optional[int] = None, resume_bytes: Optional[int] = None):
+        if path and path.endswith(".parquet") and not PYARROW_AVAILABLE:
+            LOG.warning("pyarrow not available; writing the ledger as CSV instead of Parquet.")
+            path = path[:-len(".parquet")] + ".csv.gz"
+        self.discard = path is False
+        self.path = None if self.discard else path
+        self.parquet = bool(path) and path.endswith(".parquet")
+        self.columns = dict(columns)
+        self.chunk_rows = max(int(chunk_rows), 1)
+        self._buffers = [np.empty(self.chunk_rows, dtype=dtype) for dtype in self.columns.values()]
+        self._n = 0
+        self._epoch = 0
+        self._timestamp = ""
+        self._part = 0
+        self._frames: List[pd.DataFrame] = []
+        self.preview: Optional[pd.DataFrame] = None
+        self.rows_written = 0
+        if self.parquet:
+            self._schema = pa.schema([pa.field("epoch", pa.int64()), pa.field("timestamp", pa.string())]
+                                     + [pa.field(name, pa.string() if dtype is object else pa.float64())
+                                        for name, dtype in self.columns.items()])
+        if path:
+            self._prepare(resume_epoch, resume_bytes)
+
+    def tell(self) -> Optional[int]:
+        """Bytes of a CSV ledger on disk (after flush()); None for Parquet and in-memory ledgers."""
+        if not self.path or self.parquet:
+            return None
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def _prepare(self, resume_epoch: Optional[int], resume_bytes: Optional[int] = None) -> None:
+        """Clear a previous ledger, or trim it back to `resume_epoch` when continuing a run."""
+        keep = -1 if resume_epoch is None else resume_epoch
+        if self.parquet:
+            os.makedirs(self.path, exist_ok=True)
+            for name in os.listdir(self.path):
+                if name.startswith("part-") and name.endswith(".parquet") and int(name.split("-")[1]) > keep:
+                    os.remove(os.path.join(self.path, name))
+            return
+        if not os.path.exists(self.path):
+            return
+        size = os.path.getsize(self.path)
+        if keep < 0 or size == 0 or resume_bytes == 0:
+            os.remove(self.path)
+            return
+        if resume_bytes is not None and resume_bytes <= size:
+            with open(self.path, "r+b") as fh:
+                fh.truncate(resume_bytes)
+            return
+        if resume_bytes is not None:
+            LOG.warning("Ledger %s is shorter than at the checkpoint; filtering it by epoch instead.", self.path)
+        # rewrite through a temp file with the same extension, so compression is inferred alike
+        tmp = os.path.join(os.path.dirname(self.path), f".{os.getpid()}.tmp-{os.path.basename(self.path)}")
+        first = True
+        for block in pd.read_csv(self.path, chunksize=self.chunk_rows):
+            block[block["epoch"] <= keep].to_csv(tmp, mode="w" if first else "a", header=first, index=False)
+            first = False
+        os.replace(tmp, self.path)
+
+    def start_epoch(self, epoch: int) -> None:
+        self.flush()
+        self._epoch = int(epoch)
+        self._timestamp = datetime.utcnow().isoformat()
+        self._part = 0
+
+    def add_row(self, values: Tuple) -> None:
+        """Append one row; values follow the column order (NaN / None for missing entries)."""
+        if self.discard:
+            return
+        n = self._n
+        for buf, value in zip(self._buffers, values):
+            buf[n] = value
+        self._n = n + 1
+        if self._n == self.chunk_rows:
+            self.flush()
+
+    def add_columns(self, **columns: np.ndarray) -> None:
+        """Append equal-length column arrays; columns not given are filled with NaN / None."""
+        if self.discard:
+            return
+        n = len(next(iter(columns.values())))
+        lo = 0
+        while lo < n:
+            take = min(n - lo, self.chunk_rows - self._n)
+            for (name, dtype), buf in zip(self.columns.items(), self._buffers):
+                if name in columns:
+                    buf[self._n:self._n + take] = columns[name][lo:lo + take]
+                else:
+                    buf[self._n:self._n + take] = None if dtype is object else np.nan
+            self._n += take
+            lo += take
+            if self._n == self.chunk_rows:
+                self.flush()
+
+    def flush(self) -> None:
+        n = self._n
+        if n == 0:
+            return
+        df = pd.DataFrame({"epoch": np.full(n, self._epoch, dtype=np.int64), "timestamp": self._timestamp,
+                           **{name: buf[:n].copy() for name, buf in zip(self.columns, self._buffers)}})
+        self._n = 0
+        if self.preview is None:
+            self.preview = df
+        if not self.path:
+            self._frames.append(df)
+        elif self.parquet:
+            part = os.path.join(self.path, f"part-{self._epoch:05d}-{self._part:04d}.parquet")
+            tmp = f"{part}.{os.getpid()}.tmp"
+            pq.write_table(pa.Table.from_pandas(df, schema=self._schema, preserve_index=False), tmp, compression="zstd")
+            os.replace(tmp, part)
+            self._part += 1
+        else:
+            header = not os.path.exists(self.path)
+            df.to_csv(self.path, mode="a", header=header, index=False)
+        self.rows_written += n
+
+    def close(self) -> pd.DataFrame:
+        """
+        Flush what is left. Returns the full ledger for in-memory writers, otherwise the first
+        flushed chunk as a preview.
+        """
+        self.flush()
+        empty = pd.DataFrame({"epoch": pd.Series(dtype=np.int64), "timestamp": pd.Series(dtype=object),
+                              **{name: pd.Series(dtype=dtype) for name, dtype in self.columns.items()}})
+        if self.discard:
+            return empty
+        if not self.path:
+            return pd.concat(self._frames, ignore_index=True) if self._frames else empty
+        if self.parquet and not os.listdir(self.path):
+            pq.write_table(pa.Table.from_pandas(empty, schema=self._schema, preserve_index=False),
+                           os.path.join(self.path, "part-00000-0000.parquet"), compression="zstd")
+        elif not self.parquet and not os.path.exists(self.path):
+            empty.to_csv(self.path, index=False)
+        LOG.info("Saved training ledger to %s (%d rows)", self.path, self.rows_written)
+        return self.preview if self.preview is not None else empty
+
+
+# ---------- Parameter trajectories ----------
+TRAJECTORY_INDEX = "index.json"
+
+
+def _write_trajectory_index(directory: str, teams: List[Any], steps: List[int]) -> None:
+    index = {"teams": list(teams), "steps": [int(s) for s in steps], "rows": len(steps)}
+    path = os.path.join(directory, TRAJECTORY_INDEX)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as fh:
+        json.dump(index, fh, default=str)
+    os.replace(tmp, path)
+
+
+class TrajectoryRecorder:
+    """
+    Dense per-team parameter trajectories written straight into memory-mapped .npy files in
+    `directory`: coach.npy and entropy.npy (steps x teams, float32, EVA_Scalar / Entropy_Alpha),
+    global.npy (steps x 2: coach_weight, entropy_multiplier) and index.json (team per column,
+    step label per row, rows used). Rows are preallocated for `steps` records and team columns
+    for `n_teams`; columns of teams not registered yet are NaN. `keep_rows` carries over the first
+    rows of an existing recording (resumed runs).
+    """
+
+    def __init__(self, directory: str, steps: int, n_teams: int, keep_rows: Optional[int] = None):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        old = None
+        if keep_rows and os.path.exists(os.path.join(directory, TRAJECTORY_INDEX)):
+            saved = load_trajectories(directory)
+            keep = min(keep_rows, len(saved["steps"]))
+            old = {name: np.array(saved[name][:keep]) for name in ("coach", "entropy", "global")}
+            n_teams = max(n_teams, len(saved["teams"]))
+            self.teams, self.steps = list(saved["teams"]), list(saved["steps"][:keep])
+        else:
+            self.teams, self.steps = [], []
+        self.capacity = max(int(steps), len(self.steps))
+        self.arrays = {}
+        for name, width in (("coach", n_teams), ("entropy", n_teams), ("global", 2)):
+            arr = np.lib.format.open_memmap(os.path.join(directory, f"{name}.npy"), mode="w+",
+                                            dtype=np.float32, shape=(self.capacity, width))
+            arr[:] = np.nan
+            if old is not None:
+                arr[:len(self.steps), :old[name].shape[1]] = old[name]
+            self.arrays[name] = arr
+        _write_trajectory_index(directory, self.teams, self.steps)
+
+    def record(self, step: int, store: TeamParamStore, coach_weight: float, entropy_multiplier: float) -> None:
+        row = len(self.steps)
+        if row >= self.capacity:
+            LOG.warning("Trajectory recorder full (%d rows); step %d not recorded", self.capacity, step)
+            return
+        n = min(len(store), self.arrays["coach"].shape[1])
+        self.arrays["coach"][row, :n] = store.coach[:n]
+        self.arrays["entropy"][row, :n] = store.entropy[:n]
+        self.arrays["global"][row] = (coach_weight, entropy_multiplier)
+        if n > len(self.teams):
+            self.teams = list(store.teams[:n])
+        self.steps.append(step)
+        for arr in self.arrays.values():
+            arr.flush()
+        _write_trajectory_index(self.directory, self.teams, self.steps)
+
+
+def load_trajectories(directory: str, mmap: bool = True) -> Dict[str, Any]:
+    """
+    Open a trajectory directory (TrajectoryRecorder or reduce_ledger_trajectories output):
+    teams, steps and the coach / entropy / global arrays trimmed to the recorded rows
+    (memory-mapped, read-only, unless mmap=False).
+    """
+    with open(os.path.join(directory, TRAJECTORY_INDEX)) as fh:
+        index = json.load(fh)
+    rows = index["rows"]
+    out: Dict[str, Any] = {"teams": index["teams"], "steps": np.asarray(index["steps"], dtype=np.int64)}
+    for name in ("coach", "entropy", "global"):
+        arr = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r" if mmap else None)
+        out[name] = arr[:rows] if name == "global" else arr[:rows, :len(index["teams"])]
+    return out
+
+
+def _iter_ledger_blocks(ledger_path: str, columns: List[str], chunksize: int):
+    """Ledger rows in order, in blocks: CSV (chunked read) or a LedgerWriter Parquet directory."""
+    if os.path.isdir(ledger_path):
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("Reading a Parquet ledger requires pyarrow")
+        for name in sorted(os.listdir(ledger_path)):
+            if name.startswith("part-") and name.endswith(".parquet"):
+                for batch in pq.ParquetFile(os.path.join(ledger_path, name)).iter_batches(batch_size=chunksize, columns=columns):
+                    yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(ledger_path, usecols=columns, chunksize=chunksize)
+
+
+def reduce_ledger_trajectories(ledger_path: str, directory: str, chunksize: int = 200000) -> Dict[str, Any]:
+    """
+    One streaming pass over an online grad ledger (updated_c_a / updated_c_b / updated_ent_a rows)
+    to the TrajectoryRecorder layout in `directory`: one row per epoch holding each team's value
+    after its last update in that epoch (carried forward while a team is idle, NaN before its first
+    update), teams in order of first appearance. Returns load_trajectories(directory).
+    """
+    columns = ["epoch", "Matchup", "updated_c_a", "updated_c_b", "updated_ent_a", "coach_weight", "entropy_multiplier"]
+    last = pd.DataFrame(columns=["epoch", "kind", "team", "value"])
+    globals_by_epoch: Dict[int, Tuple[float, float]] = {}
+    teams: Dict[Any, int] = {}
+    try:
+        blocks = _iter_ledger_blocks(ledger_path, columns, chunksize)
+        for block in blocks:
+            block = block[block["updated_c_a"].notna()]
+            if block.empty:
+                continue
+            n = len(block)
+            parts = block["Matchup"].astype(str).str.partition(" vs ")
+            epoch = block["epoch"].to_numpy(dtype=np.int64)
+            # per game, writes happen in the order coach[a], coach[b], entropy[a]
+            long = pd.DataFrame({
+                "epoch": np.concatenate([epoch, epoch, epoch]),
+                "kind": np.repeat(np.array([0, 0, 1]), n),
+                "team": np.concatenate([parts[0].to_numpy(), parts[2].to_numpy(), parts[0].to_numpy()]),
+                "value": np.concatenate([block["updated_c_a"].to_numpy(dtype=np.float64),
+                                         block["updated_c_b"].to_numpy(dtype=np.float64),
+                                         block["updated_ent_a"].to_numpy(dtype=np.float64)]),
+                "order": np.concatenate([np.arange(n) * 3, np.arange(n) * 3 + 1, np.arange(n) * 3 + 2]),
+            }).sort_values("order", kind="stable").drop(columns="order")
+            for team in pd.unique(long["team"]):
+                teams.setdefault(team, len(teams))
+            last = pd.concat([last, long], ignore_index=True).drop_duplicates(["epoch", "kind", "team"], keep="last")
+            for ep, cw, em in block.groupby("epoch", sort=False)[["coach_weight", "entropy_multiplier"]].last().itertuples():
+                globals_by_epoch[int(ep)] = (cw, em)
+    except ValueError as e:
+        raise ValueError(f"{ledger_path} is not an online grad ledger with per-team updates ({e})") from e
+    if not globals_by_epoch:
+        raise ValueError(f"No per-team updates found in {ledger_path} (batch ledgers do not record them)")
+
+    steps = sorted(globals_by_epoch)
+    grids = {}
+    for kind, name in ((0, "coach"), (1, "entropy")):
+        sel = last[last["kind"] == kind]
+        grid = np.full((len(steps), len(teams)), np.nan)
+        grid[np.searchsorted(steps, sel["epoch"].to_numpy(dtype=np.int64)),
+             sel["team"].map(teams).to_numpy(dtype=np.int64)] = sel["value"].to_numpy(dtype=np.float64)
+        grids[name] = pd.DataFrame(grid).ffill().to_numpy()
+    recorder = TrajectoryRecorder(directory, len(steps), len(teams))
+    recorder.arrays["coach"][:] = grids["coach"]
+    recorder.arrays["entropy"][:] = grids["entropy"]
+    recorder.arrays["global"][:] = [globals_by_epoch[s] for s in steps]
+    for arr in recorder.arrays.values():
+        arr.flush()
+    _write_trajectory_index(directory, list(teams), steps)
+    LOG.info("Reduced %s to %d epochs x %d teams -> %s", ledger_path, len(steps), len(teams), directory)
+    return load_trajectories(directory)
 
 
 # ---------- Validation & training loop (with early stopping) ----------
-def compute_validation_loss(agent: GradArchonAgent, df_master: pd.DataFrame, df_val_actuals: pd.DataFrame) -> Optional[float]:
-    """
-    Compute mean squared error on validation set using matchups found in master + validation actuals.
-    Returns MSE or None if no overlapping matchups.
-    """
-    # build a map of actuals
-    val_map = {r["Matchup"]: float(r["Actual_Spread"]) for _, r in df_val_actuals.iterrows()}
-    errors = []
-    for _, r in df_master.iterrows():
-        matchup = f"{r['Team_A_Key']} vs {r['Team_B_Key']}"
-        if matchup not in val_map:
-            continue
-        base = float(r["Delta_W_Final"])
-        pred, _, _ = agent.predict_single(r["Team_A_Key"], r["Team_B_Key"], base)
-        err = (pred - val_map[matchup]) ** 2
-        errors.append(err)
-    if len(errors) == 0:
+class ValidationTracker:
+    """
+    Running validation MSE for the validation games found in the master.
+
+    Index arrays are built once. After an online update that touched the parameters of teams
+    `slots`, only the validation games involving those teams are re-predicted and the running
+    squared-error sum is adjusted, so the MSE is current after every update at a cost proportional
+    to those teams' games. refresh() recomputes everything (global-weight changes, epoch ends).
+    """
+
+    def __init__(self, agent: GradArchonAgent, df_master: pd.DataFrame, df_val_actuals: pd.DataFrame):
+        games = index_games(agent, df_master, df_val_actuals)
+        rows = np.flatnonzero(games.matched)
+        self.agent = agent
+        self.ia, self.ib = games.ia[rows], games.ib[rows]
+        self.base, self.actual = games.base[rows], games.actual[rows]
+        # team slot -> validation games it plays in (as team_a or team_b), CSR layout
+        n = len(rows)
+        slots = np.concatenate([self.ia, self.ib])
+        order = np.argsort(slots, kind="stable")
+        self._games = np.concatenate([np.arange(n), np.arange(n)])[order]
+        self._offsets = np.searchsorted(slots[order], np.arange(len(agent.params) + 1))
+        self.sq_err = np.zeros(n, dtype=np.float64)
+        self.sse = 0.0
+        self.refresh()
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def _sq_err(self, games: np.ndarray) -> np.ndarray:
+        pred, _, _ = self.agent.predict_arrays(self.ia[games], self.ib[games], self.base[games])
+        return (pred - self.actual[games]) ** 2
+
+    def refresh(self) -> Optional[float]:
+        """Re-predict every validation game; returns the MSE (None if there are no games)."""
+        if len(self) == 0:
+            return None
+        self.sq_err = self._sq_err(np.arange(len(self)))
+        self.sse = float(np.sum(self.sq_err))
+        return float(np.mean(self.sq_err))
+
+    def update(self, slots: Tuple[int, ...]) -> None:
+        """Adjust the running error after the parameters of the given team slots changed."""
+        n_slots = len(self._offsets) - 1
+        parts = [self._games[self._offsets[s]:self._offsets[s + 1]] for s in slots if s < n_slots]
+        if not parts:
+            return
+        games = np.unique(np.concatenate(parts))
+        if len(games) == 0:
+            return
+        new = self._sq_err(games)
+        self.sse += float(np.sum(new) - np.sum(self.sq_err[games]))
+        self.sq_err[games] = new
+
+    def mse(self) -> Optional[float]:
+        return self.sse / len(self) if len(self) else None
+
+
+# ---------- Checkpoints ----------
+CHECKPOINT_FILE = "checkpoint.npz"
+
+
+def _atomic_savez(path: str, arrays: Dict[str, np.ndarray]) -> None:
+    """Write an .npz next to `path` and rename it into place, so a crash never leaves a torn checkpoint."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        np.savez(fh, **arrays)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+def save_checkpoint(checkpoint_dir: str, agent: GradArchonAgent, loop_state: Dict[str, Any],
+                    best_state: Optional[Dict[str, Any]]) -> str:
+    """
+    Snapshot everything needed to continue a training run exactly: parameter and optimizer arrays,
+    global weights, the best state so far, the NumPy global RNG state (epoch shuffles) and the loop
+    counters in `loop_state` (epoch, updates, wait, best_val_loss, stopped, config, ledger_bytes).
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    arrays, params_meta = agent.params.to_arrays("params.")
+    rng_name, rng_keys, rng_pos, rng_has_gauss, rng_gauss = np.random.get_state()
+    arrays["rng_keys"] = rng_keys
+    meta = dict(loop_state,
+                params=params_meta,
+                coach_weight=agent.coach_weight,
+                entropy_multiplier=agent.entropy_multiplier,
+                rng=[rng_name, int(rng_pos), int(rng_has_gauss), float(rng_gauss)],
+                best=None)
+    if best_state is not None:
+        best_arrays, best_meta = best_state["params"].to_arrays("best.")
+        arrays.update(best_arrays)
+        meta["best"] = dict({k: v for k, v in best_state.items() if k != "params"}, params=best_meta)
+    arrays["meta"] = np.array(json.dumps(meta))
+    path = os.path.join(checkpoint_dir, CHECKPOINT_FILE)
+    _atomic_savez(path, arrays)
+    LOG.debug("Saved checkpoint -> %s (epoch %d)", path, loop_state["epoch"])
+    return path
+
+
+def load_checkpoint(checkpoint_dir: str, agent: GradArchonAgent) -> Optional[Dict[str, Any]]:
+    """
+    Restore the agent's parameters, optimizer state, global weights and the NumPy RNG from
+    `checkpoint_dir`. Returns the saved loop state (with "best_state" rebuilt), or None if there
+    is no checkpoint yet.
+    """
+    path = os.path.join(checkpoint_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
         return None
-    return float(np.mean(errors))
+    with np.load(path) as data:
+        arrays = {name: data[name] for name in data.files}
+    meta = json.loads(str(arrays.pop("meta")))
+    template = agent.params
+    agent.params = TeamParamStore.from_arrays(arrays, meta.pop("params"), template, "params.")
+    agent.coach_weight = meta.pop("coach_weight")
+    agent.entropy_multiplier = meta.pop("entropy_multiplier")
+    rng_name, rng_pos, rng_has_gauss, rng_gauss = meta.pop("rng")
+    np.random.set_state((rng_name, arrays["rng_keys"], rng_pos, rng_has_gauss, rng_gauss))
+    best = meta.pop("best")
+    if best is not None:
+        best["params"] = TeamParamStore.from_arrays(arrays, best["params"], template, "best.")
+    meta["best_state"] = best
+    LOG.info("Resumed from checkpoint %s (epoch %d)", path, meta["epoch"])
+    return meta
 
 
 def training_loop_grad_es(agent: GradArchonAgent,
@@ -273,196 +1175,986 @@ def training_loop_grad_es(agent: GradArchonAgent,
                           update_global: bool = False,
                           online: bool = True,
                           regularization: Optional[float] = None,
-                          ledger_path: str = "archon_learning_ledger_grad.csv",
+                          ledger_path: Union[str, None, bool] = "archon_learning_ledger_grad.csv",
                           patience: int = 5,
                           min_delta: float = 1e-4,
-                          restore_best: bool = True) -> pd.DataFrame:
+                          restore_best: bool = True,
+                          batch_size: Optional[int] = None,
+                          val_every: Optional[int] = None,
+                          checkpoint_dir: Optional[str] = None,
+                          checkpoint_every: int = 1,
+                          resume: bool = False,
+                          ledger_chunk_rows: int = 65536,
+                          online_kernel: str = "auto",
+                          trajectory_dir: Optional[str] = None) -> pd.DataFrame:
     """
     Train with gradient updates and early stopping on validation set.
 
     If df_val_actuals is provided, early-stopping monitors validation MSE.
+    Without `online`, each epoch is one full-batch step, or shuffled mini-batches of
+    `batch_size` games; the agent's optimizer (sgd / momentum / adam) turns gradients into steps.
+    Validation MSE comes from a ValidationTracker; with `online` and `val_every`, it is kept current
+    after each update and early stopping is also checked every `val_every` updates (patience then
+    counts checks rather than epochs). Otherwise online epochs run in the array kernel
+    `online_kernel` (see run_online_epoch; "off" keeps the per-row DataFrame loop).
+
+    With `checkpoint_dir`, a checkpoint (see save_checkpoint) is written atomically every
+    `checkpoint_every` epochs and when the run ends; `resume` continues from it exactly (same
+    shuffles, optimizer state and patience); ledger rows past the checkpoint are dropped and the
+    ledger continues from there.
+
+    With `trajectory_dir`, per-team parameters are recorded at the start and after every epoch
+    into a TrajectoryRecorder (memory-mapped steps x teams arrays, step = epoch).
+
+    The ledger is streamed to `ledger_path` by a LedgerWriter (CSV, or compressed Parquet parts
+    for a .parquet path); with a path, only its first chunk is returned as a preview, and
+    ledger_path=False keeps no rows at all (the returned frame is empty but still carries attrs).
+
+    The returned ledger carries a run summary in df_ledger.attrs
+    (best_val_loss, best_epoch, epochs_run).
     """
-    actual_map = {r["Matchup"]: float(r["Actual_Spread"]) for _, r in df_actuals.iterrows()}
-    ledger_rows = []
-
+    config = {"lr_coach": lr_coach, "lr_entropy": lr_entropy, "lr_global": lr_global, "update_global": update_global,
+              "online": online, "regularization": regularization, "batch_size": batch_size, "val_every": val_every,
+              "optimizer": agent.optimizer, "patience": patience, "min_delta": min_delta}
     best_val_loss = np.inf
     best_state = None
     wait = 0
+    updates = 0
+    stopped = False
+    start_epoch = 0
+    resumed = False
+    if resume and checkpoint_dir:
+        saved = load_checkpoint(checkpoint_dir, agent)
+        if saved is None:
+            LOG.warning("No checkpoint in %s; starting a fresh run.", checkpoint_dir)
+        else:
+            changed = sorted(k for k, v in config.items() if saved["config"].get(k) != v)
+            if changed:
+                LOG.warning("Resuming with settings that differ from the checkpoint: %s", ", ".join(changed))
+            best_val_loss, best_state = saved["best_val_loss"], saved["best_state"]
+            wait, updates, stopped, start_epoch = saved["wait"], saved["updates"], saved["stopped"], saved["epoch"]
+            resumed = True
+            if stopped:
+                LOG.info("Checkpointed run had already stopped early at epoch %d.", start_epoch)
 
-    for ep in range(epochs):
+    actual_map = {r["Matchup"]: float(r["Actual_Spread"]) for _, r in df_actuals.iterrows()}
+    ledger = LedgerWriter(ledger_path, LEDGER_ONLINE_COLUMNS if online else LEDGER_BATCH_COLUMNS,
+                          chunk_rows=ledger_chunk_rows, resume_epoch=start_epoch if resumed else None,
+                          resume_bytes=saved.get("ledger_bytes") if resumed else None)
+    # online epochs without per-update validation run in the array kernel
+    kernel = resolve_online_kernel(online_kernel) if online and not (val_every and df_val_actuals is not None) else "off"
+    first_order = None
+    if not resumed:
+        # peek at the first epoch's shuffle without consuming it: new teams are registered in the
+        # order that epoch meets them, so saved frames append them as the per-row loop did
+        rng_state = np.random.get_state()
+        first_order = epoch_order(len(df_master))
+        np.random.set_state(rng_state)
+    # batch and kernel modes run on team-index arrays compiled once
+    games = index_games(agent, df_master, df_actuals, order=first_order) if (not online or kernel != "off") else None
+    if games is None and first_order is not None and df_val_actuals is not None:
+        # the per-row loop registers as it goes; training teams still go ahead of validation-only ones
+        index_games(agent, df_master, df_actuals, order=first_order)
+
+    tracker = ValidationTracker(agent, df_master, df_val_actuals) if df_val_actuals is not None else None
+    track_updates = bool(online and val_every and tracker is not None and len(tracker))
+
+    recorder = None
+    if trajectory_dir:
+        # room for every team the run can register: current slots plus teams only in the master
+        master_teams = set(df_master["Team_A_Key"].tolist()) | set(df_master["Team_B_Key"].tolist())
+        n_teams = len(agent.params) + len(master_teams - set(agent.params.slots))
+        recorder = TrajectoryRecorder(trajectory_dir, epochs + 1, n_teams, keep_rows=start_epoch + 1 if resumed else None)
+        if not resumed:
+            recorder.record(0, agent.params, agent.coach_weight, agent.entropy_multiplier)
+
+    def checkpoint(epoch_done: int) -> None:
+        if checkpoint_dir:
+            save_checkpoint(checkpoint_dir, agent,
+                            {"epoch": epoch_done, "updates": updates, "wait": wait, "best_val_loss": float(best_val_loss),
+                             "stopped": stopped, "config": config, "ledger_bytes": ledger.tell()},
+                            best_state)
+
+    def check_early_stop(val_loss: float, where: str, unit: str) -> bool:
+        """Early stopping logic; returns True when patience is exhausted."""
+        nonlocal best_val_loss, best_state, wait
+        if val_loss + min_delta < best_val_loss:
+            # improvement
+            best_val_loss = val_loss
+            best_state = {
+                "params": agent.params.copy(),
+                "coach_weight": agent.coach_weight,
+                "entropy_multiplier": agent.entropy_multiplier,
+                "epoch": ep + 1,
+                "update": updates,
+                "timestamp": datetime.utcnow().isoformat()
+            }
+            wait = 0
+            LOG.info("Validation improved (%.6f). Saved best state (%s).", val_loss, where)
+            return False
+        wait += 1
+        LOG.info("No significant improvement (wait=%d/%d).", wait, patience)
+        if wait >= patience:
+            LOG.info("Early stopping triggered at %s (no improvement for %d %s).", where, patience, unit)
+            return True
+        return False
+
+    ep = start_epoch - 1
+    for ep in range(start_epoch, epochs if not stopped else start_epoch):
         LOG.info("Epoch %d/%d start", ep + 1, epochs)
+        ledger.start_epoch(ep + 1)
         # shuffle for SGD
-        master_shuffled = df_master.sample(frac=1.0, random_state=np.random.randint(0, 2**31)).reset_index(drop=True)
-
-        # For batch accumulation
-        accum_coach_grads: Dict[str, float] = {}
-        accum_entropy_grads: Dict[str, float] = {}
-        accum_global_grad_coach_weight = 0.0
-        accum_global_grad_entropy_mult = 0.0
-        accum_count = 0
-
-        for _, r in master_shuffled.iterrows():
-            team_a = r["Team_A_Key"]
-            team_b = r["Team_B_Key"]
-            base = float(r["Delta_W_Final"])
-            matchup = f"{team_a} vs {team_b}"
-
-            if matchup not in actual_map:
-                ledger_rows.append({
-                    "epoch": ep + 1,
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "Matchup": matchup,
-                    "Predicted": None,
-                    "Actual": None,
-                    "Error": None,
-                    "UpdateMode": "no_actual"
-                })
-                continue
-
-            actual = actual_map[matchup]
-            pred, coaching_adj, entropy_adj = agent.predict_single(team_a, team_b, base)
+        order = epoch_order(len(df_master))
+
+        if not online:
+            # full-batch step over every matched game at once, or shuffled mini-batches
+            matched = games.matched[order]
+            rows = order[matched]
+            step = batch_size if batch_size and batch_size > 0 else max(len(rows), 1)
+            pred = np.empty(len(rows), dtype=np.float64)
+            for lo in range(0, len(rows), step):
+                chunk = rows[lo:lo + step]
+                pred[lo:lo + step] = agent.apply_batch_gradients(games.ia[chunk], games.ib[chunk], games.base[chunk], games.actual[chunk],
+                                                                 lr_coach=lr_coach, lr_entropy=lr_entropy,
+                                                                 lr_global=lr_global, update_global=update_global,
+                                                                 regularization=regularization)
+            predicted = np.full(len(order), np.nan)
+            predicted[matched] = pred
+            actual = np.where(matched, games.actual[order], np.nan)
+            ledger.add_columns(Matchup=games.matchup[order],
+                               Predicted=predicted,
+                               Actual=actual,
+                               Error=np.abs(predicted - actual),
+                               UpdateMode=np.where(matched, "minibatch" if step < len(rows) else "batch_pending", "no_actual"))
+            LOG.debug("Batch updates applied over %d matched games (batch size %d)", len(rows), step)
+        elif kernel != "off":
+            matched = games.matched[order]
+            rows = order[matched]
+            diag = run_online_epoch(agent, games.ia[rows], games.ib[rows], games.base[rows], games.actual[rows],
+                                    lr_coach=lr_coach, lr_entropy=lr_entropy,
+                                    lr_global=lr_global, update_global=update_global,
+                                    regularization=regularization, kernel=kernel)
+            columns = {}
+            for j, name in enumerate(KERNEL_DIAG):
+                columns[name] = np.full(len(order), np.nan)
+                columns[name][matched] = diag[:, j]
+            ledger.add_columns(Matchup=games.matchup[order], UpdateMode=np.where(matched, None, "no_actual"), **columns)
+        else:
+            master_shuffled = df_master.take(order).reset_index(drop=True)
+            for _, r in master_shuffled.iterrows():
+                team_a = r["Team_A_Key"]
+                team_b = r["Team_B_Key"]
+                base = float(r["Delta_W_Final"])
+                matchup = f"{team_a} vs {team_b}"
+
+                if matchup not in actual_map:
+                    ledger.add_row((matchup, np.nan, np.nan, np.nan, "no_actual") + (np.nan,) * 8)
+                    continue
+
+                actual = actual_map[matchup]
+                pred, coaching_adj, entropy_adj = agent.predict_single(team_a, team_b, base)
 
-            if online:
                 diag = agent.apply_gradients(team_a, team_b, base, pred, actual,
                                              lr_coach=lr_coach, lr_entropy=lr_entropy,
                                              lr_global=lr_global, update_global=update_global,
                                              regularization=regularization)
-                ledger_rows.append({
-                    "epoch": ep + 1,
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "Matchup": matchup,
-                    "Predicted": diag["pred"],
-                    "Actual": diag["actual"],
-                    "Error": diag["error"],
-                    "grad_c_a": diag["grad_c_a"],
-                    "grad_c_b": diag["grad_c_b"],
-                    "grad_ent_a": diag["grad_ent_a"],
-                    "updated_c_a": diag["updated_c_a"],
-                    "updated_c_b": diag["updated_c_b"],
-                    "updated_ent_a": diag["updated_ent_a"],
-                    "coach_weight": agent.coach_weight,
-                    "entropy_multiplier": agent.entropy_multiplier,
-                })
-            else:
-                # accumulate grads for batch update
-                dL_dpred = (pred - actual)
-                agent.coach_df = ensure_team_in_df(agent.coach_df, team_a, "EVA_Scalar", 0.0)
-                agent.coach_df = ensure_team_in_df(agent.coach_df, team_b, "EVA_Scalar", 0.0)
-                agent.stadium_df = ensure_team_in_df(agent.stadium_df, team_a, "Entropy_Alpha", 0.0)
-
-                c_a = get_team_value(agent.coach_df, team_a, "EVA_Scalar", 0.0)
-                c_b = get_team_value(agent.coach_df, team_b, "EVA_Scalar", 0.0)
-                ent_a = get_team_value(agent.stadium_df, team_a, "Entropy_Alpha", 0.0)
-
-                grad_c_a = dL_dpred * agent.coach_weight
-                grad_c_b = dL_dpred * (-agent.coach_weight)
-                grad_ent_a = dL_dpred * agent.entropy_multiplier
-                grad_coach_weight = dL_dpred * (c_a - c_b)
-                grad_entropy_mult = dL_dpred * ent_a
-
-                accum_coach_grads[team_a] = accum_coach_grads.get(team_a, 0.0) + grad_c_a
-                accum_coach_grads[team_b] = accum_coach_grads.get(team_b, 0.0) + grad_c_b
-                accum_entropy_grads[team_a] = accum_entropy_grads.get(team_a, 0.0) + grad_ent_a
-                accum_global_grad_coach_weight += grad_coach_weight
-                accum_global_grad_entropy_mult += grad_entropy_mult
-                accum_count += 1
-
-                ledger_rows.append({
-                    "epoch": ep + 1,
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "Matchup": matchup,
-                    "Predicted": float(pred),
-                    "Actual": float(actual),
-                    "Error": float(abs(pred - actual)),
-                    "UpdateMode": "batch_pending"
-                })
-
-        # If batch, apply accumulated gradients now
-        if not online and accum_count > 0:
-            for team, g in accum_coach_grads.items():
-                old = get_team_value(agent.coach_df, team, "EVA_Scalar", 0.0)
-                new = old - lr_coach * (g / accum_count)
-                # optional regularization
-                if regularization:
-                    new = new * (1.0 - lr_coach * regularization)
-                new = float(np.clip(new, agent.clip_coach[0], agent.clip_coach[1]))
-                set_team_value(agent.coach_df, team, "EVA_Scalar", new)
-                LOG.debug("Batch update coach %s: %f -> %f", team, old, new)
-
-            for team, g in accum_entropy_grads.items():
-                old = get_team_value(agent.stadium_df, team, "Entropy_Alpha", 0.0)
-                new = old - lr_entropy * (g / accum_count)
-                if regularization:
-                    new = new * (1.0 - lr_entropy * regularization)
-                new = float(np.clip(new, agent.clip_entropy[0], agent.clip_entropy[1]))
-                set_team_value(agent.stadium_df, team, "Entropy_Alpha", new)
-                LOG.debug("Batch update entropy %s: %f -> %f", team, old, new)
-
-            if update_global:
-                old_cw = agent.coach_weight
-                old_em = agent.entropy_multiplier
-                agent.coach_weight = float(np.clip(agent.coach_weight - lr_global * (accum_global_grad_coach_weight / max(accum_count, 1)), agent.clip_global[0], agent.clip_global[1]))
-                agent.entropy_multiplier = float(np.clip(agent.entropy_multiplier - lr_global * (accum_global_grad_entropy_mult / max(accum_count, 1)), agent.clip_global[0], agent.clip_global[1]))
-                LOG.debug("Batch update global: coach_weight %f -> %f, entropy_multiplier %f -> %f", old_cw, agent.coach_weight, old_em, agent.entropy_multiplier)
+                ledger.add_row((matchup, diag["pred"], diag["actual"], diag["error"], None,
+                                diag["grad_c_a"], diag["grad_c_b"], diag["grad_ent_a"],
+                                diag["updated_c_a"], diag["updated_c_b"], diag["updated_ent_a"],
+                                agent.coach_weight, agent.entropy_multiplier))
+
+                if track_updates:
+                    updates += 1
+                    if update_global:
+                        tracker.refresh()
+                    else:
+                        tracker.update(agent.game_slots(team_a, team_b))
+                    if updates % val_every == 0:
+                        val_loss = tracker.mse()
+                        LOG.debug("Update %d validation MSE: %.6f", updates, val_loss)
+                        if check_early_stop(val_loss, f"epoch {ep + 1}, update {updates}", "checks"):
+                            stopped = True
+                            break
+
+        if stopped:
+            ledger.flush()
+            checkpoint(ep + 1)
+            break
 
         LOG.info("Epoch %d complete: coach_weight=%.6f entropy_multiplier=%.6f", ep + 1, agent.coach_weight, agent.entropy_multiplier)
+        if recorder is not None:
+            recorder.record(ep + 1, agent.params, agent.coach_weight, agent.entropy_multiplier)
 
         # After epoch: compute validation loss if provided
-        val_loss = None
-        if df_val_actuals is not None:
-            val_loss = compute_validation_loss(agent, df_master, df_val_actuals)
+        if tracker is not None:
+            val_loss = tracker.refresh()
             if val_loss is None:
                 LOG.warning("No overlapping matchups between master and validation actuals; early stopping not possible this epoch.")
             else:
                 LOG.info("Epoch %d validation MSE: %.6f", ep + 1, val_loss)
-
-                # Early stopping logic
-                if val_loss + min_delta < best_val_loss:
-                    # improvement
-                    best_val_loss = val_loss
-                    best_state = {
-                        "coach_df": deepcopy(agent.coach_df),
-                        "stadium_df": deepcopy(agent.stadium_df),
-                        "coach_weight": agent.coach_weight,
-                        "entropy_multiplier": agent.entropy_multiplier,
-                        "epoch": ep + 1,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                    wait = 0
-                    LOG.info("Validation improved (%.6f). Saved best state (epoch %d).", val_loss, ep + 1)
-                else:
-                    wait += 1
-                    LOG.info("No significant improvement (wait=%d/%d).", wait, patience)
-                    if wait >= patience:
-                        LOG.info("Early stopping triggered at epoch %d (no improvement for %d epochs).", ep + 1, patience)
-                        # Optionally restore best state
-                        if restore_best and best_state is not None:
-                            LOG.info("Restoring best state from epoch %d.", best_state["epoch"])
-                            agent.coach_df = deepcopy(best_state["coach_df"])
-                            agent.stadium_df = deepcopy(best_state["stadium_df"])
-                            agent.coach_weight = best_state["coach_weight"]
-                            agent.entropy_multiplier = best_state["entropy_multiplier"]
-                        # Save ledger and return
-                        df_ledger = pd.DataFrame(ledger_rows)
-                        df_ledger.to_csv(ledger_path, index=False)
-                        LOG.info("Saved training ledger to %s (%d rows)", ledger_path, len(df_ledger))
-                        return df_ledger
-
-    # Training finished normally; if restore_best requested and best_state exists, restore
+                if check_early_stop(val_loss, f"epoch {ep + 1}", "checks" if track_updates else "epochs"):
+                    stopped = True
+                    ledger.flush()
+                    checkpoint(ep + 1)
+                    break
+
+        # ledger rows reach disk before the checkpoint that covers them
+        ledger.flush()
+        if (ep + 1) % max(checkpoint_every, 1) == 0 or ep + 1 == epochs:
+            checkpoint(ep + 1)
+
+    # Optionally restore best state (early stop or normal finish)
     if restore_best and best_state is not None:
-        LOG.info("Training finished. Restoring best state from epoch %d.", best_state["epoch"])
-        agent.coach_df = deepcopy(best_state["coach_df"])
-        agent.stadium_df = deepcopy(best_state["stadium_df"])
+        if stopped:
+            LOG.info("Restoring best state from epoch %d.", best_state["epoch"])
+        else:
+            LOG.info("Training finished. Restoring best state from epoch %d.", best_state["epoch"])
+        agent.params = best_state["params"].copy()
         agent.coach_weight = best_state["coach_weight"]
         agent.entropy_multiplier = best_state["entropy_multiplier"]
 
-    df_ledger = pd.DataFrame(ledger_rows)
-    df_ledger.to_csv(ledger_path, index=False)
-    LOG.info("Saved training ledger to %s (%d rows)", ledger_path, len(df_ledger))
+    df_ledger = ledger.close()
+    df_ledger.attrs.update(best_val_loss=(float(best_val_loss) if best_state is not None else None),
+                           best_epoch=(best_state["epoch"] if best_state is not None else None),
+                           epochs_run=ep + 1)
     return df_ledger
 
 
+# ---------- Walk-forward replay ----------
+WALK_FORWARD_COLUMNS: Dict[str, Any] = dict(Date=object, **LEDGER_BATCH_COLUMNS)
+
+
+class ParamHistory:
+    """
+    Per-day parameter snapshots from walk_forward: (days + 1, teams) arrays of EVA_Scalar and
+    Entropy_Alpha plus the global weights, row 0 holding the parameters before the first day.
+    as_of(date) gives the parameters after every game played on or before `date`, i.e. what the
+    agent knew going into the next day.
+    """
+
+    def __init__(self, store: TeamParamStore, dates: np.ndarray, coach: np.ndarray, entropy: np.ndarray,
+                 global_weights: np.ndarray):
+        self.store = store
+        self.dates = np.asarray(dates, dtype="datetime64[D]")
+        self.coach = coach
+        self.entropy = entropy
+        self.global_weights = global_weights
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def _row(self, date) -> int:
+        return int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(date).date(), "D"), side="right"))
+
+    def store_as_of(self, date) -> TeamParamStore:
+        row = self._row(date)
+        store = self.store.copy()
+        n = self.coach.shape[1]
+        store.coach[:n] = self.coach[row]
+        store.entropy[:n] = self.entropy[row]
+        return store
+
+    def as_of(self, date) -> Tuple[pd.DataFrame, pd.DataFrame, float, float]:
+        """(coach_df, stadium_df, coach_weight, entropy_multiplier) as of the end of `date`."""
+        store = self.store_as_of(date)
+        coach_weight, entropy_multiplier = self.global_weights[self._row(date)]
+        return store.coach_frame(), store.stadium_frame(), float(coach_weight), float(entropy_multiplier)
+
+    def save(self, path: str) -> None:
+        arrays, meta = self.store.to_arrays("store.")
+        arrays.update(dates=self.dates.astype(np.int64), coach_history=self.coach, entropy_history=self.entropy,
+                      global_history=self.global_weights, meta=np.array(json.dumps(meta)))
+        _atomic_savez(path, arrays)
+        LOG.info("Saved parameter history to %s (%d days, %d teams)", path, len(self), self.coach.shape[1])
+
+    @classmethod
+    def load(cls, path: str, coach_df: pd.DataFrame, stadium_df: pd.DataFrame) -> "ParamHistory":
+        """Load a saved history; coach_df / stadium_df are the CSVs the walk-forward run started from."""
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files}
+        meta = json.loads(str(arrays["meta"]))
+        store = TeamParamStore.from_arrays(arrays, meta, TeamParamStore.from_frames(coach_df, stadium_df), "store.")
+        return cls(store, arrays["dates"].astype("datetime64[D]"), arrays["coach_history"],
+                   arrays["entropy_history"], arrays["global_history"])
+
+
+def walk_forward(agent: GradArchonAgent,
+                 df_master: pd.DataFrame,
+                 df_actuals: pd.DataFrame,
+                 lr_coach: float = 0.01,
+                 lr_entropy: float = 0.01,
+                 lr_global: float = 0.001,
+                 update_global: bool = False,
+                 online: bool = False,
+                 regularization: Optional[float] = None,
+                 ledger_path: Optional[str] = "archon_walk_forward_ledger.csv",
+                 ledger_chunk_rows: int = 65536) -> Tuple[pd.DataFrame, ParamHistory]:
+    """
+    Single time-ordered pass over the master (sorted by Date): each day's games are predicted with
+    the parameters as of the previous day, then that day's results are learned from, either as one
+    batch step (with the agent's optimizer) or, with `online`, game by game. Parameters are
+    snapshotted after every day into a ParamHistory. Nothing from a later date influences an
+    earlier prediction, so the ledger is an honest backtest.
+    """
+    if "Date" not in df_master.columns:
+        raise ValueError("Walk-forward mode needs a Date column in the master CSV")
+    day = pd.to_datetime(df_master["Date"], errors="coerce").dt.normalize().to_numpy()
+    valid = ~pd.isna(day)
+    if not valid.all():
+        LOG.warning("Skipping %d master rows with a missing or unparseable Date", int((~valid).sum()))
+    rows = np.flatnonzero(valid)
+    rows = rows[np.argsort(day[rows], kind="stable")]
+    day_starts = np.flatnonzero(np.r_[True, day[rows][1:] != day[rows][:-1]]) if len(rows) else np.empty(0, dtype=np.int64)
+    day_bounds = np.r_[day_starts, len(rows)]
+
+    games = index_games(agent, df_master, df_actuals)
+    n_teams = len(agent.params)
+    n_days = len(day_starts)
+    coach_hist = np.empty((n_days + 1, n_teams), dtype=np.float64)
+    entropy_hist = np.empty((n_days + 1, n_teams), dtype=np.float64)
+    global_hist = np.empty((n_days + 1, 2), dtype=np.float64)
+
+    def snapshot(i: int) -> None:
+        coach_hist[i] = agent.params.coach[:n_teams]
+        entropy_hist[i] = agent.params.entropy[:n_teams]
+        global_hist[i] = (agent.coach_weight, agent.entropy_multiplier)
+
+    ledger = LedgerWriter(ledger_path, WALK_FORWARD_COLUMNS, chunk_rows=ledger_chunk_rows)
+    ledger.start_epoch(1)
+    snapshot(0)
+    sse = sae = 0.0
+    n_scored = 0
+    for d in range(n_days):
+        day_rows = rows[day_bounds[d]:day_bounds[d + 1]]
+        matched = games.matched[day_rows]
+        r = day_rows[matched]
+        predicted = np.full(len(day_rows), np.nan)
+        predicted[matched], _, _ = agent.predict_arrays(games.ia[r], games.ib[r], games.base[r])
+        actual = np.where(matched, games.actual[day_rows], np.nan)
+        if online:
+            run_online_epoch(agent, games.ia[r], games.ib[r], games.base[r], games.actual[r],
+                             lr_coach=lr_coach, lr_entropy=lr_entropy,
+                             lr_global=lr_global, update_global=update_global,
+                             regularization=regularization)
+        else:
+            agent.apply_batch_gradients(games.ia[r], games.ib[r], games.base[r], games.actual[r],
+                                        lr_coach=lr_coach, lr_entropy=lr_entropy,
+                                        lr_global=lr_global, update_global=update_global,
+                                        regularization=regularization)
+        snapshot(d + 1)
+        err = predicted[matched] - actual[matched]
+        sse += float(np.sum(err ** 2))
+        sae += float(np.sum(np.abs(err)))
+        n_scored += len(err)
+        ledger.add_columns(Date=np.full(len(day_rows), str(day[day_rows[0]])[:10], dtype=object),
+                           Matchup=games.matchup[day_rows],
+                           Predicted=predicted,
+                           Actual=actual,
+                           Error=np.abs(predicted - actual),
+                           UpdateMode=np.where(matched, "walk_forward", "no_actual"))
+
+    if n_scored:
+        LOG.info("Walk-forward over %d days: %d games scored, MSE=%.6f MAE=%.6f", n_days, n_scored, sse / n_scored, sae / n_scored)
+    history = ParamHistory(agent.params.copy(), day[rows][day_starts] if n_days else np.empty(0, dtype="datetime64[D]"),
+                           coach_hist, entropy_hist, global_hist)
+    df_ledger = ledger.close()
+    df_ledger.attrs.update(days=n_days, games_scored=n_scored,
+                           mse=(sse / n_scored if n_scored else None), mae=(sae / n_scored if n_scored else None))
+    return df_ledger, history
+
+
+# ---------- Closed-form ridge solver ----------
+def _design_entries(agent: GradArchonAgent, ia: np.ndarray, ib: np.ndarray,
+                    coach_cols: np.ndarray, entropy_cols: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sparse design matrix in coordinate form: each game has three (column, value) entries,
+    coach_weight at c_a, -coach_weight at c_b and entropy_multiplier at ent_a.
+    Returns (cols, vals), both shaped (n_games, 3).
+    """
+    n_coach = len(coach_cols)
+    cols = np.stack([np.searchsorted(coach_cols, ia),
+                     np.searchsorted(coach_cols, ib),
+                     n_coach + np.searchsorted(entropy_cols, ia)], axis=1)
+    vals = np.empty(cols.shape, dtype=np.float64)
+    vals[:, 0] = agent.coach_weight
+    vals[:, 1] = -agent.coach_weight
+    vals[:, 2] = agent.entropy_multiplier
+    return cols, vals
+
+
+def _normal_equations(cols: np.ndarray, vals: np.ndarray, target: np.ndarray, n_params: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Scatter-add X^T X / n and X^T y / n from the coordinate-form design matrix."""
+    n = len(target)
+    pair = (cols[:, :, None] * n_params + cols[:, None, :]).ravel()
+    gram = np.bincount(pair, weights=(vals[:, :, None] * vals[:, None, :]).ravel(), minlength=n_params * n_params)
+    rhs = np.bincount(cols.ravel(), weights=(vals * target[:, None]).ravel(), minlength=n_params)
+    return gram.reshape(n_params, n_params) / n, rhs / n
+
+
+def _ridge_path(gram: np.ndarray, rhs: np.ndarray, lambdas: List[float]) -> List[np.ndarray]:
+    """
+    Solve (G + lam*I) theta = b for every lam from a single eigendecomposition of G.
+    Directions with (near) zero curvature get a zero coefficient (min-norm solution when lam=0).
+    """
+    eigvals, eigvecs = np.linalg.eigh(gram)
+    proj = eigvecs.T @ rhs
+    tol = max(eigvals.max(initial=0.0), 1.0) * len(rhs) * np.finfo(np.float64).eps
+    path = []
+    for lam in lambdas:
+        denom = eigvals + lam
+        coef = np.divide(proj, denom, out=np.zeros_like(proj), where=np.abs(denom) > tol)
+        path.append(eigvecs @ coef)
+    return path
+
+
+def solve_ridge(agent: GradArchonAgent,
+                df_master: pd.DataFrame,
+                df_actuals: pd.DataFrame,
+                df_val_actuals: Optional[pd.DataFrame] = None,
+                regularization: float = 0.0,
+                path: Optional[List[float]] = None,
+                alternate: int = 0) -> pd.DataFrame:
+    """
+    Closed-form fit of the per-team parameters for fixed global weights.
+
+    With coach_weight and entropy_multiplier fixed, pred = base + cw*(c_a - c_b) + em*ent_a is linear
+    in the team parameters, so the ridge problem
+        min_theta  mean((X theta - (actual - base))^2) + regularization * ||theta||^2
+    is solved directly from the normal equations. Only teams appearing in matched games are fitted;
+    all other parameters are left untouched. With alternate > 0 the global weights are re-fitted by
+    least squares between solves (clipped to agent.clip_global). When a path of regularization values
+    is given, every value is solved from one factorization; the one with the lowest validation MSE
+    (training MSE without validation) is applied. Results are clipped to the agent's bounds.
+
+    Returns a DataFrame with one row per regularization value (train_mse, val_mse, applied).
+    """
+    games = index_games(agent, df_master, df_actuals)
+    rows = np.flatnonzero(games.matched)
+    if len(rows) == 0:
+        raise ValueError("No matchups in the master have training actuals; nothing to solve.")
+    ia, ib = games.ia[rows], games.ib[rows]
+    base, actual = games.base[rows], games.actual[rows]
+    target = actual - base
+    coach_cols = np.unique(np.concatenate([ia, ib]))
+    entropy_cols = np.unique(ia)
+    n_coach = len(coach_cols)
+    n_params = n_coach + len(entropy_cols)
+
+    val_games = index_games(agent, df_master, df_val_actuals) if df_val_actuals is not None else None
+    val_rows = np.flatnonzero(val_games.matched) if val_games is not None else np.empty(0, dtype=np.int64)
+
+    def assign(theta: np.ndarray) -> None:
+        agent.params.coach[coach_cols] = theta[:n_coach]
+        agent.params.entropy[entropy_cols] = theta[n_coach:]
+
+    def mse(g: GameArrays, r: np.ndarray) -> float:
+        pred, _, _ = agent.predict_arrays(g.ia[r], g.ib[r], g.base[r])
+        return float(np.mean((pred - g.actual[r]) ** 2)) if len(r) else float("nan")
+
+    for it in range(max(int(alternate), 0)):
+        cols, vals = _design_entries(agent, ia, ib, coach_cols, entropy_cols)
+        gram, rhs = _normal_equations(cols, vals, target, n_params)
+        assign(_ridge_path(gram, rhs, [regularization])[0])
+        # least-squares refit of (coach_weight, entropy_multiplier) for the fitted team parameters
+        feats = np.stack([agent.params.coach[ia] - agent.params.coach[ib], agent.params.entropy[ia]], axis=1)
+        weights = np.linalg.lstsq(feats, target, rcond=None)[0]
+        agent.coach_weight = _clip(float(weights[0]), agent.clip_global)
+        agent.entropy_multiplier = _clip(float(weights[1]), agent.clip_global)
+        LOG.info("Alternation %d: coach_weight=%.6f entropy_multiplier=%.6f train MSE=%.6f",
+                 it + 1, agent.coach_weight, agent.entropy_multiplier, mse(games, rows))
+
+    lambdas = list(path) if path else [regularization]
+    cols, vals = _design_entries(agent, ia, ib, coach_cols, entropy_cols)
+    gram, rhs = _normal_equations(cols, vals, target, n_params)
+    thetas = _ridge_path(gram, rhs, lambdas)
+
+    start = agent.params.copy()
+    records = []
+    for lam, theta in zip(lambdas, thetas):
+        agent.params = start.copy()
+        assign(theta)
+        records.append({"regularization": lam, "train_mse": mse(games, rows),
+                        "val_mse": mse(val_games, val_rows) if len(val_rows) else float("nan")})
+    df_path = pd.DataFrame(records)
+    key = "val_mse" if len(val_rows) else "train_mse"
+    best = int(df_path[key].idxmin())
+    df_path["applied"] = df_path.index == best
+
+    agent.params = start
+    theta = thetas[best]
+    clipped = np.concatenate([np.clip(theta[:n_coach], *agent.clip_coach), np.clip(theta[n_coach:], *agent.clip_entropy)])
+    if not np.array_equal(clipped, theta):
+        LOG.warning("Ridge solution exceeds parameter clip bounds for %d parameters; clipping.", int(np.sum(clipped != theta)))
+    assign(clipped)
+    LOG.info("Applied ridge solution (regularization=%g): %d games, %d parameters, train MSE=%.6f",
+             lambdas[best], len(rows), n_params, mse(games, rows))
+    return df_path
+
+
+# ---------- Parallel hyperparameter sweep ----------
+# searchable training_loop_grad_es settings and how to parse them
+def _parse_bool(value: Any) -> bool:
+    """A real boolean, or the string "true" / "false" (any case); anything else is rejected."""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    raise ValueError(f"Expected a boolean (true / false), got {value!r}")
+
+
+SWEEP_PARAMS = {
+    "lr_coach": float,
+    "lr_entropy": float,
+    "lr_global": float,
+    "regularization": float,
+    "patience": int,
+    "min_delta": float,
+    "update_global": _parse_bool,
+    "online": _parse_bool,
+    "batch_size": int,
+    "optimizer": str,
+}
+
+
+def expand_sweep_spec(spec: Dict[str, Any], seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Expand a sweep spec into a list of trial settings.
+
+    Grid:   {"search": "grid", "params": {"lr_coach": [0.01, 0.05], "update_global": [true, false]}}
+    Random: {"search": "random", "trials": 32,
+             "params": {"lr_coach": {"low": 1e-3, "high": 1e-1, "log": true}, "patience": [3, 5, 8]}}
+    Lists are choices; {"low", "high"[, "log"]} ranges are sampled uniformly (log-uniformly) and
+    are only accepted for numeric parameters. Booleans must be true / false.
+    """
+    params = spec.get("params", {})
+    unknown = set(params) - set(SWEEP_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters {sorted(unknown)}; expected a subset of {sorted(SWEEP_PARAMS)}")
+    for name, dist in params.items():
+        if isinstance(dist, dict) and SWEEP_PARAMS[name] not in (float, int):
+            raise ValueError(f"{name} takes a list of choices, not a range")
+    search = spec.get("search", "grid")
+    if search == "grid":
+        for name, values in params.items():
+            if not isinstance(values, list):
+                raise ValueError(f"Grid search needs a list of values for {name}")
+        names = list(params)
+        return [{n: SWEEP_PARAMS[n](v) for n, v in zip(names, combo)} for combo in itertools.product(*(params[n] for n in names))]
+    if search != "random":
+        raise ValueError(f"Unknown search type {search!r}; expected 'grid' or 'random'")
+
+    rng = np.random.default_rng(seed)
+    trials = []
+    for _ in range(int(spec.get("trials", 16))):
+        trial = {}
+        for name, dist in params.items():
+            if isinstance(dist, list):
+                value = dist[int(rng.integers(len(dist)))]
+            elif dist.get("log"):
+                value = float(np.exp(rng.uniform(np.log(dist["low"]), np.log(dist["high"]))))
+            else:
+                value = float(rng.uniform(dist["low"], dist["high"]))
+            trial[name] = SWEEP_PARAMS[name](value)
+        trials.append(trial)
+    return trials
+
+
+class SharedGameData:
+    """
+    Master + actuals + validation actuals packed into one shared-memory block so worker processes
+    can read them without re-parsing CSVs. Layout: team codes (a, b), base spread, and the
+    training / validation actual for each master row (NaN where there is none).
+    """
+
+    FIELDS = ("code_a", "code_b", "base", "actual", "val_actual")
+
+    def __init__(self, shm: shared_memory.SharedMemory, n_rows: int, teams: List[Any], owner: bool):
+        self.shm = shm
+        self.n_rows = n_rows
+        self.teams = teams
+        self.owner = owner
+        block = np.ndarray((len(self.FIELDS), n_rows), dtype=np.float64, buffer=shm.buf)
+        block.flags.writeable = owner
+        self.arrays = dict(zip(self.FIELDS, block))
+
+    @classmethod
+    def create(cls, df_master: pd.DataFrame, df_actuals: pd.DataFrame, df_val_actuals: Optional[pd.DataFrame]) -> "SharedGameData":
+        codes, teams = pd.factorize(pd.concat([df_master["Team_A_Key"], df_master["Team_B_Key"]], ignore_index=True))
+        n = len(df_master)
+        matchup = (df_master["Team_A_Key"].astype(str) + " vs " + df_master["Team_B_Key"].astype(str)).to_numpy()
+        shm = shared_memory.SharedMemory(create=True, size=max(len(cls.FIELDS) * n * 8, 1))
+        data = cls(shm, n, list(teams), owner=True)
+        data.arrays["code_a"][:] = codes[:n]
+        data.arrays["code_b"][:] = codes[n:]
+        data.arrays["base"][:] = df_master["Delta_W_Final"].astype(float).to_numpy()
+        data.arrays["actual"][:] = actuals_lookup(df_actuals).reindex(matchup).to_numpy(dtype=np.float64)
+        data.arrays["val_actual"][:] = (actuals_lookup(df_val_actuals).reindex(matchup).to_numpy(dtype=np.float64)
+                                        if df_val_actuals is not None else np.nan)
+        return data
+
+    def handle(self) -> Tuple[str, int, List[Any]]:
+        """Picklable description for attach() in a worker."""
+        return self.shm.name, self.n_rows, self.teams
+
+    @classmethod
+    def attach(cls, name: str, n_rows: int, teams: List[Any]) -> "SharedGameData":
+        return cls(shared_memory.SharedMemory(name=name), n_rows, teams, owner=False)
+
+    def frames(self) -> Tuple[pd.DataFrame, pd.DataFrame, Optional[pd.DataFrame]]:
+        """(df_master, df_actuals, df_val_actuals) views rebuilt from the shared arrays."""
+        teams = np.asarray(self.teams, dtype=object)
+        team_a = teams[self.arrays["code_a"].astype(np.int64)]
+        team_b = teams[self.arrays["code_b"].astype(np.int64)]
+        df_master = pd.DataFrame({"Team_A_Key": team_a, "Team_B_Key": team_b, "Delta_W_Final": self.arrays["base"]})
+        matchup = pd.Series(team_a).astype(str) + " vs " + pd.Series(team_b).astype(str)
+
+        def actuals(values: np.ndarray) -> pd.DataFrame:
+            has = ~np.isnan(values)
+            return pd.DataFrame({"Matchup": matchup[has].to_numpy(), "Actual_Spread": values[has]})
+
+        val = self.arrays["val_actual"]
+        return df_master, actuals(self.arrays["actual"]), (actuals(val) if np.any(~np.isnan(val)) else None)
+
+    def close(self) -> None:
+        self.arrays = {}
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+_SWEEP_CONTEXT: Dict[str, Any] = {}
+
+
+def _sweep_worker_init(handle: Tuple[str, int, List[Any]], df_coach: pd.DataFrame, df_stadium: pd.DataFrame,
+                       defaults: Dict[str, Any]) -> None:
+    LOG.setLevel(logging.WARNING)
+    data = SharedGameData.attach(*handle)
+    _SWEEP_CONTEXT.update(data=data, frames=data.frames(), coach=df_coach, stadium=df_stadium, defaults=defaults)
+
+
+def _run_sweep_trial(trial_id: int, settings: Dict[str, Any], seed: int) -> Dict[str, Any]:
+    ctx = _SWEEP_CONTEXT
+    df_master, df_actuals, df_val_actuals = ctx["frames"]
+    kwargs = {**ctx["defaults"], **settings}
+    agent = GradArchonAgent(ctx["coach"], ctx["stadium"], optimizer=kwargs.pop("optimizer", "sgd"))
+    # each trial gets its own RNG stream (training_loop_grad_es shuffles with the global RNG)
+    np.random.seed(seed)
+    start = time.perf_counter()
+    # only the summary attrs are needed: keep no ledger rows
+    df_ledger = training_loop_grad_es(agent, df_master, df_actuals, df_val_actuals=df_val_actuals,
+                                      ledger_path=False, **kwargs)
+    return {"trial": trial_id, **settings, "seed": seed,
+            "best_val_mse": df_ledger.attrs["best_val_loss"],
+            "best_epoch": df_ledger.attrs["best_epoch"],
+            "epochs_run": df_ledger.attrs["epochs_run"],
+            "wall_time_s": round(time.perf_counter() - start, 4)}
+
+
+def run_sweep(df_master: pd.DataFrame,
+              df_coach: pd.DataFrame,
+              df_stadium: pd.DataFrame,
+              df_actuals: pd.DataFrame,
+              df_val_actuals: pd.DataFrame,
+              trials: List[Dict[str, Any]],
+              defaults: Dict[str, Any],
+              workers: Optional[int] = None,
+              seed: int = 0) -> pd.DataFrame:
+    """
+    Run training trials over a process pool. Master, actuals and validation actuals are shared
+    read-only through shared memory; each trial is seeded from its own SeedSequence child.
+    Returns one summary row per trial, sorted by best validation MSE.
+    """
+    seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(len(trials))]
+    data = SharedGameData.create(df_master, df_actuals, df_val_actuals)
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_sweep_worker_init,
+                                 initargs=(data.handle(), df_coach, df_stadium, defaults)) as pool:
+            futures = [pool.submit(_run_sweep_trial, i, t, sd) for i, (t, sd) in enumerate(zip(trials, seeds))]
+            results = []
+            for fut in futures:
+                results.append(fut.result())
+                LOG.info("Trial %d done: best val MSE=%s (epoch %s) in %.2fs", results[-1]["trial"],
+                         results[-1]["best_val_mse"], results[-1]["best_epoch"], results[-1]["wall_time_s"])
+    finally:
+        data.close()
+    return pd.DataFrame(results).sort_values("best_val_mse", na_position="last").reset_index(drop=True)
+
+
+# ---------- Cross-validation ----------
+CV_SCHEMES = ("kfold", "rolling")
+
+
+def make_cv_folds(df_master: pd.DataFrame, df_actuals: pd.DataFrame, folds: int = 5, scheme: str = "kfold",
+                  seed: int = 0) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Folds over the distinct matchups of df_actuals that appear in the master, as (train, val)
+    boolean masks over the df_actuals rows; repeated matchups always land in the same fold.
+    kfold: matchups are shuffled with `seed` and dealt into `folds` groups, each validated once.
+    rolling: matchups are ordered by first appearance (by Date when the master has one) and cut
+    into folds + 1 contiguous blocks; fold i trains on blocks 0..i and validates on block i + 1.
+    Rolling folds are only strictly temporal when every matchup is played once: actuals hold one
+    result per matchup, so a matchup replayed after a validation block still trains on that result
+    (and on its later games). Such repeated matchups are counted in a warning.
+    """
+    if scheme not in CV_SCHEMES:
+        raise ValueError(f"Unknown CV scheme {scheme!r}; expected one of {CV_SCHEMES}")
+    n_blocks = folds if scheme == "kfold" else folds + 1
+    if folds < (2 if scheme == "kfold" else 1):
+        raise ValueError(f"{scheme} cross-validation needs at least {2 if scheme == 'kfold' else 1} folds")
+    matchup = df_master["Team_A_Key"].astype(str) + " vs " + df_master["Team_B_Key"].astype(str)
+    first = pd.DataFrame({"Matchup": matchup.to_numpy(), "row": np.arange(len(df_master))})
+    if "Date" in df_master.columns:
+        first["Date"] = pd.to_datetime(df_master["Date"], errors="coerce").to_numpy()
+    first = first.sort_values(["Date", "row"] if "Date" in first else ["row"], kind="stable").drop_duplicates("Matchup")
+    keys = first["Matchup"][first["Matchup"].isin(df_actuals["Matchup"])].to_numpy()
+    if len(keys) < n_blocks:
+        raise ValueError(f"Only {len(keys)} matchups with actuals in the master; need at least {n_blocks} for {folds} {scheme} folds")
+    if scheme == "rolling":
+        games_per_key = matchup[matchup.isin(keys)].value_counts()
+        repeated = int((games_per_key > 1).sum())
+        if repeated:
+            LOG.warning("%d of %d matchups are played more than once (%d games); their single actual is "
+                        "trained on in the block of the first game, so rolling folds are not strictly temporal.",
+                        repeated, len(keys), int(games_per_key[games_per_key > 1].sum()))
+    block = np.empty(len(keys), dtype=np.int64)
+    if scheme == "kfold":
+        block[np.random.default_rng(seed).permutation(len(keys))] = np.arange(len(keys)) % folds
+    else:
+        block[:] = np.arange(len(keys)) * n_blocks // len(keys)
+    row_block = pd.Series(block, index=keys).reindex(df_actuals["Matchup"].to_numpy()).to_numpy()
+    out = []
+    for i in range(folds):
+        if scheme == "kfold":
+            out.append(((row_block != i) & ~np.isnan(row_block), row_block == i))
+        else:
+            out.append((row_block <= i, row_block == i + 1))
+    return out
+
+
+def evaluate_agent(agent: GradArchonAgent, df_master: pd.DataFrame, df_actuals: pd.DataFrame) -> Tuple[int, Optional[float], Optional[float]]:
+    """(games, MSE, MAE) of the agent's predictions on the master games that have actuals."""
+    games = index_games(agent, df_master, df_actuals)
+    rows = np.flatnonzero(games.matched)
+    if len(rows) == 0:
+        return 0, None, None
+    pred, _, _ = agent.predict_arrays(games.ia[rows], games.ib[rows], games.base[rows])
+    err = pred - games.actual[rows]
+    return len(rows), float(np.mean(err ** 2)), float(np.mean(np.abs(err)))
+
+
+def _run_cv_fold(fold: int, train_mask: np.ndarray, val_mask: np.ndarray, seed: int) -> Dict[str, Any]:
+    ctx = _SWEEP_CONTEXT
+    df_master, df_actuals, _ = ctx["frames"]
+    kwargs = dict(ctx["defaults"])
+    agent = GradArchonAgent(ctx["coach"], ctx["stadium"], optimizer=kwargs.pop("optimizer", "sgd"))
+    np.random.seed(seed)
+    start = time.perf_counter()
+    df_train, df_val = df_actuals[train_mask], df_actuals[val_mask]
+    training_loop_grad_es(agent, df_master, df_train, ledger_path=False, **kwargs)
+    train_time = time.perf_counter() - start
+    n_train, train_mse, train_mae = evaluate_agent(agent, df_master, df_train)
+    n_val, val_mse, val_mae = evaluate_agent(agent, df_master, df_val)
+    return {"fold": fold, "n_train": n_train, "n_val": n_val,
+            "train_mse": train_mse, "train_mae": train_mae, "val_mse": val_mse, "val_mae": val_mae,
+            "train_time_s": round(train_time, 4), "wall_time_s": round(time.perf_counter() - start, 4)}
+
+
+def run_cv(df_master: pd.DataFrame,
+           df_coach: pd.DataFrame,
+           df_stadium: pd.DataFrame,
+           df_actuals: pd.DataFrame,
+           folds: int = 5,
+           scheme: str = "kfold",
+           settings: Optional[Dict[str, Any]] = None,
+           workers: Optional[int] = None,
+           seed: int = 0) -> pd.DataFrame:
+    """
+    Train one agent per fold over a process pool and score it on the held-out matchups. Folds
+    train for a fixed number of epochs without early stopping, so the held-out error is not used
+    for model selection. The master is shared through SharedGameData, as in run_sweep.
+    Returns one row per fold; the aggregate (mean / std / pooled) is in df.attrs.
+    """
+    data = SharedGameData.create(df_master, df_actuals, None)
+    try:
+        # the workers rebuild the same actuals rows from the shared block; fold masks index them
+        _, df_rows, _ = data.frames()
+        fold_masks = make_cv_folds(df_master, df_rows, folds=folds, scheme=scheme, seed=seed)
+        seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(folds)]
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count(), folds), initializer=_sweep_worker_init,
+                                 initargs=(data.handle(), df_coach, df_stadium, settings or {})) as pool:
+            futures = [pool.submit(_run_cv_fold, i, tr, va, sd) for i, ((tr, va), sd) in enumerate(zip(fold_masks, seeds))]
+            results = []
+            for fut in futures:
+                res = fut.result()
+                results.append(res)
+                LOG.info("Fold %d: %d train / %d val games, val MSE=%s MAE=%s (%.2fs)", res["fold"], res["n_train"],
+                         res["n_val"], res["val_mse"], res["val_mae"], res["wall_time_s"])
+    finally:
+        data.close()
+    df = pd.DataFrame(results)
+    scored = df.dropna(subset=["val_mse"])
+    weights = scored["n_val"].to_numpy(dtype=np.float64)
+    df.attrs.update(scheme=scheme, folds=folds,
+                    val_mse_mean=float(scored["val_mse"].mean()), val_mse_std=float(scored["val_mse"].std()),
+                    val_mae_mean=float(scored["val_mae"].mean()), val_mae_std=float(scored["val_mae"].std()),
+                    val_mse_pooled=float(np.average(scored["val_mse"], weights=weights)) if weights.sum() else None,
+                    val_mae_pooled=float(np.average(scored["val_mae"], weights=weights)) if weights.sum() else None,
+                    wall_time_s=float(df["wall_time_s"].sum()))
+    return df
+
+
+# ---------- Bootstrap ensembles ----------
+class BaggedParams:
+    """
+    Parameters of N bootstrap-trained agents held as (N x teams) matrices. predict_members scores a
+    whole slate for every member with one (games x 2*teams) @ (2*teams x N) product; teams unknown
+    to the ensemble contribute 0.0, as for a single agent.
+    """
+
+    def __init__(self, teams: List[Any], coach: np.ndarray, entropy: np.ndarray,
+                 coach_weight: np.ndarray, entropy_multiplier: np.ndarray):
+        self.teams = list(teams)
+        self.slots = {team: i for i, team in enumerate(self.teams)}
+        self.coach = coach
+        self.entropy = entropy
+        self.coach_weight = coach_weight
+        self.entropy_multiplier = entropy_multiplier
+        # member k's column: coach_weight_k * EVA_Scalar_k stacked over entropy_multiplier_k * Entropy_Alpha_k
+        self.weights = np.vstack([(coach * coach_weight[:, None]).T, (entropy * entropy_multiplier[:, None]).T])
+
+    def __len__(self) -> int:
+        return len(self.coach)
+
+    def design(self, df_master: pd.DataFrame) -> np.ndarray:
+        """(games x 2*teams) matrix: +1 / -1 at the coach columns of team_a / team_b, +1 at team_a's entropy column."""
+        n_teams = len(self.teams)
+        ia = np.array([self.slots.get(t, -1) for t in df_master["Team_A_Key"].tolist()], dtype=np.int64)
+        ib = np.array([self.slots.get(t, -1) for t in df_master["Team_B_Key"].tolist()], dtype=np.int64)
+        x = np.zeros((len(df_master), 2 * n_teams), dtype=np.float64)
+        games = np.arange(len(df_master))
+        has_a, has_b = ia >= 0, ib >= 0
+        np.add.at(x, (games[has_a], ia[has_a]), 1.0)
+        np.add.at(x, (games[has_b], ib[has_b]), -1.0)
+        x[games[has_a], n_teams + ia[has_a]] = 1.0
+        return x
+
+    def predict_members(self, df_master: pd.DataFrame) -> np.ndarray:
+        """(games x N) spreads, one column per ensemble member."""
+        base = df_master["Delta_W_Final"].astype(float).to_numpy()
+        return base[:, None] + self.design(df_master) @ self.weights
+
+    def predict_intervals(self, df_master: pd.DataFrame, quantiles: Tuple[float, ...] = (0.05, 0.5, 0.95)) -> pd.DataFrame:
+        """Per-matchup ensemble mean, std and quantiles of Archon_Spread."""
+        spreads = self.predict_members(df_master)
+        out = pd.DataFrame({
+            "Matchup": (df_master["Team_A_Key"].astype(str) + " vs " + df_master["Team_B_Key"].astype(str)).to_numpy(),
+            "Team_A": df_master["Team_A_Key"].to_numpy(),
+            "Team_B": df_master["Team_B_Key"].to_numpy(),
+            "Base_Model": df_master["Delta_W_Final"].astype(float).round(6).to_numpy(),
+            "Archon_Spread_Mean": np.round(spreads.mean(axis=1), 6),
+            "Archon_Spread_Std": np.round(spreads.std(axis=1), 6),
+        })
+        for q, values in zip(quantiles, np.quantile(spreads, quantiles, axis=1)):
+            out[f"Archon_Spread_Q{q * 100:g}"] = np.round(values, 6)
+        return out
+
+    def save(self, path: str) -> None:
+        _atomic_savez(path, {"coach": self.coach, "entropy": self.entropy, "coach_weight": self.coach_weight,
+                             "entropy_multiplier": self.entropy_multiplier,
+                             "meta": np.array(json.dumps({"teams": self.teams}))})
+        LOG.info("Saved bootstrap ensemble to %s (%d members, %d teams)", path, len(self), len(self.teams))
+
+    @classmethod
+    def load(cls, path: str) -> "BaggedParams":
+        with np.load(path) as data:
+            return cls(json.loads(str(data["meta"]))["teams"], data["coach"], data["entropy"],
+                       data["coach_weight"], data["entropy_multiplier"])
+
+
+def _run_bag_member(member: int, rows: np.ndarray, seed: int) -> Dict[str, Any]:
+    ctx = _SWEEP_CONTEXT
+    df_master, df_actuals, _ = ctx["frames"]
+    kwargs = dict(ctx["defaults"])
+    agent = GradArchonAgent(ctx["coach"], ctx["stadium"], optimizer=kwargs.pop("optimizer", "sgd"))
+    np.random.seed(seed)
+    start = time.perf_counter()
+    # a game drawn k times is a k-times repeated master row
+    training_loop_grad_es(agent, df_master.take(rows).reset_index(drop=True), df_actuals, ledger_path=False, **kwargs)
+    n = len(agent.params)
+    return {"member": member, "teams": agent.params.teams, "coach": agent.params.coach[:n].copy(),
+            "entropy": agent.params.entropy[:n].copy(), "coach_weight": agent.coach_weight,
+            "entropy_multiplier": agent.entropy_multiplier, "wall_time_s": round(time.perf_counter() - start, 4)}
+
+
+def run_bagging(df_master: pd.DataFrame,
+                df_coach: pd.DataFrame,
+                df_stadium: pd.DataFrame,
+                df_actuals: pd.DataFrame,
+                members: int = 20,
+                settings: Optional[Dict[str, Any]] = None,
+                workers: Optional[int] = None,
+                seed: int = 0) -> BaggedParams:
+    """
+    Train `members` agents over a process pool, each on a bootstrap resample (with replacement) of
+    the master games that have actuals, and collect their parameters into a BaggedParams. The
+    master is shared through SharedGameData, as in run_sweep.
+    """
+    reference = GradArchonAgent(df_coach, df_stadium)
+    games = index_games(reference, df_master, df_actuals)
+    matched = np.flatnonzero(games.matched)
+    if len(matched) == 0:
+        raise ValueError("No master games have actuals; nothing to bootstrap")
+    teams = reference.params.teams
+    slots = reference.params.slots
+    coach = np.zeros((members, len(teams)), dtype=np.float64)
+    entropy = np.zeros((members, len(teams)), dtype=np.float64)
+    coach_weight = np.zeros(members, dtype=np.float64)
+    entropy_multiplier = np.zeros(members, dtype=np.float64)
+
+    children = np.random.SeedSequence(seed).spawn(members)
+    samples = [np.sort(np.random.default_rng(child).choice(matched, size=len(matched), replace=True)) for child in children]
+    seeds = [int(child.generate_state(1)[0]) for child in children]
+    data = SharedGameData.create(df_master, df_actuals, None)
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count(), members), initializer=_sweep_worker_init,
+                                 initargs=(data.handle(), df_coach, df_stadium, settings or {})) as pool:
+            futures = [pool.submit(_run_bag_member, k, rows, sd) for k, (rows, sd) in enumerate(zip(samples, seeds))]
+            for fut in futures:
+                res = fut.result()
+                k = res["member"]
+                # member slots follow its own registration order; map them onto the ensemble's teams
+                cols = np.array([slots[t] for t in res["teams"]], dtype=np.int64)
+                coach[k, cols] = res["coach"]
+                entropy[k, cols] = res["entropy"]
+                coach_weight[k] = res["coach_weight"]
+                entropy_multiplier[k] = res["entropy_multiplier"]
+                LOG.info("Bootstrap member %d trained in %.2fs", k, res["wall_time_s"])
+    finally:
+        data.close()
+    return BaggedParams(teams, coach, entropy, coach_weight, entropy_multiplier)
+
+
 # ---------- CLI ----------
+def _add_fold_train_args(p: argparse.ArgumentParser, epochs_help: str) -> None:
+    """Training settings shared by the subcommands that train many agents (cv, bag)."""
+    p.add_argument("--epochs", type=int, default=50, help=epochs_help)
+    p.add_argument("--lr-coach", type=float, default=0.05, help="Learning rate for coach EVA_Scalar updates")
+    p.add_argument("--lr-entropy", type=float, default=0.02, help="Learning rate for entropy alpha updates")
+    p.add_argument("--lr-global", type=float, default=0.001, help="Learning rate for global params (coach_weight, entropy_multiplier)")
+    p.add_argument("--update-global", action="store_true", help="Enable updates for global params")
+    p.add_argument("--online", action="store_true", help="Apply updates online per-match (default: batch if not set)")
+    p.add_argument("--regularization", type=float, default=0.0, help="L2 regularization coefficient (optional)")
+    p.add_argument("--batch-size", type=int, default=0, help="Mini-batch size for non-online training (0 = full batch)")
+    p.add_argument("--optimizer", choices=OPTIMIZERS, default="sgd", help="Optimizer for batch / mini-batch updates")
+
+
+def _fold_train_settings(args: argparse.Namespace) -> Dict[str, Any]:
+    return {"epochs": args.epochs, "lr_coach": args.lr_coach, "lr_entropy": args.lr_entropy,
+            "lr_global": args.lr_global, "update_global": args.update_global, "online": args.online,
+            "regularization": (args.regularization if args.regularization > 0 else None),
+            "batch_size": args.batch_size, "optimizer": args.optimizer}
+
+
 def main(argv=None):
     parser = argparse.ArgumentParser(description="Archon gradient agent CLI with early stopping")
     sub = parser.add_subparsers(dest="cmd", required=True)
@@ -486,12 +2178,106 @@ def main(argv=None):
     p_train.add_argument("--update-global", action="store_true", help="Enable updates for global params")
     p_train.add_argument("--online", action="store_true", help="Apply updates online per-match (default: batch if not set)")
     p_train.add_argument("--regularization", type=float, default=0.0, help="L2 regularization coefficient (optional)")
-    p_train.add_argument("--ledger", default="archon_learning_ledger_grad_es.csv", help="Training ledger CSV output path")
+    p_train.add_argument("--ledger", default="archon_learning_ledger_grad_es.csv", help="Training ledger output (.csv, .csv.gz, or .parquet for compressed columnar parts)")
+    p_train.add_argument("--ledger-chunk-rows", type=int, default=65536, help="Ledger rows buffered in memory between flushes")
     p_train.add_argument("--save-coach", default="archon_coach_iq.csv", help="Path to save updated coach CSV (overwrites)")
     p_train.add_argument("--save-stadium", default="archon_stadium_entropy.csv", help="Path to save updated stadium CSV (overwrites)")
     p_train.add_argument("--patience", type=int, default=5, help="Early stopping patience (epochs)")
     p_train.add_argument("--min-delta", type=float, default=1e-4, help="Minimum validation loss improvement to reset patience")
     p_train.add_argument("--restore-best", action="store_true", help="Restore best parameters found on validation before saving")
+    p_train.add_argument("--val-every", type=int, default=0, help="With --online, check validation / early stopping every N updates (incremental MSE)")
+    p_train.add_argument("--batch-size", type=int, default=0, help="Mini-batch size for non-online training (0 = full batch)")
+    p_train.add_argument("--optimizer", choices=OPTIMIZERS, default="sgd", help="Optimizer for batch / mini-batch updates")
+    p_train.add_argument("--momentum", type=float, default=0.9, help="Momentum (also Adam beta1)")
+    p_train.add_argument("--beta2", type=float, default=0.999, help="Adam second-moment decay")
+    p_train.add_argument("--online-kernel", choices=ONLINE_KERNELS, default="auto", help="Array kernel for --online epochs (auto: numba if installed; off: per-row loop)")
+    p_train.add_argument("--trajectories", help="Directory for memory-mapped per-team parameter trajectories (one row per epoch)")
+    p_train.add_argument("--checkpoint-dir", help="Run directory for atomic on-disk checkpoints")
+    p_train.add_argument("--checkpoint-every", type=int, default=1, help="Checkpoint every N epochs (with --checkpoint-dir)")
+    p_train.add_argument("--resume", action="store_true", help="Continue the run checkpointed in --checkpoint-dir")
+
+    p_wf = sub.add_parser("walk-forward", help="Time-ordered single pass by Date with per-day parameter snapshots (honest backtest)")
+    p_wf.add_argument("--master", required=True, help="Master CSV with a Date column")
+    p_wf.add_argument("--coach", default="archon_coach_iq.csv", help="Coach CSV (Team,EVA_Scalar)")
+    p_wf.add_argument("--stadium", default="archon_stadium_entropy.csv", help="Stadium CSV (Team,Entropy_Alpha)")
+    p_wf.add_argument("--actuals", required=True, help="Actuals CSV (Matchup,Actual_Spread)")
+    p_wf.add_argument("--lr-coach", type=float, default=0.05, help="Learning rate for coach EVA_Scalar updates")
+    p_wf.add_argument("--lr-entropy", type=float, default=0.02, help="Learning rate for entropy alpha updates")
+    p_wf.add_argument("--lr-global", type=float, default=0.001, help="Learning rate for global params (coach_weight, entropy_multiplier)")
+    p_wf.add_argument("--update-global", action="store_true", help="Enable updates for global params")
+    p_wf.add_argument("--online", action="store_true", help="Update game by game within a day (default: one batch step per day)")
+    p_wf.add_argument("--regularization", type=float, default=0.0, help="L2 regularization coefficient (optional)")
+    p_wf.add_argument("--optimizer", choices=OPTIMIZERS, default="sgd", help="Optimizer for the daily batch steps")
+    p_wf.add_argument("--momentum", type=float, default=0.9, help="Momentum (also Adam beta1)")
+    p_wf.add_argument("--beta2", type=float, default=0.999, help="Adam second-moment decay")
+    p_wf.add_argument("--ledger", default="archon_walk_forward_ledger.csv", help="Backtest ledger output (.csv, .csv.gz or .parquet)")
+    p_wf.add_argument("--history", default="archon_param_history.npz", help="Per-day parameter snapshots output")
+    p_wf.add_argument("--save-coach", default="archon_coach_iq.csv", help="Path to save end-of-run coach CSV (overwrites)")
+    p_wf.add_argument("--save-stadium", default="archon_stadium_entropy.csv", help="Path to save end-of-run stadium CSV (overwrites)")
+
+    p_asof = sub.add_parser("as-of", help="Write the coach/stadium parameters a walk-forward run had at the end of a date")
+    p_asof.add_argument("--history", default="archon_param_history.npz", help="Parameter history from walk-forward")
+    p_asof.add_argument("--coach", default="archon_coach_iq.csv", help="Coach CSV the walk-forward run started from")
+    p_asof.add_argument("--stadium", default="archon_stadium_entropy.csv", help="Stadium CSV the walk-forward run started from")
+    p_asof.add_argument("--date", required=True, help="Date (YYYY-MM-DD); parameters after that day's games")
+    p_asof.add_argument("--save-coach", required=True, help="Output coach CSV")
+    p_asof.add_argument("--save-stadium", required=True, help="Output stadium CSV")
+
+    p_solve = sub.add_parser("solve", help="Closed-form ridge fit of per-team parameters (reference optimum for SGD)")
+    p_solve.add_argument("--master", required=True, help="Master CSV")
+    p_solve.add_argument("--coach", default="archon_coach_iq.csv", help="Coach CSV (Team,EVA_Scalar)")
+    p_solve.add_argument("--stadium", default="archon_stadium_entropy.csv", help="Stadium CSV (Team,Entropy_Alpha)")
+    p_solve.add_argument("--actuals", required=True, help="Training actuals CSV (Matchup,Actual_Spread)")
+    p_solve.add_argument("--val", required=False, help="Validation actuals CSV used to pick a value along --path")
+    p_solve.add_argument("--regularization", type=float, default=0.0, help="Ridge (L2) coefficient on the mean squared error")
+    p_solve.add_argument("--path", type=float, nargs="+", help="Solve a whole regularization path (one factorization) and apply the best")
+    p_solve.add_argument("--alternate", type=int, default=0, help="Alternating refits of coach_weight / entropy_multiplier before the final solve")
+    p_solve.add_argument("--path-output", help="Optional CSV for the regularization path summary")
+    p_solve.add_argument("--save-coach", default="archon_coach_iq.csv", help="Path to save solved coach CSV (overwrites)")
+    p_solve.add_argument("--save-stadium", default="archon_stadium_entropy.csv", help="Path to save solved stadium CSV (overwrites)")
+
+    p_sweep = sub.add_parser("sweep", help="Parallel grid / random hyperparameter sweep of train settings")
+    p_sweep.add_argument("--master", required=True, help="Master CSV")
+    p_sweep.add_argument("--coach", default="archon_coach_iq.csv", help="Coach CSV (Team,EVA_Scalar)")
+    p_sweep.add_argument("--stadium", default="archon_stadium_entropy.csv", help="Stadium CSV (Team,Entropy_Alpha)")
+    p_sweep.add_argument("--actuals", required=True, help="Training actuals CSV (Matchup,Actual_Spread)")
+    p_sweep.add_argument("--val", required=True, help="Validation actuals CSV (Matchup,Actual_Spread)")
+    p_sweep.add_argument("--spec", required=True, help="JSON sweep spec (file path or inline JSON); see expand_sweep_spec")
+    p_sweep.add_argument("--epochs", type=int, default=50, help="Epochs per trial")
+    p_sweep.add_argument("--online", action="store_true", help="Default update mode for trials (overridable in the spec)")
+    p_sweep.add_argument("--restore-best", action="store_true", help="Restore best parameters within each trial")
+    p_sweep.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    p_sweep.add_argument("--seed", type=int, default=0, help="Root seed for trial sampling and per-trial RNG streams")
+    p_sweep.add_argument("--output", default="archon_sweep_results.csv", help="Summary table CSV")
+
+    p_cv = sub.add_parser("cv", help="Parallel k-fold / rolling-origin cross-validation of train settings")
+    p_cv.add_argument("--master", required=True, help="Master CSV (a Date column orders rolling-origin folds)")
+    p_cv.add_argument("--coach", default="archon_coach_iq.csv", help="Coach CSV (Team,EVA_Scalar)")
+    p_cv.add_argument("--stadium", default="archon_stadium_entropy.csv", help="Stadium CSV (Team,Entropy_Alpha)")
+    p_cv.add_argument("--actuals", required=True, help="Actuals CSV (Matchup,Actual_Spread) split into folds")
+    p_cv.add_argument("--scheme", choices=CV_SCHEMES, default="kfold", help="k-fold over matchups, or rolling-origin in time order")
+    p_cv.add_argument("--folds", type=int, default=5, help="Number of folds (validation blocks)")
+    _add_fold_train_args(p_cv, "Epochs per fold (no early stopping)")
+    p_cv.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores, at most one per fold)")
+    p_cv.add_argument("--seed", type=int, default=0, help="Seed for k-fold assignment and per-fold RNG streams")
+    p_cv.add_argument("--output", default="archon_cv_results.csv", help="Per-fold results CSV (mean / std rows appended)")
+
+    p_bag = sub.add_parser("bag", help="Train a bootstrap ensemble of agents in parallel")
+    p_bag.add_argument("--master", required=True, help="Master CSV")
+    p_bag.add_argument("--coach", default="archon_coach_iq.csv", help="Coach CSV (Team,EVA_Scalar)")
+    p_bag.add_argument("--stadium", default="archon_stadium_entropy.csv", help="Stadium CSV (Team,Entropy_Alpha)")
+    p_bag.add_argument("--actuals", required=True, help="Actuals CSV (Matchup,Actual_Spread)")
+    p_bag.add_argument("--members", type=int, default=20, help="Ensemble size (bootstrap resamples)")
+    _add_fold_train_args(p_bag, "Epochs per member")
+    p_bag.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    p_bag.add_argument("--seed", type=int, default=0, help="Seed for the resamples and per-member RNG streams")
+    p_bag.add_argument("--output", default="archon_bag.npz", help="Ensemble parameter matrix output")
+
+    p_pbag = sub.add_parser("predict-bag", help="Predict spreads with quantile intervals from a bootstrap ensemble")
+    p_pbag.add_argument("--bag", default="archon_bag.npz", help="Ensemble from the bag subcommand")
+    p_pbag.add_argument("--master", required=True, help="Master CSV (Team_A_Key,Team_B_Key,Delta_W_Final)")
+    p_pbag.add_argument("--quantiles", type=float, nargs="+", default=[0.05, 0.5, 0.95], help="Quantiles to report per matchup")
+    p_pbag.add_argument("--output", default="archon_bag_predictions.csv", help="Output predictions CSV")
 
     args = parser.parse_args(argv)
 
@@ -509,19 +2295,14 @@ def main(argv=None):
         df_master = load_master(args.master)
         df_coach = load_coach(args.coach)
         df_stadium = load_stadium(args.stadium)
-        df_actuals = pd.read_csv(args.actuals)
-        if "Matchup" not in df_actuals.columns or "Actual_Spread" not in df_actuals.columns:
-            raise ValueError("Training actuals CSV must contain 'Matchup' and 'Actual_Spread' columns")
-
-        df_val_actuals = None
-        if args.val:
-            if not os.path.exists(args.val):
-                raise FileNotFoundError(f"Validation actuals file not found: {args.val}")
-            df_val_actuals = pd.read_csv(args.val)
-            if "Matchup" not in df_val_actuals.columns or "Actual_Spread" not in df_val_actuals.columns:
-                raise ValueError("Validation actuals CSV must contain 'Matchup' and 'Actual_Spread' columns")
-
-        agent = GradArchonAgent(df_coach, df_stadium)
+        df_actuals = load_actuals(args.actuals)
+        df_val_actuals = load_actuals(args.val, "Validation") if args.val else None
+
+        if args.online and args.optimizer != "sgd":
+            parser.error("--optimizer momentum/adam applies to batch training; use --batch-size 1 instead of --online")
+        if args.resume and not args.checkpoint_dir:
+            parser.error("--resume requires --checkpoint-dir")
+        agent = GradArchonAgent(df_coach, df_stadium, optimizer=args.optimizer, momentum=args.momentum, beta2=args.beta2)
         df_ledger = training_loop_grad_es(agent, df_master, df_actuals,
                                          df_val_actuals=df_val_actuals,
                                          epochs=args.epochs,
@@ -534,11 +2315,104 @@ def main(argv=None):
                                          ledger_path=args.ledger,
                                          patience=args.patience,
                                          min_delta=args.min_delta,
-                                         restore_best=args.restore_best)
+                                         restore_best=args.restore_best,
+                                         batch_size=args.batch_size,
+                                         val_every=args.val_every or None,
+                                         checkpoint_dir=args.checkpoint_dir,
+                                         checkpoint_every=args.checkpoint_every,
+                                         resume=args.resume,
+                                         ledger_chunk_rows=args.ledger_chunk_rows,
+                                         online_kernel=args.online_kernel,
+                                         trajectory_dir=args.trajectories)
         # Save new intelligence (best restored if requested)
         agent.save_intel(args.save_coach, args.save_stadium)
         print(df_ledger.head(50).to_string(index=False))
 
+    elif args.cmd == "walk-forward":
+        if args.online and args.optimizer != "sgd":
+            parser.error("--optimizer momentum/adam applies to the daily batch steps, not --online")
+        agent = GradArchonAgent(load_coach(args.coach), load_stadium(args.stadium),
+                                optimizer=args.optimizer, momentum=args.momentum, beta2=args.beta2)
+        df_ledger, history = walk_forward(agent, load_master(args.master), load_actuals(args.actuals),
+                                          lr_coach=args.lr_coach,
+                                          lr_entropy=args.lr_entropy,
+                                          lr_global=args.lr_global,
+                                          update_global=args.update_global,
+                                          online=args.online,
+                                          regularization=(args.regularization if args.regularization > 0 else None),
+                                          ledger_path=args.ledger)
+        history.save(args.history)
+        agent.save_intel(args.save_coach, args.save_stadium)
+        print(df_ledger.head(50).to_string(index=False))
+
+    elif args.cmd == "as-of":
+        history = ParamHistory.load(args.history, load_coach(args.coach), load_stadium(args.stadium))
+        coach_df, stadium_df, coach_weight, entropy_multiplier = history.as_of(args.date)
+        coach_df.to_csv(args.save_coach, index=False)
+        stadium_df.to_csv(args.save_stadium, index=False)
+        LOG.info("Parameters as of %s -> %s, %s (coach_weight=%.6f, entropy_multiplier=%.6f)",
+                 args.date, args.save_coach, args.save_stadium, coach_weight, entropy_multiplier)
+
+    elif args.cmd == "solve":
+        df_master = load_master(args.master)
+        agent = GradArchonAgent(load_coach(args.coach), load_stadium(args.stadium))
+        df_actuals = load_actuals(args.actuals)
+        df_val_actuals = load_actuals(args.val, "Validation") if args.val else None
+        df_path = solve_ridge(agent, df_master, df_actuals,
+                              df_val_actuals=df_val_actuals,
+                              regularization=args.regularization,
+                              path=args.path,
+                              alternate=args.alternate)
+        if args.path_output:
+            df_path.to_csv(args.path_output, index=False)
+            LOG.info("Saved regularization path to %s (%d rows)", args.path_output, len(df_path))
+        agent.save_intel(args.save_coach, args.save_stadium)
+        print(df_path.to_string(index=False))
+
+    elif args.cmd == "sweep":
+        spec_text = open(args.spec).read() if os.path.exists(args.spec) else args.spec
+        trials = expand_sweep_spec(json.loads(spec_text), seed=args.seed)
+        LOG.info("Sweep: %d trials", len(trials))
+        df_results = run_sweep(load_master(args.master), load_coach(args.coach), load_stadium(args.stadium),
+                               load_actuals(args.actuals), load_actuals(args.val, "Validation"),
+                               trials,
+                               defaults={"epochs": args.epochs, "online": args.online, "restore_best": args.restore_best},
+                               workers=args.workers,
+                               seed=args.seed)
+        df_results.to_csv(args.output, index=False)
+        LOG.info("Saved sweep results to %s (%d trials)", args.output, len(df_results))
+        print(df_results.head(20).to_string(index=False))
+
+    elif args.cmd == "cv":
+        if args.online and args.optimizer != "sgd":
+            parser.error("--optimizer momentum/adam applies to batch training; use --batch-size 1 instead of --online")
+        df_cv = run_cv(load_master(args.master), load_coach(args.coach), load_stadium(args.stadium),
+                       load_actuals(args.actuals), folds=args.folds, scheme=args.scheme, settings=_fold_train_settings(args),
+                       workers=args.workers, seed=args.seed)
+        summary = df_cv.drop(columns="fold").agg(["mean", "std"]).rename_axis("fold").reset_index()
+        pd.concat([df_cv, summary], ignore_index=True).to_csv(args.output, index=False)
+        LOG.info("CV (%s, %d folds): val MSE %.6f +/- %.6f (pooled %.6f), val MAE %.6f +/- %.6f, %.2fs of fold time",
+                 args.scheme, args.folds, df_cv.attrs["val_mse_mean"], df_cv.attrs["val_mse_std"],
+                 df_cv.attrs["val_mse_pooled"], df_cv.attrs["val_mae_mean"], df_cv.attrs["val_mae_std"],
+                 df_cv.attrs["wall_time_s"])
+        LOG.info("Saved CV results to %s", args.output)
+        print(df_cv.to_string(index=False))
+
+    elif args.cmd == "bag":
+        if args.online and args.optimizer != "sgd":
+            parser.error("--optimizer momentum/adam applies to batch training; use --batch-size 1 instead of --online")
+        bag = run_bagging(load_master(args.master), load_coach(args.coach), load_stadium(args.stadium),
+                          load_actuals(args.actuals), members=args.members, settings=_fold_train_settings(args),
+                          workers=args.workers, seed=args.seed)
+        bag.save(args.output)
+
+    elif args.cmd == "predict-bag":
+        bag = BaggedParams.load(args.bag)
+        df_preds = bag.predict_intervals(load_master(args.master), quantiles=tuple(args.quantiles))
+        df_preds.to_csv(args.output, index=False)
+        LOG.info("Saved ensemble predictions to %s (%d rows, %d members)", args.output, len(df_preds), len(bag))
+        print(df_preds.head(20).to_string(index=False))
+
     else:
         parser.print_help()
 
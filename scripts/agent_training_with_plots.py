@@ -1,35 +1,50 @@
 #!/usr/bin/env python3
 """
 Agent training script with plotting, early stopping, and ledger creation.
-Saves training ledger (CSV), parameter trajectory (numpy .npz), model checkpoint, and plots.
+Saves training ledger (CSV), parameter trajectories (memory-mapped .npy per tensor + index.json),
+model checkpoint, and plots (rendered by a separate plot process, see PlotWorker).
 
 Usage:
     python -m scripts.agent_training_with_plots --epochs 100 --batch-size 64 --lr 1e-3
+    python -m scripts.agent_training_with_plots --games-master schema/02_games_master.csv --epochs 100 --plot-interval 5
 
-This script is intentionally self-contained and uses a toy dataset if no dataloader is provided.
+Without --games-master it trains on a toy dataset; with it, on the cached Archon tensors (archon_dataset.py).
 """
 
 from __future__ import annotations
 
 import argparse
+import json
 import logging
 import os
+import queue
 import random
-from typing import List, Dict
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import torch
+import torch.distributed as dist
+import torch.multiprocessing as torch_mp
 import torch.nn as nn
 import torch.optim as optim
+from torch.nn.parallel import DistributedDataParallel
 from torch.utils.data import DataLoader, TensorDataset
 
-# Import plotting helpers from our sibling script
+# Plot rendering from our sibling script (matplotlib is only imported inside the plot process)
 try:
-    from scripts.plot_param_trajectories import plot_trajectories, plot_loss_from_ledger
+    from scripts.plot_param_trajectories import PlotWorker
 except Exception:
     # If run as a script from the same directory, allow direct import
-    from plot_param_trajectories import plot_trajectories, plot_loss_from_ledger
+    from plot_param_trajectories import PlotWorker
+
+try:
+    from scripts.archon_dataset import FEATURE_COLUMNS, batch_loader, make_archon_dataloaders
+except Exception:
+    from archon_dataset import FEATURE_COLUMNS, batch_loader, make_archon_dataloaders
 
 
 LOG = logging.getLogger(__name__)
@@ -63,7 +78,26 @@ def set_seed(seed: int) -> None:
         torch.cuda.manual_seed_all(seed)
 
 
-def make_toy_dataloaders(batch_size: int, input_dim: int = 20):
+def configure_threads(threads: Optional[int] = None, interop_threads: Optional[int] = None) -> None:
+    """Intra-op / inter-op thread pools; inter-op can only be set before the first parallel op."""
+    if threads:
+        torch.set_num_threads(threads)
+    if interop_threads:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError as e:
+            LOG.warning("Could not set inter-op threads to %d: %s", interop_threads, e)
+    LOG.info("torch threads: intra-op=%d inter-op=%d", torch.get_num_threads(), torch.get_num_interop_threads())
+
+
+def throughput_settings(cpus: Optional[int] = None) -> Dict[str, int]:
+    """Defaults for --throughput: a few prefetching loader workers, the remaining cores for intra-op math."""
+    cpus = cpus or os.cpu_count() or 1
+    workers = min(4, cpus // 8)
+    return {"num_workers": workers, "prefetch_factor": 4, "threads": max(1, cpus - workers), "interop_threads": 1}
+
+
+def make_toy_dataloaders(batch_size: int, input_dim: int = 20, shard: Optional[Tuple[int, int]] = None, **loader_kwargs):
     # Simple regression toy data
     N_train = 2000
     N_val = 500
@@ -77,26 +111,160 @@ def make_toy_dataloaders(batch_size: int, input_dim: int = 20):
     train_ds = TensorDataset(torch.from_numpy(X_train), torch.from_numpy(y_train))
     val_ds = TensorDataset(torch.from_numpy(X_val), torch.from_numpy(y_val))
 
-    train_loader = DataLoader(train_ds, batch_size=batch_size, shuffle=True)
-    val_loader = DataLoader(val_ds, batch_size=batch_size, shuffle=False)
+    train_loader = batch_loader(train_ds, batch_size, shuffle=True, shard=shard, **loader_kwargs)
+    val_loader = batch_loader(val_ds, batch_size, shuffle=False, **loader_kwargs)
     return train_loader, val_loader
 
 
+TRAJECTORY_INDEX = "index.json"
+
+
+class ParamTrajectoryWriter:
+    """
+    Parameter trajectories written incrementally into preallocated memory-mapped .npy files under
+    `directory`, one per parameter tensor (records x tracked elements), plus index.json (file, shape
+    and tracked flat indices per tensor, epoch per recorded row). With track_per_param, tensors
+    larger than that keep only evenly spaced flat indices, so memory and disk use are fixed up front.
+    """
+
+    def __init__(self, directory: str, model: nn.Module, capacity: int, track_per_param: Optional[int] = None):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.capacity = max(int(capacity), 1)
+        self.epochs: List[int] = []
+        self.entries: List[Tuple[str, nn.Parameter, Optional[torch.Tensor], np.ndarray]] = []
+        self.index: Dict[str, Dict] = {}
+        for name, p in model.named_parameters():
+            size = p.numel()
+            indices = None
+            if track_per_param and size > track_per_param:
+                indices = np.unique(np.linspace(0, size - 1, track_per_param).round().astype(np.int64))
+            width = size if indices is None else len(indices)
+            file = f"{name}.npy"
+            dtype = torch.empty(0, dtype=p.dtype).numpy().dtype
+            arr = np.lib.format.open_memmap(os.path.join(directory, file), mode="w+", dtype=dtype,
+                                            shape=(self.capacity, width))
+            sel = None if indices is None else torch.as_tensor(indices, device=p.device)
+            self.entries.append((name, p, sel, arr))
+            self.index[name] = {"file": file, "shape": list(p.shape),
+                                "indices": None if indices is None else indices.tolist()}
+        self._write_index()
+
+    def _write_index(self) -> None:
+        path = os.path.join(self.directory, TRAJECTORY_INDEX)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump({"params": self.index, "epochs": self.epochs, "rows": len(self.epochs)}, fh)
+        os.replace(tmp, path)
+
+    def record(self, epoch: int) -> None:
+        row = len(self.epochs)
+        if row >= self.capacity:
+            LOG.warning("Trajectory capacity (%d rows) reached; epoch %d not recorded", self.capacity, epoch)
+            return
+        with torch.no_grad():
+            for _, p, sel, arr in self.entries:
+                flat = p.detach().reshape(-1)
+                arr[row] = (flat if sel is None else flat.index_select(0, sel)).cpu().numpy()
+        for _, _, _, arr in self.entries:
+            arr.flush()
+        self.epochs.append(int(epoch))
+        self._write_index()
+
+
+class ArtifactWriter:
+    """
+    Writes training artifacts (state dicts, ledger frames) from a background thread so the epoch loop
+    never waits on disk. Each save snapshots its data in memory first (tensors cloned to CPU, frames
+    copied) and queues it; the queue is bounded, so a slow disk applies back-pressure instead of piling
+    up snapshots. Files are written to a temp name, fsynced and renamed into place. A queued save that
+    a newer save of the same path has superseded is skipped. flush() waits for the queue and re-raises
+    the first write error; close() flushes and stops the thread.
+    """
+
+    def __init__(self, max_pending: int = 4):
+        self._queue: "queue.Queue[Optional[Tuple[str, str, Any, int]]]" = queue.Queue(maxsize=max(1, max_pending))
+        self._latest: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def _submit(self, kind: str, path: str, payload: Any) -> None:
+        if self._error is not None:
+            self.flush()
+        with self._lock:
+            version = self._latest.get(path, 0) + 1
+            self._latest[path] = version
+        self._queue.put((kind, path, payload, version))
+
+    def save_state_dict(self, state_dict: Dict[str, torch.Tensor], path: str) -> None:
+        self._submit("torch", path, {k: v.detach().to("cpu", copy=True) for k, v in state_dict.items()})
+
+    def save_frame(self, df: pd.DataFrame, path: str) -> None:
+        self._submit("csv", path, df.copy())
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                kind, path, payload, version = job
+                with self._lock:
+                    superseded = self._latest.get(path, 0) > version
+                if not superseded:
+                    tmp = f"{path}.{os.getpid()}.tmp"
+                    with open(tmp, "wb") as fh:
+                        if kind == "torch":
+                            torch.save(payload, fh)
+                        else:
+                            payload.to_csv(fh, index=False)
+                        fh.flush()
+                        os.fsync(fh.fileno())
+                    os.replace(tmp, path)
+            except BaseException as e:  # surfaced to the training thread by flush()
+                if self._error is None:
+                    self._error = e
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        self._queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError(f"Artifact write failed: {error}") from error
+
+    def close(self) -> None:
+        if not self._thread.is_alive():
+            return
+        try:
+            self.flush()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+
+
+def _set_sampler_epoch(loader: DataLoader, epoch: int) -> None:
+    # DistributedSampler reshuffles per epoch; with batch_loader it sits inside the BatchSampler
+    for sampler in (getattr(loader, "sampler", None), getattr(getattr(loader, "sampler", None), "sampler", None)):
+        if hasattr(sampler, "set_epoch"):
+            sampler.set_epoch(epoch)
+
+
 def evaluate(model: nn.Module, dataloader: DataLoader, device: torch.device) -> float:
     model.eval()
-    loss_fn = nn.MSELoss()
-    total = 0.0
+    loss_fn = nn.MSELoss(reduction="sum")
+    # summed on the tensor side; one host sync per pass
+    total = torch.zeros((), device=device)
     n = 0
     with torch.no_grad():
         for xb, yb in dataloader:
-            xb = xb.to(device)
-            yb = yb.to(device)
-            out = model(xb)
-            loss = loss_fn(out, yb)
-            batch_size = xb.shape[0]
-            total += loss.item() * batch_size
-            n += batch_size
-    return total / max(1, n)
+            xb = xb.to(device, non_blocking=True)
+            yb = yb.to(device, non_blocking=True)
+            total += loss_fn(model(xb), yb)
+            n += xb.shape[0]
+    return total.item() / max(1, n)
 
 
 def train(
@@ -109,10 +277,33 @@ def train(
     early_stop_patience: int,
     save_dir: str,
     record_params_every: int = 1,
+    epoch_callback: Optional[Callable[[int, float, float], bool]] = None,
+    plot: bool = True,
+    track_per_param: Optional[int] = None,
+    max_pending_writes: int = 4,
+    plot_interval: int = 0,
 ):
+    """Train with early stopping; epoch_callback(epoch, train_loss, val_loss) returning True stops the run
+    (used by schedulers such as successive halving). plot=False skips all plots.
+    Plots are rendered by a PlotWorker process: with plot_interval=N, checkpoint loss / trajectory plots go
+    to <save_dir>/plots every N epochs while training continues; the final plots are waited for on return.
+    Each ledger row carries the epoch's wall time split into data / forward / backward / optimizer / val
+    seconds (host-side timers) and the training samples per second.
+    Parameters are recorded every record_params_every epochs into <save_dir>/param_trajectories
+    (see ParamTrajectoryWriter; track_per_param caps the elements kept per tensor).
+    Model checkpoints and the ledger are written by a background ArtifactWriter (at most
+    max_pending_writes snapshots queued) and flushed before plotting and returning.
+
+    Inside an initialized process group (see train_distributed) the model is wrapped in
+    DistributedDataParallel: gradients are all-reduced every step, train loss and samples/s are summed
+    over ranks, rank 0's early-stop / callback decision is broadcast, and only rank 0 writes the ledger,
+    trajectories, checkpoints and plots."""
+    distributed = dist.is_available() and dist.is_initialized() and dist.get_world_size() > 1
+    is_main = not distributed or dist.get_rank() == 0
     os.makedirs(save_dir, exist_ok=True)
 
     model = model.to(device)
+    net = DistributedDataParallel(model) if distributed else model
     opt = optim.Adam(model.parameters(), lr=lr)
     loss_fn = nn.MSELoss()
 
@@ -122,93 +313,149 @@ def train(
 
     ledger_rows: List[Dict] = []
 
-    # We'll store parameter trajectories as a dict: param_name -> list of flattened arrays over epochs
-    param_trajectories: Dict[str, List[np.ndarray]] = {}
-    param_names: List[str] = []
-
-    # Initialize param names
-    for name, p in model.named_parameters():
-        param_names.append(name)
-        param_trajectories[name] = []
-
-    for epoch in range(1, epochs + 1):
-        model.train()
-        epoch_loss = 0.0
-        n_samples = 0
-        for xb, yb in train_loader:
-            xb = xb.to(device)
-            yb = yb.to(device)
-            opt.zero_grad()
-            out = model(xb)
-            loss = loss_fn(out, yb)
-            loss.backward()
-            opt.step()
-            batch_size = xb.shape[0]
-            epoch_loss += loss.item() * batch_size
-            n_samples += batch_size
-        train_loss = epoch_loss / max(1, n_samples)
-
-        val_loss = evaluate(model, val_loader, device)
-
-        LOG.info(f"Epoch {epoch:03d} | train_loss={train_loss:.6f} val_loss={val_loss:.6f}")
-
-        # Record ledger row
-        row = {
-            "epoch": epoch,
-            "train_loss": float(train_loss),
-            "val_loss": float(val_loss),
-        }
-        ledger_rows.append(row)
-
-        # Record parameters (flattened) every N epochs
-        if (epoch - 1) % record_params_every == 0:
-            for name, p in model.named_parameters():
-                param_trajectories[name].append(p.detach().cpu().numpy().ravel().copy())
-
-        # Check early stopping
-        if val_loss < best_val - 1e-12:
-            best_val = val_loss
-            best_epoch = epoch
-            stale = 0
-            # save best model
-            best_path = os.path.join(save_dir, "best_model.pth")
-            torch.save(model.state_dict(), best_path)
-        else:
-            stale += 1
-
-        if stale >= early_stop_patience:
-            LOG.info("Early stopping triggered (patience=%d)." % early_stop_patience)
-            break
-
-    # After training save final model
-    final_path = os.path.join(save_dir, "final_model.pth")
-    torch.save(model.state_dict(), final_path)
-
-    # Save ledger
-    ledger_df = pd.DataFrame(ledger_rows)
-    ledger_csv = os.path.join(save_dir, "training_ledger.csv")
-    ledger_df.to_csv(ledger_csv, index=False)
-
-    # Save parameter trajectories as npz (each param is an array epochs x param_size)
-    param_arrays = {}
-    for name in param_names:
-        if len(param_trajectories[name]) == 0:
-            param_arrays[name] = np.zeros((0,))
-        else:
-            param_arrays[name] = np.vstack(param_trajectories[name])
-    traj_path = os.path.join(save_dir, "param_trajectories.npz")
-    np.savez_compressed(traj_path, **param_arrays)
-
-    LOG.info(f"Saved ledger to {ledger_csv} and param trajectories to {traj_path}")
-
-    # Create plots
+    # Parameter trajectories go straight to preallocated memmaps: one row per recorded epoch
+    traj_path = os.path.join(save_dir, "param_trajectories")
+    trajectories = None
+    if is_main:
+        trajectories = ParamTrajectoryWriter(traj_path, model, len(range(1, epochs + 1, record_params_every)),
+                                             track_per_param=track_per_param)
+
+    plots_dir = os.path.join(save_dir, "plots")
+    plotter = None
+    if plot and is_main:
+        plotter = PlotWorker()
+        if plot_interval > 0:
+            os.makedirs(plots_dir, exist_ok=True)
+
+    artifacts = ArtifactWriter(max_pending=max_pending_writes)
     try:
-        plot_loss_from_ledger(ledger_csv, os.path.join(save_dir, "loss_curve.png"))
-        # For trajectories, pick top-k smallest parameters (by size) to visualize or first few
+        for epoch in range(1, epochs + 1):
+            net.train()
+            _set_sampler_epoch(train_loader, epoch)
+            # loss stays on the tensor side (no per-batch .item() sync); timers: data, forward, backward, optimizer
+            epoch_loss = torch.zeros((), device=device)
+            n_samples = 0
+            timers = [0.0, 0.0, 0.0, 0.0]
+            epoch_start = tick = time.perf_counter()
+            for xb, yb in train_loader:
+                xb = xb.to(device, non_blocking=True)
+                yb = yb.to(device, non_blocking=True)
+                now = time.perf_counter()
+                timers[0] += now - tick
+                tick = now
+                out = net(xb)
+                loss = loss_fn(out, yb)
+                now = time.perf_counter()
+                timers[1] += now - tick
+                tick = now
+                opt.zero_grad(set_to_none=True)
+                loss.backward()
+                now = time.perf_counter()
+                timers[2] += now - tick
+                tick = now
+                opt.step()
+                batch_size = xb.shape[0]
+                epoch_loss += loss.detach() * batch_size
+                n_samples += batch_size
+                now = time.perf_counter()
+                timers[3] += now - tick
+                tick = now
+            if distributed:
+                totals = torch.stack([epoch_loss, torch.tensor(float(n_samples), device=device)])
+                dist.all_reduce(totals)
+                epoch_loss, n_samples = totals[0], int(totals[1].item())
+            train_loss = epoch_loss.item() / max(1, n_samples)
+            train_s = time.perf_counter() - epoch_start
+
+            val_start = time.perf_counter()
+            val_loss = evaluate(model, val_loader, device)
+            val_s = time.perf_counter() - val_start
+
+            LOG.info(f"Epoch {epoch:03d} | train_loss={train_loss:.6f} val_loss={val_loss:.6f} | "
+                     f"{n_samples / max(train_s, 1e-9):,.0f} samples/s")
+
+            # Record ledger row
+            row = {
+                "epoch": epoch,
+                "train_loss": float(train_loss),
+                "val_loss": float(val_loss),
+                "samples_per_s": n_samples / max(train_s, 1e-9),
+                "epoch_s": train_s + val_s,
+                "data_s": timers[0],
+                "forward_s": timers[1],
+                "backward_s": timers[2],
+                "optimizer_s": timers[3],
+                "val_s": val_s,
+            }
+            ledger_rows.append(row)
+
+            # Record parameters (flattened) every N epochs
+            if trajectories is not None and (epoch - 1) % record_params_every == 0:
+                trajectories.record(epoch)
+
+            if plotter is not None and plot_interval > 0 and epoch % plot_interval == 0:
+                # the ledger so far travels with the job; trajectories are read from the flushed memmaps
+                plotter.submit("loss_frame", pd.DataFrame(ledger_rows),
+                               os.path.join(plots_dir, f"loss_curve_epoch{epoch:03d}.png"))
+                if trajectories is not None and trajectories.epochs:
+                    plotter.submit("trajectories", traj_path,
+                                   os.path.join(plots_dir, f"param_trajectories_epoch{epoch:03d}.png"))
+
+            # Check early stopping
+            if val_loss < best_val - 1e-12:
+                best_val = val_loss
+                best_epoch = epoch
+                stale = 0
+                # save best model
+                best_path = os.path.join(save_dir, "best_model.pth")
+                if is_main:
+                    artifacts.save_state_dict(model.state_dict(), best_path)
+            else:
+                stale += 1
+
+            # rank 0 decides (val_loss can differ per rank); the others only follow the broadcast flag
+            stop = None
+            if is_main:
+                if stale >= early_stop_patience:
+                    stop = "Early stopping triggered (patience=%d)." % early_stop_patience
+                elif epoch_callback is not None and epoch_callback(epoch, train_loss, val_loss):
+                    stop = "Stopped by epoch callback at epoch %d." % epoch
+            if distributed:
+                # ranks must leave the loop together, or the next collective deadlocks
+                flag = torch.tensor([int(stop is not None)])
+                dist.broadcast(flag, 0)
+                if flag.item() and stop is None:
+                    stop = "Stopped by rank 0 at epoch %d." % epoch
+            if stop is not None:
+                LOG.info(stop)
+                break
+
+        # After training save final model
+        final_path = os.path.join(save_dir, "final_model.pth")
+        if is_main:
+            artifacts.save_state_dict(model.state_dict(), final_path)
+
+        # Save ledger
+        ledger_df = pd.DataFrame(ledger_rows)
+        ledger_csv = os.path.join(save_dir, "training_ledger.csv")
+        if is_main:
+            artifacts.save_frame(ledger_df, ledger_csv)
+    except BaseException:
+        if plotter is not None:
+            plotter.close(timeout=30)
+        raise
+    finally:
+        artifacts.close()
+
+    if is_main:
+        LOG.info(f"Saved ledger to {ledger_csv} and param trajectories to {traj_path}")
+
+    # Final plots (the ledger CSV is on disk once artifacts are closed); failures are logged by the worker
+    if plotter is not None:
+        plotter.submit("loss", ledger_csv, os.path.join(save_dir, "loss_curve.png"), block=True)
         # We'll visualize up to 6 parameter vectors merged into a single plot by taking one element from each param's flattened vector
-        plot_trajectories(traj_path, os.path.join(save_dir, "param_trajectories.png"))
-    except Exception as e:
-        LOG.exception("Plotting failed: %s", e)
+        plotter.submit("trajectories", traj_path, os.path.join(save_dir, "param_trajectories.png"), block=True)
+        plotter.close()
 
     return {
         "ledger_csv": ledger_csv,
@@ -227,22 +474,58 @@ def parse_args():
     p.add_argument("--save-dir", type=str, default="runs/agent_training")
     p.add_argument("--seed", type=int, default=42)
     p.add_argument("--record-params-every", type=int, default=1)
+    p.add_argument("--track-per-param", type=int, default=None,
+                   help="Record at most N evenly spaced elements of each parameter tensor")
     p.add_argument("--device", type=str, default=None)
+    p.add_argument("--plot-interval", type=int, default=0,
+                   help="Render checkpoint plots to <save-dir>/plots every N epochs (in a separate process)")
+    p.add_argument("--num-workers", type=int, default=None, help="DataLoader worker processes (default 0; --throughput picks some)")
+    p.add_argument("--prefetch-factor", type=int, default=None, help="Batches prefetched per loader worker")
+    p.add_argument("--threads", type=int, default=None, help="torch intra-op threads")
+    p.add_argument("--interop-threads", type=int, default=None, help="torch inter-op threads")
+    p.add_argument("--throughput", action="store_true",
+                   help="CPU throughput preset for workers / prefetch / threads (explicit flags override it)")
+    p.add_argument("--world-size", type=int, default=1,
+                   help="Data-parallel CPU processes (gloo); --batch-size is per process")
+    p.add_argument("--games-master", type=str, default=None,
+                   help="Train on schema/02_games_master.csv style data instead of the toy dataset")
+    p.add_argument("--actuals", type=str, default=None, help="Actuals CSV for --games-master (game_id or Matchup, Actual_Spread)")
+    p.add_argument("--cache-dir", type=str, default=None, help="Tensor cache directory (default: .archon_cache next to the master)")
+    p.add_argument("--val-fraction", type=float, default=0.2, help="Most recent share of games held out for validation")
     return p.parse_args()
 
 
-def main():
-    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
-    args = parse_args()
+def run_training(args: argparse.Namespace, shard: Optional[Tuple[int, int]] = None) -> Dict:
+    """Build loaders and model from CLI args and train; shard=(rank, world_size) inside a process group."""
     set_seed(args.seed)
-
-    device = torch.device(args.device if args.device is not None else ("cuda" if torch.cuda.is_available() else "cpu"))
-
-    train_loader, val_loader = make_toy_dataloaders(args.batch_size)
-
-    model = SimpleAgent(input_dim=20, hidden=128, output_dim=1)
-
-    out = train(
+    perf = throughput_settings() if args.throughput else {}
+    for key in ("num_workers", "prefetch_factor", "threads", "interop_threads"):
+        if getattr(args, key) is not None:
+            perf[key] = getattr(args, key)
+    if shard is not None and "threads" not in perf:
+        # split the cores between the ranks
+        perf["threads"] = max(1, (os.cpu_count() or 1) // shard[1])
+    configure_threads(perf.get("threads"), perf.get("interop_threads"))
+    loader_kwargs = {"num_workers": perf.get("num_workers", 0), "prefetch_factor": perf.get("prefetch_factor"), "shard": shard}
+
+    if shard is not None:
+        device = torch.device("cpu")
+    else:
+        device = torch.device(args.device if args.device is not None else ("cuda" if torch.cuda.is_available() else "cpu"))
+
+    if args.games_master:
+        train_loader, val_loader = make_archon_dataloaders(args.games_master, args.batch_size, actuals_csv=args.actuals,
+                                                           cache_dir=args.cache_dir, val_fraction=args.val_fraction,
+                                                           pin_memory=device.type == "cuda", **loader_kwargs)
+        input_dim = len(FEATURE_COLUMNS)
+    else:
+        train_loader, val_loader = make_toy_dataloaders(args.batch_size, pin_memory=device.type == "cuda", **loader_kwargs)
+        input_dim = 20
+
+    # same seed on every rank: identical initial weights (DDP also broadcasts rank 0's)
+    model = SimpleAgent(input_dim=input_dim, hidden=128, output_dim=1)
+
+    return train(
         model=model,
         train_loader=train_loader,
         val_loader=val_loader,
@@ -252,8 +535,46 @@ def main():
         early_stop_patience=args.early_stop_patience,
         save_dir=args.save_dir,
         record_params_every=args.record_params_every,
+        track_per_param=args.track_per_param,
+        plot_interval=args.plot_interval,
     )
 
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _ddp_worker(rank: int, world_size: int, port: int, args: argparse.Namespace) -> None:
+    logging.basicConfig(level=logging.INFO if rank == 0 else logging.WARNING,
+                        format=f"%(asctime)s %(levelname)s [rank {rank}] %(message)s")
+    dist.init_process_group("gloo", init_method=f"tcp://127.0.0.1:{port}", rank=rank, world_size=world_size)
+    try:
+        out = run_training(args, shard=(rank, world_size))
+        if rank == 0:
+            LOG.info("Training finished. Artifacts: %s", out)
+    finally:
+        dist.destroy_process_group()
+
+
+def train_distributed(args: argparse.Namespace, world_size: int) -> None:
+    """
+    Data-parallel CPU training: world_size local processes joined over gloo, each reading its shard of
+    every epoch (--batch-size is per process) and all-reducing gradients each step.
+    """
+    port = _free_port()
+    LOG.info("Spawning %d data-parallel workers (gloo, port %d)", world_size, port)
+    torch_mp.spawn(_ddp_worker, args=(world_size, port, args), nprocs=world_size, join=True)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = parse_args()
+    if args.world_size > 1:
+        train_distributed(args, args.world_size)
+        return
+    out = run_training(args)
     LOG.info("Training finished. Artifacts: %s", out)
 
 
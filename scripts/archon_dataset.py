@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Real-data loader for the torch trainer: schema/02_games_master.csv -> float32 feature / target tensors.
+
+Features are the home/away fundamentals of Worksheet 02 (net rating, eFG%, pace, turnover %, back-to-back
+flags and travel miles); the target is the home margin, from an `actual_margin` column in the games master
+or from an actuals CSV (game_id or Matchup "home vs away" + Actual_Spread).
+
+Tensors are cached per season under a cache directory as .npy files plus manifest.json:
+- when the games master and actuals files hash to what the manifest recorded, nothing is parsed and every
+  season is memory-mapped straight into torch tensors (copy-on-write maps, no copy until written);
+- when a source changed, the CSVs are parsed once and only seasons whose rows changed are rewritten.
+
+Usage:
+    python -m scripts.archon_dataset --games-master schema/02_games_master.csv --cache-dir schema/.archon_cache
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import torch
+from torch.utils.data import BatchSampler, DataLoader, Dataset, DistributedSampler, RandomSampler, SequentialSampler
+
+
+LOG = logging.getLogger(__name__)
+
+# Worksheet 02 columns used as model inputs, with the schema defaults (repair_ws02_schema.py) for gaps
+FEATURE_DEFAULTS: Dict[str, float] = {
+    "netrtg_home": 0.0, "netrtg_away": 0.0, "netrtg_delta": 0.0,
+    "efg_home": 0.50, "efg_away": 0.50, "efg_gap": 0.0,
+    "pace": 98.0,
+    "tov_pct_home": 0.13, "tov_pct_away": 0.13, "tov_pct_delta": 0.0,
+    "b2b_flag_A": 0.0, "b2b_flag_B": 0.0,
+    "travel_miles_A": 0.0, "travel_miles_B": 0.0,
+}
+FEATURE_COLUMNS: List[str] = list(FEATURE_DEFAULTS)
+# derived columns rebuilt from their parts when a master predates them
+DERIVED_COLUMNS = {"netrtg_delta": ("netrtg_home", "netrtg_away"), "efg_gap": ("efg_home", "efg_away"),
+                   "tov_pct_delta": ("tov_pct_home", "tov_pct_away")}
+TARGET_COLUMN = "actual_margin"
+MANIFEST = "manifest.json"
+CACHE_VERSION = 1
+
+
+def file_digest(path: str, block_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _numeric(s: pd.Series) -> pd.Series:
+    # flags arrive as True/False strings or bools; description rows (update_ws02.py) become NaN
+    return pd.to_numeric(s.astype(str).str.strip().replace({"True": "1", "False": "0"}), errors="coerce")
+
+
+def _season_of(dates: pd.Series) -> pd.Series:
+    """NBA season label ("2024-25") from game dates; seasons start in the autumn."""
+    start = dates.dt.year - (dates.dt.month < 8).astype(int)
+    return start.map(lambda y: "all" if pd.isna(y) else f"{int(y)}-{(int(y) + 1) % 100:02d}")
+
+
+def feature_available(col: str, columns) -> bool:
+    """True when col is among columns or can be derived from them (DERIVED_COLUMNS)."""
+    return col in columns or (col in DERIVED_COLUMNS and all(c in columns for c in DERIVED_COLUMNS[col]))
+
+
+def feature_frame(df: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Numeric model inputs (default FEATURE_COLUMNS) from a raw frame; derived columns are rebuilt from their
+    parts when absent and unavailable columns come back all-NaN. Gaps are left for fill_features."""
+    out = pd.DataFrame(index=df.index)
+    for col in columns or FEATURE_COLUMNS:
+        if col in df.columns:
+            out[col] = _numeric(df[col])
+        elif feature_available(col, df.columns):
+            a, b = DERIVED_COLUMNS[col]
+            out[col] = _numeric(df[a]) - _numeric(df[b])
+        else:
+            out[col] = np.nan
+    return out
+
+
+def fill_features(frame: pd.DataFrame) -> pd.DataFrame:
+    """Fill gaps with the schema defaults (FEATURE_DEFAULTS) for the columns that have one."""
+    return frame.fillna({c: FEATURE_DEFAULTS[c] for c in frame.columns if c in FEATURE_DEFAULTS})
+
+
+def read_games(games_csv: str, actuals_csv: Optional[str] = None) -> pd.DataFrame:
+    """Games master -> frame with season, date, FEATURE_COLUMNS and target (games without a target are dropped)."""
+    df = pd.read_csv(games_csv)
+    dates = pd.to_datetime(df["date"], errors="coerce", format="mixed") if "date" in df.columns else pd.Series(pd.NaT, index=df.index)
+    out = pd.DataFrame({"date": dates})
+    out["season"] = df["season"].astype(str) if "season" in df.columns else _season_of(dates)
+
+    missing = [c for c in FEATURE_COLUMNS if c not in df.columns]
+    if missing:
+        LOG.warning("%s lacks %s; using derived values or schema defaults", games_csv, missing)
+    out = out.join(feature_frame(df))
+
+    if actuals_csv:
+        actuals = pd.read_csv(actuals_csv)
+        if "game_id" in actuals.columns and "game_id" in df.columns:
+            margin = actuals.drop_duplicates("game_id").set_index(actuals["game_id"].astype(str))["Actual_Spread"]
+            out["target"] = df["game_id"].astype(str).map(margin)
+        elif "Matchup" in actuals.columns:
+            margin = actuals.drop_duplicates("Matchup").set_index("Matchup")["Actual_Spread"]
+            out["target"] = (df["home_team"].astype(str) + " vs " + df["away_team"].astype(str)).map(margin)
+        else:
+            raise ValueError(f"Actuals CSV {actuals_csv} needs game_id or Matchup plus Actual_Spread")
+        out["target"] = _numeric(out["target"])
+    elif TARGET_COLUMN in df.columns:
+        out["target"] = _numeric(df[TARGET_COLUMN])
+    else:
+        raise ValueError(f"{games_csv} has no {TARGET_COLUMN} column; pass an actuals CSV")
+
+    out = out[out["target"].notna()]
+    gaps = int(out[FEATURE_COLUMNS].isna().sum().sum())
+    if gaps:
+        LOG.info("Filling %d missing feature values with schema defaults", gaps)
+        out = fill_features(out)
+    return out.reset_index(drop=True)
+
+
+def _season_hash(block: pd.DataFrame) -> str:
+    values = pd.util.hash_pandas_object(block[["date", *FEATURE_COLUMNS, "target"]], index=False).to_numpy()
+    return hashlib.sha256(values.tobytes()).hexdigest()
+
+
+def _atomic_save(path: str, arr: np.ndarray) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(tmp, np.ascontiguousarray(arr))  # row-major, so batches are contiguous row slices
+    os.replace(tmp, path)
+
+
+def _read_manifest(cache_dir: str) -> Optional[Dict[str, Any]]:
+    path = os.path.join(cache_dir, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path) as fh:
+        manifest = json.load(fh)
+    return manifest if manifest.get("version") == CACHE_VERSION else None
+
+
+def _cache_complete(cache_dir: str, manifest: Dict[str, Any]) -> bool:
+    return all(os.path.exists(os.path.join(cache_dir, entry[k])) for entry in manifest["seasons"] for k in ("X", "y"))
+
+
+def build_archon_cache(games_csv: str, actuals_csv: Optional[str] = None, cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Bring the tensor cache for games_csv (+ actuals_csv) up to date and return its manifest. Unchanged
+    sources return immediately without parsing; otherwise only seasons whose rows changed are rewritten.
+    """
+    cache_dir = cache_dir or os.path.join(os.path.dirname(games_csv) or ".", ".archon_cache")
+    os.makedirs(cache_dir, exist_ok=True)
+    source = {"games": file_digest(games_csv), "actuals": file_digest(actuals_csv) if actuals_csv else None,
+              "features": FEATURE_COLUMNS}
+    manifest = _read_manifest(cache_dir)
+    if manifest is not None and manifest["source"] == source and _cache_complete(cache_dir, manifest):
+        LOG.info("Archon cache hit (%d seasons, %d games) in %s", len(manifest["seasons"]),
+                 sum(e["rows"] for e in manifest["seasons"]), cache_dir)
+        return manifest
+
+    previous = {e["season"]: e for e in manifest["seasons"]} if manifest is not None else {}
+    games = read_games(games_csv, actuals_csv)
+    seasons, rebuilt = [], 0
+    for season, block in games.groupby("season", sort=True):
+        block = block.sort_values("date", kind="stable", na_position="last")
+        digest = _season_hash(block)
+        old = previous.get(season)
+        if old is not None and old["hash"] == digest and _cache_complete(cache_dir, {"seasons": [old]}):
+            seasons.append(old)
+            continue
+        stem = f"{re.sub(r'[^0-9A-Za-z_-]', '_', season)}-{digest[:12]}"
+        entry = {"season": season, "hash": digest, "rows": len(block), "X": f"{stem}_X.npy", "y": f"{stem}_y.npy"}
+        _atomic_save(os.path.join(cache_dir, entry["X"]), block[FEATURE_COLUMNS].to_numpy(dtype=np.float32))
+        _atomic_save(os.path.join(cache_dir, entry["y"]), block[["target"]].to_numpy(dtype=np.float32))
+        seasons.append(entry)
+        rebuilt += 1
+
+    manifest = {"version": CACHE_VERSION, "source": source, "features": FEATURE_COLUMNS, "seasons": seasons}
+    path = os.path.join(cache_dir, MANIFEST)
+    with open(f"{path}.tmp", "w") as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(f"{path}.tmp", path)
+    live = {e[k] for e in seasons for k in ("X", "y")}
+    for name in os.listdir(cache_dir):
+        if name.endswith(".npy") and name not in live:
+            os.remove(os.path.join(cache_dir, name))
+    LOG.info("Archon cache updated in %s: %d seasons rebuilt, %d reused (%d games)", cache_dir, rebuilt,
+             len(seasons) - rebuilt, len(games))
+    return manifest
+
+
+def load_archon_tensors(cache_dir: str, manifest: Dict[str, Any]) -> List[Tuple[str, torch.Tensor, torch.Tensor]]:
+    """(season, X, y) per cached season, in season order; tensors share memory with copy-on-write maps."""
+    parts = []
+    for entry in manifest["seasons"]:
+        X = np.load(os.path.join(cache_dir, entry["X"]), mmap_mode="c")
+        y = np.load(os.path.join(cache_dir, entry["y"]), mmap_mode="c")
+        parts.append((entry["season"], torch.from_numpy(X), torch.from_numpy(y)))
+    return parts
+
+
+class SeasonTensors(Dataset):
+    """
+    Rows [start, stop) of per-season (X, y) tensors viewed as one dataset without concatenating them.
+    Indexing with a list of positions gathers a whole batch at once (see batch_loader).
+    """
+
+    def __init__(self, parts: List[Tuple[torch.Tensor, torch.Tensor]], start: int = 0, stop: Optional[int] = None):
+        self.parts = parts
+        self.offsets = np.cumsum([0] + [len(X) for X, _ in parts])
+        self.start = start
+        self.stop = int(self.offsets[-1]) if stop is None else stop
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        rows = np.atleast_1d(np.asarray(index, dtype=np.int64)) + self.start
+        which = np.searchsorted(self.offsets, rows, side="right") - 1
+        X0, y0 = self.parts[0]
+        xb = torch.empty((len(rows), X0.shape[1]), dtype=X0.dtype)
+        yb = torch.empty((len(rows), y0.shape[1]), dtype=y0.dtype)
+        for p in np.unique(which):
+            sel = np.flatnonzero(which == p)
+            local = torch.from_numpy(rows[sel] - self.offsets[p])
+            X, y = self.parts[p]
+            xb[torch.from_numpy(sel)] = X.index_select(0, local)
+            yb[torch.from_numpy(sel)] = y.index_select(0, local)
+        if np.ndim(index) == 0:
+            return xb[0], yb[0]
+        return xb, yb
+
+
+class StandardizeBatch:
+    """Standardizes a fetched (X, y) batch with fixed (train split) statistics; picklable for workers."""
+
+    def __init__(self, mean: torch.Tensor, std: torch.Tensor):
+        self.mean = mean
+        self.std = std
+
+    def __call__(self, batch):
+        xb, yb = batch
+        return (xb - self.mean) / self.std, yb
+
+
+def _pass_batch(batch):
+    return batch
+
+
+def batch_loader(dataset: Dataset, batch_size: int, shuffle: bool, transform: Optional[Any] = None,
+                 num_workers: int = 0, prefetch_factor: Optional[int] = None, pin_memory: bool = False,
+                 shard: Optional[Tuple[int, int]] = None) -> DataLoader:
+    """
+    DataLoader that fetches each batch with one list index into `dataset` (TensorDataset, SeasonTensors)
+    instead of collating batch_size single rows. Shuffling draws the same permutation as
+    DataLoader(shuffle=True). Workers stay alive across epochs and keep prefetch_factor batches queued each.
+    shard=(rank, world_size) reads only that rank's share of each epoch (DistributedSampler; the training
+    loop calls set_epoch so the shards reshuffle every epoch).
+    """
+    if shard is not None:
+        sampler = DistributedSampler(dataset, num_replicas=shard[1], rank=shard[0], shuffle=shuffle)
+    else:
+        sampler = RandomSampler(dataset) if shuffle else SequentialSampler(dataset)
+    kwargs: Dict[str, Any] = {}
+    if num_workers > 0:
+        kwargs["persistent_workers"] = True
+        if prefetch_factor:
+            kwargs["prefetch_factor"] = prefetch_factor
+    return DataLoader(dataset, batch_size=None, sampler=BatchSampler(sampler, batch_size, drop_last=False),
+                      collate_fn=transform or _pass_batch, num_workers=num_workers, pin_memory=pin_memory, **kwargs)
+
+
+def make_archon_dataloaders(games_csv: str, batch_size: int, actuals_csv: Optional[str] = None,
+                            cache_dir: Optional[str] = None, val_fraction: float = 0.2,
+                            shard: Optional[Tuple[int, int]] = None, **loader_kwargs):
+    """
+    Train / validation loaders over the cached Archon tensors. Games are in chronological order (seasons,
+    then dates) and the last val_fraction of them is held out; features are standardized with train-split
+    statistics per batch, so the cached tensors stay untouched. loader_kwargs go to batch_loader; shard
+    (rank, world_size) splits the training loader only, every rank validates on all held-out games.
+    """
+    cache_dir = cache_dir or os.path.join(os.path.dirname(games_csv) or ".", ".archon_cache")
+    manifest = build_archon_cache(games_csv, actuals_csv, cache_dir)
+    parts = load_archon_tensors(cache_dir, manifest)
+    tensors = [(X, y) for _, X, y in parts]
+    n = sum(len(X) for X, _ in tensors)
+    n_train = _train_rows(n, val_fraction)
+    mean, std = _feature_stats(tensors, n_train)
+    standardize = StandardizeBatch(torch.tensor(mean, dtype=torch.float32), torch.tensor(std, dtype=torch.float32))
+
+    LOG.info("Archon data: %d train / %d val games, %d features", n_train, n - n_train, len(FEATURE_COLUMNS))
+    train_loader = batch_loader(SeasonTensors(tensors, 0, n_train), batch_size, shuffle=True, transform=standardize,
+                                shard=shard, **loader_kwargs)
+    val_loader = batch_loader(SeasonTensors(tensors, n_train, n), batch_size, shuffle=False, transform=standardize, **loader_kwargs)
+    return train_loader, val_loader
+
+
+def _train_rows(n: int, val_fraction: float) -> int:
+    n_train = n - int(round(n * val_fraction))
+    if n_train < 1:
+        raise ValueError(f"Not enough games for training ({n} total, val_fraction={val_fraction})")
+    return n_train
+
+
+def _feature_stats(tensors: List[Tuple[torch.Tensor, torch.Tensor]], n_train: int) -> Tuple[np.ndarray, np.ndarray]:
+    total = np.zeros(len(FEATURE_COLUMNS))
+    total_sq = np.zeros(len(FEATURE_COLUMNS))
+    seen = 0
+    for X, _ in tensors:
+        take = min(len(X), n_train - seen)
+        if take <= 0:
+            break
+        block = X[:take].numpy().astype(np.float64)
+        total += block.sum(axis=0)
+        total_sq += (block ** 2).sum(axis=0)
+        seen += take
+    mean = total / n_train
+    std = np.sqrt(np.maximum(total_sq / n_train - mean ** 2, 0.0))
+    std[std < 1e-6] = 1.0  # constant columns (schema placeholders) pass through centred
+    return mean, std
+
+
+def archon_feature_stats(games_csv: str, actuals_csv: Optional[str] = None, cache_dir: Optional[str] = None,
+                         val_fraction: float = 0.2) -> Tuple[np.ndarray, np.ndarray]:
+    """The (mean, std) make_archon_dataloaders standardizes with, for models used outside the loaders."""
+    cache_dir = cache_dir or os.path.join(os.path.dirname(games_csv) or ".", ".archon_cache")
+    manifest = build_archon_cache(games_csv, actuals_csv, cache_dir)
+    tensors = [(X, y) for _, X, y in load_archon_tensors(cache_dir, manifest)]
+    return _feature_stats(tensors, _train_rows(sum(len(X) for X, _ in tensors), val_fraction))
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--games-master", type=str, default="schema/02_games_master.csv")
+    p.add_argument("--actuals", type=str, default=None, help="Actuals CSV (game_id or Matchup, Actual_Spread)")
+    p.add_argument("--cache-dir", type=str, default=None, help="Tensor cache directory (default: .archon_cache next to the master)")
+    return p.parse_args()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = parse_args()
+    manifest = build_archon_cache(args.games_master, args.actuals, args.cache_dir)
+    print(pd.DataFrame(manifest["seasons"])[["season", "rows", "hash"]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
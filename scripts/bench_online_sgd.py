@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark the online SGD paths of agent_training_grad_es on synthetic games:
+
+- reference: predict_single + apply_gradients per game (what the per-row training loop calls)
+- python:    run_online_epoch with the interpreted kernel (NumPy arrays in, lists inside)
+- numba:     run_online_epoch with the numba.njit kernel (if numba is installed)
+
+Every path starts from the same parameters and must end bit-for-bit identical; the table shows
+updates per second (compile time for numba is reported separately).
+
+Usage:
+    python -m scripts.bench_online_sgd --games 200000 --teams 30 --epochs 3 --update-global --regularization 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+try:
+    from scripts.agent_training_grad_es import NUMBA_AVAILABLE, GradArchonAgent, run_online_epoch
+except Exception:
+    # If run as a script from the same directory, allow direct import
+    from agent_training_grad_es import NUMBA_AVAILABLE, GradArchonAgent, run_online_epoch
+
+
+LOG = logging.getLogger(__name__)
+
+
+def make_agent(teams: List[str], rng: np.random.Generator) -> GradArchonAgent:
+    coach = pd.DataFrame({"Team": teams, "EVA_Scalar": rng.normal(0.0, 0.5, len(teams))})
+    stadium = pd.DataFrame({"Team": teams, "Entropy_Alpha": rng.normal(0.0, 0.5, len(teams))})
+    return GradArchonAgent(coach, stadium)
+
+
+def run_reference(agent: GradArchonAgent, teams: List[str], ia: np.ndarray, ib: np.ndarray, base: np.ndarray,
+                  actual: np.ndarray, epochs: int, settings: Dict) -> None:
+    names_a = [teams[i] for i in ia.tolist()]
+    names_b = [teams[i] for i in ib.tolist()]
+    base_l, actual_l = base.tolist(), actual.tolist()
+    for _ in range(epochs):
+        for a, b, x, y in zip(names_a, names_b, base_l, actual_l):
+            pred, _, _ = agent.predict_single(a, b, x)
+            agent.apply_gradients(a, b, x, pred, y, **settings)
+
+
+def run_kernel(agent: GradArchonAgent, ia: np.ndarray, ib: np.ndarray, base: np.ndarray, actual: np.ndarray,
+               epochs: int, settings: Dict, kernel: str) -> None:
+    for _ in range(epochs):
+        run_online_epoch(agent, ia, ib, base, actual, kernel=kernel, **settings)
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--games", type=int, default=200000)
+    p.add_argument("--teams", type=int, default=30)
+    p.add_argument("--epochs", type=int, default=3)
+    p.add_argument("--lr-coach", type=float, default=0.01)
+    p.add_argument("--lr-entropy", type=float, default=0.005)
+    p.add_argument("--lr-global", type=float, default=0.0005)
+    p.add_argument("--update-global", action="store_true")
+    p.add_argument("--regularization", type=float, default=0.0)
+    p.add_argument("--skip-reference", action="store_true", help="Skip the slow per-game reference path")
+    p.add_argument("--seed", type=int, default=0)
+    return p.parse_args()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+    teams = [f"T{i}" for i in range(args.teams)]
+    ia = rng.integers(0, args.teams, args.games)
+    ib = (ia + rng.integers(1, args.teams, args.games)) % args.teams
+    base = rng.normal(0.0, 5.0, args.games)
+    actual = base + rng.normal(0.0, 10.0, args.games)
+    settings = {"lr_coach": args.lr_coach, "lr_entropy": args.lr_entropy, "lr_global": args.lr_global,
+                "update_global": args.update_global, "regularization": args.regularization or None}
+    init_seed = int(rng.integers(0, 2**31))
+
+    paths = ([] if args.skip_reference else ["reference"]) + ["python"] + (["numba"] if NUMBA_AVAILABLE else [])
+    if not NUMBA_AVAILABLE:
+        LOG.warning("numba not installed; benchmarking the interpreted paths only")
+    results, finals = [], {}
+    for path in paths:
+        agent = make_agent(teams, np.random.default_rng(init_seed))
+        compile_s = 0.0
+        if path == "numba":
+            # compile on a copy so the timed run starts from the same parameters
+            warm = make_agent(teams, np.random.default_rng(init_seed))
+            start = time.perf_counter()
+            run_kernel(warm, ia[:1], ib[:1], base[:1], actual[:1], 1, settings, "numba")
+            compile_s = time.perf_counter() - start
+        start = time.perf_counter()
+        if path == "reference":
+            run_reference(agent, teams, ia, ib, base, actual, args.epochs, settings)
+        else:
+            run_kernel(agent, ia, ib, base, actual, args.epochs, settings, path)
+        elapsed = time.perf_counter() - start
+        n = len(agent.params)
+        finals[path] = (agent.params.coach[:n].copy(), agent.params.entropy[:n].copy(), agent.coach_weight, agent.entropy_multiplier)
+        results.append({"path": path, "updates": args.games * args.epochs, "seconds": round(elapsed, 4),
+                        "updates_per_s": round(args.games * args.epochs / elapsed), "compile_s": round(compile_s, 3)})
+
+    ref = finals[paths[0]]
+    for path in paths[1:]:
+        c, e, cw, em = finals[path]
+        exact = np.array_equal(c, ref[0]) and np.array_equal(e, ref[1]) and (cw, em) == ref[2:]
+        LOG.info("%s matches %s bit-for-bit: %s", path, paths[0], exact)
+    df = pd.DataFrame(results)
+    df["speedup"] = (df["updates_per_s"] / df["updates_per_s"].iloc[0]).round(1)
+    print(df.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
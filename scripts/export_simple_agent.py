@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Standalone CPU inference artifacts for a trained SimpleAgent (agent_training_with_plots.py).
+
+- export: trace best_model.pth into a frozen TorchScript module (agent.pt) and, with --quantize, a dynamically
+  quantized int8 variant (agent_int8.pt: Linear weights in int8, activations quantized on the fly). With
+  --games-master the train-split feature standardization of archon_dataset is baked into the module, so the
+  artifact scores raw Worksheet 02 features. Layer sizes and feature names travel in the artifact (meta.json).
+- score: batch-score a CSV (feature columns, filled like the training rows) or .npy matrix with an artifact; no
+  Python model code needed. Artifacts without feature names (toy-data models) need --features.
+- bench: latency / throughput of eager, TorchScript, int8 (and torch.compile with --compile) on slate-sized
+  and season-sized batches, with the max deviation from eager.
+
+Usage:
+    python -m scripts.export_simple_agent export --model runs/mlp/best_model.pth --output runs/mlp/agent.pt \
+        --quantize --games-master schema/02_games_master.csv
+    python -m scripts.export_simple_agent score --artifact runs/mlp/agent_int8.pt --input slate.csv --output slate_preds.csv
+    python -m scripts.export_simple_agent bench --model runs/mlp/best_model.pth --batch-sizes 15 1230 --threads 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import time
+import warnings
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import torch
+import torch.nn as nn
+
+try:
+    from scripts.agent_training_with_plots import SimpleAgent
+    from scripts.archon_dataset import FEATURE_COLUMNS, archon_feature_stats, feature_available, feature_frame, fill_features
+except Exception:
+    # If run as a script from the same directory, allow direct import
+    from agent_training_with_plots import SimpleAgent
+    from archon_dataset import FEATURE_COLUMNS, archon_feature_stats, feature_available, feature_frame, fill_features
+
+
+LOG = logging.getLogger(__name__)
+
+META_FILE = "meta.json"
+
+
+class Standardized(nn.Module):
+    """(x - mean) / std in front of a model, so the exported graph takes raw features."""
+
+    def __init__(self, model: nn.Module, mean: np.ndarray, std: np.ndarray):
+        super().__init__()
+        self.model = model
+        self.register_buffer("mean", torch.as_tensor(mean, dtype=torch.float32))
+        self.register_buffer("std", torch.as_tensor(std, dtype=torch.float32))
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return self.model((x - self.mean) / self.std)
+
+
+def load_simple_agent(model_path: str) -> Tuple[SimpleAgent, Dict[str, int]]:
+    """Rebuild a SimpleAgent from a saved state dict, reading the layer sizes off the weights."""
+    state = torch.load(model_path, map_location="cpu")
+    dims = {"input_dim": int(state["net.0.weight"].shape[1]), "hidden": int(state["net.0.weight"].shape[0]),
+            "output_dim": int(state["net.4.weight"].shape[0])}
+    model = SimpleAgent(**dims)
+    model.load_state_dict(state)
+    return model.eval(), dims
+
+
+def quantize_int8(model: nn.Module) -> nn.Module:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+
+def to_torchscript(model: nn.Module, input_dim: int) -> torch.jit.ScriptModule:
+    """Trace with a dummy batch (the MLP has no data-dependent control flow) and freeze for inference."""
+    with warnings.catch_warnings(), torch.no_grad():
+        warnings.simplefilter("ignore")
+        return torch.jit.freeze(torch.jit.trace(model.eval(), torch.zeros(2, input_dim)))
+
+
+def export_agent(model_path: str, output: str, quantize: bool = False,
+                 stats: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> List[str]:
+    """Write <output> (float32) and, with quantize, <stem>_int8<ext>; returns the written paths."""
+    model, dims = load_simple_agent(model_path)
+    if stats is not None and len(stats[0]) != dims["input_dim"]:
+        raise ValueError(f"Model takes {dims['input_dim']} features but the standardization has {len(stats[0])}")
+    meta: Dict[str, Any] = {**dims, "source": os.path.abspath(model_path), "standardized": stats is not None,
+                            "features": FEATURE_COLUMNS if dims["input_dim"] == len(FEATURE_COLUMNS) else None}
+    stem, ext = os.path.splitext(output)
+    variants = [(output, model, False)] + ([(f"{stem}_int8{ext or '.pt'}", quantize_int8(model), True)] if quantize else [])
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    written = []
+    for path, net, int8 in variants:
+        if stats is not None:
+            net = Standardized(net, *stats).eval()
+        scripted = to_torchscript(net, dims["input_dim"])
+        tmp = f"{path}.{os.getpid()}.tmp"
+        torch.jit.save(scripted, tmp, _extra_files={META_FILE: json.dumps({**meta, "quantized": int8})})
+        os.replace(tmp, path)
+        written.append(path)
+        LOG.info("Exported %s%s to %s", "int8 " if int8 else "", os.path.basename(model_path), path)
+    return written
+
+
+def load_artifact(path: str) -> Tuple[torch.jit.ScriptModule, Dict[str, Any]]:
+    extra = {META_FILE: ""}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        module = torch.jit.load(path, map_location="cpu", _extra_files=extra)
+    return module.eval(), json.loads(extra[META_FILE] or "{}")
+
+
+def read_features(path: str, meta: Dict[str, Any], features: Optional[List[str]] = None) -> np.ndarray:
+    """
+    .npy matrix as is. CSV columns by `features` (else the artifact's feature names), converted, derived
+    and default-filled as archon_dataset builds training rows; a column the CSV cannot supply is an error.
+    """
+    if path.endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    cols = list(features or meta.get("features") or [])
+    if not cols:
+        raise ValueError(f"{path}: the artifact records no feature names; pass the model's input columns with --features")
+    if "input_dim" in meta and len(cols) != meta["input_dim"]:
+        raise ValueError(f"Model takes {meta['input_dim']} features but {len(cols)} columns were given")
+    df = pd.read_csv(path)
+    missing = [c for c in cols if not feature_available(c, df.columns)]
+    if missing:
+        raise ValueError(f"{path} lacks feature columns {missing}")
+    return fill_features(feature_frame(df, cols)).to_numpy(dtype=np.float32)
+
+
+def score(module: torch.jit.ScriptModule, X: np.ndarray, batch_size: int = 65536) -> np.ndarray:
+    out = np.empty((len(X), 1), dtype=np.float32)
+    with torch.inference_mode():
+        for start in range(0, len(X), batch_size):
+            # copy each block: a read-only memmap slice cannot back a writable tensor
+            xb = torch.from_numpy(np.array(X[start:start + batch_size], dtype=np.float32, order="C"))
+            out[start:start + batch_size] = module(xb).numpy()
+    return out
+
+
+def _time_calls(fn, x: torch.Tensor, iters: int, warmup: int) -> np.ndarray:
+    with torch.inference_mode():
+        for _ in range(warmup):
+            fn(x)
+        times = np.empty(iters)
+        for i in range(iters):
+            start = time.perf_counter()
+            fn(x)
+            times[i] = time.perf_counter() - start
+    return times
+
+
+def bench(model_path: str, batch_sizes: List[int], iters: int = 200, warmup: int = 20,
+          compile_model: bool = False, seed: int = 0) -> pd.DataFrame:
+    model, dims = load_simple_agent(model_path)
+    modes = {"eager": model, "torchscript": to_torchscript(model, dims["input_dim"]),
+             "int8": to_torchscript(quantize_int8(model), dims["input_dim"])}
+    if compile_model:
+        modes["compile"] = torch.compile(model, dynamic=True)
+    rng = np.random.default_rng(seed)
+    rows = []
+    for bs in batch_sizes:
+        x = torch.from_numpy(rng.standard_normal((bs, dims["input_dim"])).astype(np.float32))
+        with torch.inference_mode():
+            ref = model(x)
+        for name, fn in modes.items():
+            start = time.perf_counter()
+            with torch.inference_mode():
+                max_dev = float((fn(x) - ref).abs().max())  # first call also absorbs compilation
+            first_s = time.perf_counter() - start
+            times = _time_calls(fn, x, iters, warmup)
+            med = float(np.median(times))
+            rows.append({"mode": name, "batch": bs, "median_ms": round(med * 1e3, 4),
+                         "p90_ms": round(float(np.percentile(times, 90)) * 1e3, 4),
+                         "rows_per_s": round(bs / med), "first_call_s": round(first_s, 3), "max_abs_dev": max_dev})
+    df = pd.DataFrame(rows)
+    df["speedup_vs_eager"] = (df.groupby("batch")["median_ms"].transform("first") / df["median_ms"]).round(2)
+    return df
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    sub = p.add_subparsers(dest="command", required=True)
+
+    p_exp = sub.add_parser("export", help="Trace a best_model.pth into TorchScript (optionally int8)")
+    p_exp.add_argument("--model", required=True, help="SimpleAgent state dict (best_model.pth)")
+    p_exp.add_argument("--output", required=True, help="Artifact path (int8 variant gets an _int8 suffix)")
+    p_exp.add_argument("--quantize", action="store_true", help="Also write a dynamically quantized int8 artifact")
+    p_exp.add_argument("--games-master", default=None, help="Bake in the archon_dataset standardization of this master")
+    p_exp.add_argument("--actuals", default=None)
+    p_exp.add_argument("--cache-dir", default=None)
+    p_exp.add_argument("--val-fraction", type=float, default=0.2, help="Must match training")
+
+    p_score = sub.add_parser("score", help="Batch-score features with an exported artifact")
+    p_score.add_argument("--artifact", required=True)
+    p_score.add_argument("--input", required=True, help="CSV with feature columns, or an .npy matrix")
+    p_score.add_argument("--output", required=True, help="CSV of predictions (input CSV columns kept)")
+    p_score.add_argument("--features", nargs="+", default=None,
+                         help="Input columns in model order (required when the artifact records none)")
+    p_score.add_argument("--batch-size", type=int, default=65536)
+
+    p_bench = sub.add_parser("bench", help="Latency / throughput of eager vs compiled vs int8")
+    p_bench.add_argument("--model", required=True)
+    p_bench.add_argument("--batch-sizes", type=int, nargs="+", default=[15, 1230],
+                         help="Default: one slate, one regular season of games")
+    p_bench.add_argument("--iters", type=int, default=200)
+    p_bench.add_argument("--warmup", type=int, default=20)
+    p_bench.add_argument("--compile", action="store_true", help="Include torch.compile")
+    p_bench.add_argument("--output", default=None, help="Write the table to CSV")
+
+    for sp in (p_score, p_bench):
+        sp.add_argument("--threads", type=int, default=None, help="torch intra-op threads")
+    return p.parse_args()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = parse_args()
+    if getattr(args, "threads", None):
+        torch.set_num_threads(args.threads)
+
+    if args.command == "export":
+        stats = None
+        if args.games_master:
+            stats = archon_feature_stats(args.games_master, args.actuals, args.cache_dir, args.val_fraction)
+        export_agent(args.model, args.output, quantize=args.quantize, stats=stats)
+    elif args.command == "score":
+        module, meta = load_artifact(args.artifact)
+        X = read_features(args.input, meta, features=args.features)
+        start = time.perf_counter()
+        preds = score(module, X, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        out = pd.read_csv(args.input) if args.input.endswith(".csv") else pd.DataFrame(index=range(len(preds)))
+        out["Prediction"] = preds[:, 0]
+        out.to_csv(args.output, index=False)
+        LOG.info("Scored %d rows in %.4fs (%s rows/s) -> %s", len(preds), elapsed,
+                 f"{len(preds) / max(elapsed, 1e-9):,.0f}", args.output)
+    elif args.command == "bench":
+        df = bench(args.model, args.batch_sizes, iters=args.iters, warmup=args.warmup, compile_model=args.compile)
+        print(df.to_string(index=False))
+        if args.output:
+            df.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
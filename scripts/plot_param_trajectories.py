@@ -5,37 +5,127 @@ Plotting helpers for parameter trajectories and loss curves.
 This module provides functions to create readable plots using matplotlib + seaborn.
 
 Functions:
-    - plot_trajectories(npz_path, save_path, top_k=6) -> saves an image with multiple parameter trajectories
-    - plot_loss_from_ledger(ledger_csv, save_path) -> plots train/val loss curves
+    - load_param_trajectories(traj_dir) -> lazily opened (memory-mapped) trajectories written by train()
+    - plot_trajectories(traj_path, save_path, top_k=6) -> saves an image with multiple parameter trajectories
+      (traj_path: a train() trajectory directory, or a legacy .npz)
+    - plot_loss_from_ledger(ledger_csv, save_path) -> plots train/val loss curves (plot_loss_frame for a DataFrame)
+    - plot_team_trajectories(traj_dir, outdir, top_k=8) -> per-team coach / entropy and global weight plots
+      from a gradient-agent trajectory directory (recorded with `train --trajectories`, or reduced
+      from an online grad ledger with --ledger)
 
 The trajectory plot will take the first few dimensions from the saved parameter vectors to visualize trends.
+
+Series are sliced straight out of the (memory-mapped) arrays and downsampled to at most `max_points`
+points with largest-triangle-three-buckets (lttb_indices), which keeps peaks and turns, then drawn with
+plain matplotlib on the Agg backend. Rendering cost is fixed by the point budget, not the run length.
+
+matplotlib and seaborn are imported on the first plot, not at import time, and PlotWorker renders plot
+jobs in a separate process so a training loop can queue checkpoint plots without waiting for them.
 """
 
 from __future__ import annotations
 
 import argparse
+import json
+import logging
+import multiprocessing as mp
 import os
-from typing import Optional
+import queue
+from typing import Any, Dict, List, Optional, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import seaborn as sns
 
-sns.set(style="whitegrid")
+
+LOG = logging.getLogger(__name__)
+
+_PLT = None
+
+
+def _pyplot():
+    """matplotlib.pyplot on the Agg backend with the seaborn style, imported on first use."""
+    global _PLT
+    if _PLT is None:
+        import matplotlib
+
+        matplotlib.use("Agg")  # file output only; no GUI backend negotiation
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        sns.set(style="whitegrid")
+        _PLT = plt
+    return _PLT
+
+
+def _grad_es():
+    # the gradient-agent module is only needed for its trajectory directories
+    try:
+        from scripts import agent_training_grad_es
+    except Exception:
+        # If run as a script from the same directory, allow direct import
+        import agent_training_grad_es
+    return agent_training_grad_es
+
+MAX_POINTS = 1000  # per drawn series
+MARKER_POINTS = 60  # draw point markers only on series this short
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-triangle-three-buckets: indices of n_out points (first and last always kept) that preserve the
+    visual shape of y(x). One vectorized pass per bucket; NaN points are never picked over real ones.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # n_out - 2 buckets over the interior points
+    edges = np.floor(np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            # centroid of the next bucket
+            nxt = slice(edges[i + 1], edges[i + 2])
+            cx = x[nxt].mean()
+            cy = y[a] if np.isnan(y[nxt]).all() else np.nanmean(y[nxt])
+        else:
+            cx, cy = x[n - 1], y[n - 1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        area = np.where(np.isnan(area), -1.0, area)
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def _plot_series(x, y, label: str, max_points: int = MAX_POINTS, **kwargs) -> None:
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    keep = lttb_indices(x, y, max_points)
+    if len(keep) <= MARKER_POINTS:
+        kwargs.setdefault("marker", "o")
+    _pyplot().plot(x[keep], y[keep], label=label, **kwargs)
 
 
 def plot_loss_from_ledger(ledger_csv: str, save_path: str, figsize=(8, 5)) -> None:
     if not os.path.exists(ledger_csv):
         raise FileNotFoundError(f"Ledger not found: {ledger_csv}")
-    df = pd.read_csv(ledger_csv)
+    plot_loss_frame(pd.read_csv(ledger_csv), save_path, figsize=figsize)
+
+
+def plot_loss_frame(df: pd.DataFrame, save_path: str, figsize=(8, 5)) -> None:
     if df.empty:
         raise ValueError("Ledger is empty")
 
+    plt = _pyplot()
     plt.figure(figsize=figsize)
-    plt.plot(df["epoch"], df["train_loss"], label="train_loss", marker="o")
+    _plot_series(df["epoch"].to_numpy(), df["train_loss"].to_numpy(), "train_loss")
     if "val_loss" in df.columns:
-        plt.plot(df["epoch"], df["val_loss"], label="val_loss", marker="o")
+        _plot_series(df["epoch"].to_numpy(), df["val_loss"].to_numpy(), "val_loss")
     plt.xlabel("Epoch")
     plt.ylabel("Loss")
     plt.title("Training and Validation Loss")
@@ -46,18 +136,36 @@ def plot_loss_from_ledger(ledger_csv: str, save_path: str, figsize=(8, 5)) -> No
     plt.close()
 
 
-def plot_trajectories(npz_path: str, save_path: str, top_k: int = 6, figsize=(10, 6)) -> None:
-    if not os.path.exists(npz_path):
-        raise FileNotFoundError(f"Param file not found: {npz_path}")
-    data = np.load(npz_path)
+def load_param_trajectories(traj_dir: str) -> Tuple[Dict[str, np.ndarray], List[int], Dict[str, Optional[List[int]]]]:
+    """
+    Open a train() trajectory directory without reading it: name -> read-only memmap (recorded
+    epochs x tracked elements), the recorded epochs, and name -> tracked flat indices (None = all).
+    """
+    with open(os.path.join(traj_dir, "index.json")) as fh:
+        index = json.load(fh)
+    rows = index["rows"]
+    arrays = {name: np.load(os.path.join(traj_dir, meta["file"]), mmap_mode="r")[:rows]
+              for name, meta in index["params"].items()}
+    return arrays, index["epochs"], {name: meta["indices"] for name, meta in index["params"].items()}
+
+
+def plot_trajectories(traj_path: str, save_path: str, top_k: int = 6, figsize=(10, 6),
+                      max_points: int = MAX_POINTS) -> None:
+    if not os.path.exists(traj_path):
+        raise FileNotFoundError(f"Param file not found: {traj_path}")
+    if os.path.isdir(traj_path):
+        data, epochs_recorded, tracked = load_param_trajectories(traj_path)
+    else:
+        # NpzFile reads an array only when it is accessed
+        data, epochs_recorded, tracked = np.load(traj_path), None, {}
     # data is a mapping name -> (epochs x param_count)
     # We'll pick up to top_k param-array entries, and within each pick up to 3 elements to visualize
-    keys = list(data.files)
+    keys = list(data)
     if not keys:
-        raise ValueError("No parameter arrays saved in npz")
+        raise ValueError("No parameter arrays saved")
 
-    # Build a long-form dataframe for seaborn lineplot
-    records = []
+    # Pick series in appearance order; only the chosen columns are ever read from a memmap
+    series = []
     for k in keys:
         arr = data[k]  # shape: (epochs, param_count)
         if arr.ndim == 1:
@@ -71,22 +179,20 @@ def plot_trajectories(npz_path: str, save_path: str, top_k: int = 6, figsize=(10
         n_samples = min(3, param_count)
         # use evenly spaced indices
         indices = np.linspace(0, param_count - 1, n_samples, dtype=int)
+        x = np.asarray(epochs_recorded) if epochs_recorded is not None else np.arange(1, epochs + 1)
         for idx in indices:
-            series = arr[:, idx]
-            for e, v in enumerate(series, start=1):
-                records.append({"param": f"{k}[{idx}]", "epoch": e, "value": float(v)})
+            flat_idx = tracked[k][idx] if tracked.get(k) is not None else idx
+            series.append((f"{k}[{flat_idx}]", x, arr, idx))
+        if len(series) >= top_k:
+            break
 
-    if not records:
+    if not series:
         raise ValueError("No trajectory data available to plot")
 
-    df = pd.DataFrame.from_records(records)
-
-    # Reduce to top_k distinct param series (by appearance order)
-    distinct = df["param"].unique()[:top_k]
-    df = df[df["param"].isin(distinct)].copy()
-
+    plt = _pyplot()
     plt.figure(figsize=figsize)
-    sns.lineplot(data=df, x="epoch", y="value", hue="param", marker="o")
+    for label, x, arr, idx in series[:top_k]:
+        _plot_series(x, arr[:, idx], label, max_points=max_points)
     plt.title("Parameter Trajectories (selected elements)")
     plt.xlabel("Epoch")
     plt.ylabel("Parameter value")
@@ -97,9 +203,122 @@ def plot_trajectories(npz_path: str, save_path: str, top_k: int = 6, figsize=(10
     plt.close()
 
 
+def _plot_team_lines(steps: np.ndarray, values: np.ndarray, teams, top_k: int, title: str, ylabel: str,
+                     save_path: str, figsize=(10, 6)) -> None:
+    # the top_k teams that moved the most (max - min over the run); columns are plotted straight from the array
+    with np.errstate(all="ignore"):
+        spread = np.nan_to_num(np.nanmax(values, axis=0) - np.nanmin(values, axis=0), nan=-1.0)
+    order = np.argsort(-spread, kind="stable")[:top_k]
+    plt = _pyplot()
+    plt.figure(figsize=figsize)
+    for j in order:
+        _plot_series(steps, values[:, j], str(teams[j]))
+    plt.title(title)
+    plt.xlabel("Epoch")
+    plt.ylabel(ylabel)
+    plt.legend(bbox_to_anchor=(1.05, 1), loc=2, borderaxespad=0.)
+    plt.tight_layout()
+    plt.savefig(save_path, bbox_inches="tight")
+    plt.close()
+
+
+def plot_team_trajectories(traj_dir: str, outdir: str, top_k: int = 8) -> None:
+    """Write global_params.png, coach_params_topK.png and entropy_params_topK.png for a trajectory directory."""
+    data = _grad_es().load_trajectories(traj_dir)
+    steps, teams = data["steps"], data["teams"]
+    if not len(steps):
+        raise ValueError("No trajectory data available to plot")
+    os.makedirs(outdir, exist_ok=True)
+
+    plt = _pyplot()
+    plt.figure(figsize=(8, 5))
+    _plot_series(steps, data["global"][:, 0], "coach_weight")
+    _plot_series(steps, data["global"][:, 1], "entropy_multiplier")
+    plt.title("Global weights")
+    plt.xlabel("Epoch")
+    plt.ylabel("Weight")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(os.path.join(outdir, "global_params.png"))
+    plt.close()
+
+    _plot_team_lines(steps, np.asarray(data["coach"]), teams, top_k, f"Coach EVA_Scalar (top {top_k} by movement)",
+                     "EVA_Scalar", os.path.join(outdir, "coach_params_topK.png"))
+    _plot_team_lines(steps, np.asarray(data["entropy"]), teams, top_k, f"Entropy_Alpha (top {top_k} by movement)",
+                     "Entropy_Alpha", os.path.join(outdir, "entropy_params_topK.png"))
+
+
+PLOT_JOBS = {
+    "loss": plot_loss_from_ledger,
+    "loss_frame": plot_loss_frame,
+    "trajectories": plot_trajectories,
+    "team_trajectories": plot_team_trajectories,
+}
+
+
+def _plot_worker_main(jobs) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [plot-worker] %(message)s")
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        kind, args, kwargs = job
+        try:
+            PLOT_JOBS[kind](*args, **kwargs)
+        except Exception:
+            LOG.exception("Plot job %s%s failed", kind, args)
+
+
+class PlotWorker:
+    """
+    Renders PLOT_JOBS in a separate (spawned) process fed by a bounded queue, so a caller never waits on
+    matplotlib: submit() returns at once and drops the job with a warning when the queue is full (a
+    later checkpoint plot supersedes it). close() lets the queued jobs finish and stops the process.
+    """
+
+    def __init__(self, max_pending: int = 8):
+        ctx = mp.get_context("spawn")  # fresh interpreter: no inherited torch thread pools or locks
+        self._jobs = ctx.Queue(maxsize=max(1, max_pending))
+        self._proc = ctx.Process(target=_plot_worker_main, args=(self._jobs,), name="plot-worker", daemon=True)
+        self._proc.start()
+
+    def submit(self, kind: str, *args: Any, block: bool = False, **kwargs: Any) -> bool:
+        """Queue PLOT_JOBS[kind](*args, **kwargs); block=True waits for room instead of dropping the job."""
+        if kind not in PLOT_JOBS:
+            raise ValueError(f"Unknown plot job {kind!r}; expected one of {sorted(PLOT_JOBS)}")
+        try:
+            self._jobs.put((kind, args, kwargs), block=block)
+            return True
+        except queue.Full:
+            LOG.warning("Plot queue full; skipping %s plot", kind)
+            return False
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        if self._proc.is_alive():
+            self._jobs.put(None)
+            self._proc.join(timeout)
+        self._jobs.close()
+
+
+def _cli_plot_team_trajectories():
+    p = argparse.ArgumentParser()
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument("--trajectories", type=str, help="Trajectory directory written by `agent_training_grad_es.py train --trajectories`")
+    src.add_argument("--ledger", type=str, help="Online grad ledger (CSV or Parquet directory) to reduce into trajectories")
+    p.add_argument("--outdir", type=str, required=True, help="Directory for the plot images")
+    p.add_argument("--top-k", type=int, default=8)
+    p.add_argument("--chunksize", type=int, default=200000, help="Ledger rows per streamed chunk (with --ledger)")
+    args = p.parse_args()
+    traj_dir = args.trajectories
+    if args.ledger:
+        traj_dir = os.path.join(args.outdir, "trajectories")
+        _grad_es().reduce_ledger_trajectories(args.ledger, traj_dir, chunksize=args.chunksize)
+    plot_team_trajectories(traj_dir, args.outdir, top_k=args.top_k)
+
+
 def _cli_plot_trajectories():
     p = argparse.ArgumentParser()
-    p.add_argument("npz", type=str, help="Path to param_trajectories.npz")
+    p.add_argument("npz", type=str, help="Path to a param_trajectories directory (or legacy .npz)")
     p.add_argument("out", type=str, help="Image output path")
     p.add_argument("--top-k", type=int, default=6)
     args = p.parse_args()
@@ -117,7 +336,9 @@ def _cli_plot_loss():
 if __name__ == "__main__":
     # Simple CLI which can call either of the plotting functions based on argv
     import sys
-    if len(sys.argv) >= 2 and sys.argv[1].endswith(".npz"):
+    if any(a.split("=")[0] in ("--ledger", "--trajectories") for a in sys.argv[1:]):
+        _cli_plot_team_trajectories()
+    elif len(sys.argv) >= 2 and (sys.argv[1].endswith(".npz") or os.path.isdir(sys.argv[1])):
         _cli_plot_trajectories()
     else:
         _cli_plot_loss()
@@ -18,7 +18,6 @@
 #     pip install pandas numpy
 #     pip install nba_api   # only if you use --fetch
 
-"""
 import argparse
 import os
 import sys
@@ -207,54 +206,140 @@ def load_intelligence(coach_path=DEFAULT_COACH, stadium_path=DEFAULT_STADIUM):
     return df_coach, df_stadium
 
 
-def run_engine(df_master, df_coach, df_stadium, output_path=DEFAULT_OUTPUT):
-    results = []
-    for _, row in df_master.iterrows():
-        team_a = row["Team_A_Key"]
-        team_b = row["Team_B_Key"]
-        base_spread = float(row["Delta_W_Final"])
-
-        # Coaching IQ lookup
-        try:
-            c_a = float(df_coach.loc[df_coach["Team"] == team_a, "EVA_Scalar"].values[0])
-        except Exception:
-            c_a = 0.0
-        try:
-            c_b = float(df_coach.loc[df_coach["Team"] == team_b, "EVA_Scalar"].values[0])
-        except Exception:
-            c_b = 0.0
-        coaching_adj = (c_a - c_b) * 3.0
-
-        # Stadium entropy lookup (home team = Team_A)
-        try:
-            ent_a = float(df_stadium.loc[df_stadium["Team"] == team_a, "Entropy_Alpha"].values[0])
-        except Exception:
-            ent_a = 0.0
-        entropy_adj = ent_a * -1.5
-
-        final_spread = base_spread + coaching_adj + entropy_adj
-        winner = team_a if final_spread > 0 else team_b
-        margin = abs(final_spread)
-        confidence = "High" if margin > 3.0 else "Volatile"
-
-        results.append({
-            "Matchup": f"{team_a} vs {team_b}",
-            "Archon_Spread": round(final_spread, 2),
-            "Base_Model": round(base_spread, 2),
-            "Coaching_Adj": round(coaching_adj, 2),
-            "Entropy_Adj": round(entropy_adj, 2),
-            "Winner_Pick": winner,
-            "Win_Margin": round(margin, 1),
-            "Confidence": confidence
-        })
+def round_like_python(values, ndigits):
+    """
+    Vectorized equivalent of the builtin round(x, ndigits) for float64 arrays.
+    np.round scales by 10**ndigits in floating point, which can land exactly on a .5 tie that
+    the true decimal value does not sit on; the rounding error of the scaling (Dekker product)
+    breaks those ties the same way Python does.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    scale = float(10 ** ndigits)
+    scaled = x * scale
+    # error-free transform: x * scale == scaled + err exactly
+    split = 134217729.0 * x
+    x_hi = split - (split - x)
+    x_lo = x - x_hi
+    err = (x_hi * scale - scaled) + x_lo * scale
+    rounded = np.rint(scaled)
+    tie = np.abs(scaled - np.trunc(scaled)) == 0.5
+    rounded = np.where(tie & (err > 0), np.floor(scaled) + 1.0, rounded)
+    rounded = np.where(tie & (err < 0), np.floor(scaled), rounded)
+    return rounded / scale
+
+
+def _float_or_zero(value):
+    """float(value), or 0.0 where float() fails, as the per-row lookup did."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
 
-    df_out = pd.DataFrame(results)
+
+def lookup_team_values(df_layer, col, keys):
+    """
+    Join one intelligence layer (Team -> col) onto a column of team keys.
+    The first row wins for duplicated teams; teams missing from the layer, or whose value
+    float() cannot parse, get 0.0 (NaN cells stay NaN). Returns a float64 array aligned with keys.
+    """
+    if df_layer is None or df_layer.empty or col not in df_layer.columns:
+        return np.zeros(len(keys), dtype=np.float64)
+    layer = df_layer.drop_duplicates(subset="Team", keep="first").set_index("Team")[col]
+    if not pd.api.types.is_numeric_dtype(layer):
+        # a layer holds one row per team: convert cell by cell with float()
+        layer = layer.map(_float_or_zero)
+    layer = layer.astype(np.float64)
+    values = layer.reindex(keys).to_numpy(dtype=np.float64)
+    known = keys.isin(layer.index).to_numpy()
+    return np.where(known, values, 0.0)
+
+
+def score_master(df_master, df_coach, df_stadium):
+    """
+    Columnar Archon scoring: join the coach and stadium layers to the master once by
+    team key, then compute every adjustment as a whole-array operation.
+    """
+    team_a = df_master["Team_A_Key"]
+    team_b = df_master["Team_B_Key"]
+    base_spread = pd.to_numeric(df_master["Delta_W_Final"], errors="coerce").to_numpy(dtype=np.float64)
+
+    # Coaching IQ lookup
+    c_a = lookup_team_values(df_coach, "EVA_Scalar", team_a)
+    c_b = lookup_team_values(df_coach, "EVA_Scalar", team_b)
+    coaching_adj = (c_a - c_b) * 3.0
+
+    # Stadium entropy lookup (home team = Team_A)
+    ent_a = lookup_team_values(df_stadium, "Entropy_Alpha", team_a)
+    entropy_adj = ent_a * -1.5
+
+    final_spread = base_spread + coaching_adj + entropy_adj
+    margin = np.abs(final_spread)
+
+    return pd.DataFrame({
+        "Matchup": (team_a.astype(str) + " vs " + team_b.astype(str)).to_numpy(),
+        "Archon_Spread": round_like_python(final_spread, 2),
+        "Base_Model": round_like_python(base_spread, 2),
+        "Coaching_Adj": round_like_python(coaching_adj, 2),
+        "Entropy_Adj": round_like_python(entropy_adj, 2),
+        "Winner_Pick": np.where(final_spread > 0, team_a.to_numpy(), team_b.to_numpy()),
+        "Win_Margin": round_like_python(margin, 1),
+        "Confidence": np.where(margin > 3.0, "High", "Volatile"),
+    })
+
+
+def run_engine(df_master, df_coach, df_stadium, output_path=DEFAULT_OUTPUT):
+    df_out = score_master(df_master, df_coach, df_stadium)
     df_out.to_csv(output_path, index=False)
     LOG.info("Saved predictions to %s (%d rows).", output_path, len(df_out))
     return df_out
 
 
-def validate_predictions(pred_path=DEFAULT_OUTPUT, actuals_path=None, ledger_path=DEFAULT_LEDGER):
+LEDGER_COLUMNS = ["Matchup", "Predicted", "Actual", "Error_Margin", "Audit_Status", "Recalibration"]
+
+
+def load_actuals_lookup(actuals_path):
+    """Read actuals once into a Matchup-keyed frame (first row wins for duplicated matchups)."""
+    df_act = pd.read_csv(actuals_path, usecols=["Matchup", "Actual_Spread"])
+    df_act = df_act.drop_duplicates(subset="Matchup", keep="first")
+    df_act["Actual_Spread"] = pd.to_numeric(df_act["Actual_Spread"], errors="coerce")
+    return df_act
+
+
+def build_ledger(df_preds, df_act):
+    """
+    Join a block of predictions to the actuals lookup with one keyed join and apply the
+    audit rules as vectorized masks. Predictions without an actual are dropped.
+    """
+    joined = df_preds.merge(df_act, on="Matchup", how="inner", sort=False)
+    pred = pd.to_numeric(joined["Archon_Spread"], errors="coerce").to_numpy(dtype=np.float64)
+    actual = joined["Actual_Spread"].to_numpy(dtype=np.float64)
+    if "Coaching_Adj" in joined.columns:
+        coaching_adj = pd.to_numeric(joined["Coaching_Adj"], errors="coerce").to_numpy(dtype=np.float64)
+    else:
+        coaching_adj = np.zeros(len(joined), dtype=np.float64)
+
+    error = np.abs(pred - actual)
+    high = error > 3.0
+    recalibration = np.where(np.abs(coaching_adj) > 0.5, "Decay Coaching weight by 5%", "Increase Entropy alpha by 10%")
+
+    return pd.DataFrame({
+        "Matchup": joined["Matchup"].to_numpy(),
+        "Predicted": pred,
+        "Actual": actual,
+        "Error_Margin": round_like_python(error, 2),
+        "Audit_Status": np.where(high, "High deviation.", "Model stable."),
+        "Recalibration": np.where(high, recalibration, "None"),
+    }, columns=LEDGER_COLUMNS)
+
+
+def validate_predictions(pred_path=DEFAULT_OUTPUT, actuals_path=None, ledger_path=DEFAULT_LEDGER, chunksize=None):
+    """
+    Validate predictions against actuals and write the learning ledger.
+
+    With chunksize set, predictions are streamed from pred_path in blocks of that many rows and
+    each ledger block is appended to ledger_path as soon as it is built, so memory is bounded by
+    the actuals lookup plus one block. Only the first ledger block is returned (as a preview).
+    """
     if not os.path.exists(pred_path):
         LOG.error("Predictions file not found: %s", pred_path)
         return None
@@ -262,38 +347,27 @@ def validate_predictions(pred_path=DEFAULT_OUTPUT, actuals_path=None, ledger_pat
         LOG.error("Actual results file not found: %s", actuals_path)
         return None
 
-    df_preds = pd.read_csv(pred_path)
-    df_act = pd.read_csv(actuals_path)
-    ledger = []
-    for _, p in df_preds.iterrows():
-        matchup = p["Matchup"]
-        pred = float(p["Archon_Spread"])
-        act_row = df_act.loc[df_act["Matchup"] == matchup]
-        if act_row.empty:
-            continue
-        actual = float(act_row["Actual_Spread"].values[0])
-        error = abs(pred - actual)
-        recalibration = "None"
-        note = "Model stable."
-        if error > 3.0:
-            note = "High deviation."
-            if abs(p.get("Coaching_Adj", 0)) > 0.5:
-                recalibration = "Decay Coaching weight by 5%"
-            else:
-                recalibration = "Increase Entropy alpha by 10%"
-
-        ledger.append({
-            "Matchup": matchup,
-            "Predicted": pred,
-            "Actual": actual,
-            "Error_Margin": round(error, 2),
-            "Audit_Status": note,
-            "Recalibration": recalibration
-        })
-    df_ledger = pd.DataFrame(ledger)
-    df_ledger.to_csv(ledger_path, index=False)
-    LOG.info("Saved learning ledger to %s (%d rows).", ledger_path, len(df_ledger))
-    return df_ledger
+    df_act = load_actuals_lookup(actuals_path)
+
+    if not chunksize:
+        df_ledger = build_ledger(pd.read_csv(pred_path), df_act)
+        df_ledger.to_csv(ledger_path, index=False)
+        LOG.info("Saved learning ledger to %s (%d rows).", ledger_path, len(df_ledger))
+        return df_ledger
+
+    preview = None
+    n_rows = 0
+    for block in pd.read_csv(pred_path, chunksize=chunksize):
+        df_block = build_ledger(block, df_act)
+        df_block.to_csv(ledger_path, mode="w" if preview is None else "a", header=preview is None, index=False)
+        if preview is None:
+            preview = df_block
+        n_rows += len(df_block)
+    if preview is None:
+        preview = pd.DataFrame(columns=LEDGER_COLUMNS)
+        preview.to_csv(ledger_path, index=False)
+    LOG.info("Saved learning ledger to %s (%d rows, streamed in chunks of %d).", ledger_path, n_rows, chunksize)
+    return preview
 
 # ---------- CLI ----------
 def main(argv=None):
@@ -306,6 +380,7 @@ def main(argv=None):
     parser.add_argument("--stadium", type=str, default=DEFAULT_STADIUM, help=f"Stadium entropy CSV (default: {DEFAULT_STADIUM})")
     parser.add_argument("--output", type=str, default=DEFAULT_OUTPUT, help=f"Output predictions CSV (default: {DEFAULT_OUTPUT})")
     parser.add_argument("--validate", type=str, metavar="ACTUALS_CSV", help="Path to actual_results.csv to run validation and produce a ledger")
+    parser.add_argument("--ledger-chunksize", type=int, default=None, help="Stream validation in blocks of this many predictions (bounded memory)")
     args = parser.parse_args(argv)
 
     if args.fetch:
@@ -325,7 +400,8 @@ def main(argv=None):
     print(df_preds.head(10).to_string(index=False))
 
     if args.validate:
-        df_ledger = validate_predictions(pred_path=args.output, actuals_path=args.validate)
+        df_ledger = validate_predictions(pred_path=args.output, actuals_path=args.validate,
+                                         chunksize=args.ledger_chunksize)
         if df_ledger is not None:
             print("\n--- Learning Ledger Preview ---")
             print(df_ledger.head(20).to_string(index=False))
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Asynchronous successive-halving (ASHA-style) search over SimpleAgent training configs.
+
+Many (lr, hidden, batch_size) configurations train in parallel worker processes via
+`agent_training_with_plots.train`. Rungs sit at min_epochs * eta**k epochs; when a trial reaches a
+rung it records its val_loss there and keeps training only if it is within the best 1/eta of the
+losses recorded at that rung so far. Everything else is stopped immediately, so compute goes to the
+promising configs. Each trial keeps its ledger and best model under <save-dir>/trial_XXX, and a
+summary table is written to <save-dir>/asha_summary.csv.
+
+Usage:
+    python -m scripts.successive_halving --lrs 1e-4 3e-4 1e-3 3e-3 --hiddens 32 64 128 \
+        --batch-sizes 32 64 128 --max-epochs 81 --min-epochs 3 --eta 3 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import torch
+
+try:
+    from scripts.agent_training_with_plots import SimpleAgent, make_toy_dataloaders, set_seed, train
+except Exception:
+    # If run as a script from the same directory, allow direct import
+    from agent_training_with_plots import SimpleAgent, make_toy_dataloaders, set_seed, train
+
+
+LOG = logging.getLogger(__name__)
+
+
+def rung_milestones(min_epochs: int, max_epochs: int, eta: int) -> List[int]:
+    """Epochs at which trials are compared: min_epochs * eta**k, below max_epochs."""
+    milestones = []
+    r = max(1, int(min_epochs))
+    while r < max_epochs:
+        milestones.append(r)
+        r *= eta
+    return milestones
+
+
+class AsyncSuccessiveHalving:
+    """
+    Rung bookkeeping shared between worker processes (a manager dict + lock).
+
+    should_stop() is called after every epoch; at a rung it records the trial's val_loss and
+    returns True when the loss falls outside the best 1/eta of everything recorded at that rung.
+    Decisions are asynchronous: early arrivals are compared only with trials that got there first.
+    """
+
+    def __init__(self, milestones: List[int], eta: int, rungs, lock):
+        self.milestones = set(milestones)
+        self.eta = eta
+        self.rungs = rungs
+        self.lock = lock
+
+    def should_stop(self, epoch: int, val_loss: float) -> bool:
+        if epoch not in self.milestones:
+            return False
+        with self.lock:
+            recorded = list(self.rungs.get(epoch, [])) + [float(val_loss)]
+            self.rungs[epoch] = recorded
+        cutoff = float(np.percentile(recorded, 100.0 / self.eta))
+        return val_loss > cutoff
+
+
+def sample_configs(lrs: List[float], hiddens: List[int], batch_sizes: List[int],
+                   num_configs: Optional[int], seed: int) -> List[Dict[str, Any]]:
+    """Full (lr, hidden, batch_size) grid, or a random subset of num_configs of it."""
+    grid = [{"lr": lr, "hidden": h, "batch_size": bs} for lr, h, bs in itertools.product(lrs, hiddens, batch_sizes)]
+    if num_configs is not None and num_configs < len(grid):
+        grid = random.Random(seed).sample(grid, num_configs)
+    return grid
+
+
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(rungs, lock, milestones: List[int], eta: int, threads: int) -> None:
+    torch.set_num_threads(threads)
+    _WORKER["scheduler"] = AsyncSuccessiveHalving(milestones, eta, rungs, lock)
+
+
+def _run_trial(trial_id: int, config: Dict[str, Any], args: Dict[str, Any]) -> Dict[str, Any]:
+    scheduler: AsyncSuccessiveHalving = _WORKER["scheduler"]
+    # identical data for every trial, then a per-trial stream for init and shuffling
+    set_seed(args["seed"])
+    train_loader, val_loader = make_toy_dataloaders(config["batch_size"], input_dim=args["input_dim"])
+    set_seed(args["seed"] + 1 + trial_id)
+    model = SimpleAgent(input_dim=args["input_dim"], hidden=config["hidden"], output_dim=1)
+
+    stopped_at: List[int] = []
+
+    def on_epoch(epoch: int, train_loss: float, val_loss: float) -> bool:
+        if scheduler.should_stop(epoch, val_loss):
+            stopped_at.append(epoch)
+            return True
+        return False
+
+    save_dir = os.path.join(args["save_dir"], f"trial_{trial_id:03d}")
+    start = time.perf_counter()
+    out = train(model=model, train_loader=train_loader, val_loader=val_loader, device=torch.device("cpu"),
+                epochs=args["max_epochs"], lr=config["lr"], early_stop_patience=args["early_stop_patience"],
+                save_dir=save_dir, record_params_every=args["record_params_every"],
+                epoch_callback=on_epoch, plot=False)
+    ledger = pd.read_csv(out["ledger_csv"])
+    best = ledger.loc[ledger["val_loss"].idxmin()]
+    return {"trial": trial_id, **config,
+            "epochs_run": int(ledger["epoch"].max()),
+            "best_val_loss": float(best["val_loss"]),
+            "best_epoch": int(best["epoch"]),
+            "stopped_at_rung": stopped_at[0] if stopped_at else None,
+            "survivor": not stopped_at,
+            "wall_time_s": round(time.perf_counter() - start, 3),
+            "best_model": out["best_model"],
+            "ledger_csv": out["ledger_csv"]}
+
+
+def run_asha(configs: List[Dict[str, Any]], save_dir: str, max_epochs: int, min_epochs: int, eta: int,
+             workers: int, early_stop_patience: int, seed: int, input_dim: int = 20,
+             record_params_every: int = 1) -> pd.DataFrame:
+    os.makedirs(save_dir, exist_ok=True)
+    milestones = rung_milestones(min_epochs, max_epochs, eta)
+    LOG.info("ASHA: %d configs, rungs at epochs %s, eta=%d, %d workers", len(configs), milestones, eta, workers)
+    ctx = mp.get_context("spawn")
+    args = {"seed": seed, "input_dim": input_dim, "save_dir": save_dir, "max_epochs": max_epochs,
+            "early_stop_patience": early_stop_patience, "record_params_every": record_params_every}
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    with ctx.Manager() as manager:
+        rungs, lock = manager.dict(), manager.Lock()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker,
+                                 initargs=(rungs, lock, milestones, eta, threads)) as pool:
+            futures = [pool.submit(_run_trial, i, cfg, args) for i, cfg in enumerate(configs)]
+            results = []
+            for fut in as_completed(futures):
+                res = fut.result()
+                results.append(res)
+                LOG.info("Trial %d %s after %d epochs (best val_loss=%.6f)", res["trial"],
+                         "survived" if res["survivor"] else f"stopped at rung {res['stopped_at_rung']}",
+                         res["epochs_run"], res["best_val_loss"])
+    summary = pd.DataFrame(results).sort_values("best_val_loss").reset_index(drop=True)
+    summary_csv = os.path.join(save_dir, "asha_summary.csv")
+    summary.to_csv(summary_csv, index=False)
+    LOG.info("Saved ASHA summary to %s", summary_csv)
+    return summary
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--lrs", type=float, nargs="+", default=[1e-4, 3e-4, 1e-3, 3e-3])
+    p.add_argument("--hiddens", type=int, nargs="+", default=[32, 64, 128])
+    p.add_argument("--batch-sizes", type=int, nargs="+", default=[32, 64, 128])
+    p.add_argument("--num-configs", type=int, default=None, help="Random subset of the grid (default: full grid)")
+    p.add_argument("--max-epochs", type=int, default=81)
+    p.add_argument("--min-epochs", type=int, default=3)
+    p.add_argument("--eta", type=int, default=3, help="Keep the best 1/eta at each rung")
+    p.add_argument("--early-stop-patience", type=int, default=10)
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--record-params-every", type=int, default=1)
+    p.add_argument("--save-dir", type=str, default="runs/asha")
+    p.add_argument("--seed", type=int, default=42)
+    return p.parse_args()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = parse_args()
+    configs = sample_configs(args.lrs, args.hiddens, args.batch_sizes, args.num_configs, args.seed)
+    summary = run_asha(configs, save_dir=args.save_dir, max_epochs=args.max_epochs, min_epochs=args.min_epochs,
+                       eta=args.eta, workers=args.workers, early_stop_patience=args.early_stop_patience,
+                       seed=args.seed, record_params_every=args.record_params_every)
+    print(summary.head(20).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()